@@ -16,6 +16,8 @@ from app.models.user import User
 from app.models.event import Event
 from app.models.session import EventSession
 from app.models.attendance import Attendance
+from app.models.refresh_token import RefreshToken
+from app.models.revoked_token import RevokedToken
 
 # this is the Alembic Config object
 config = context.config
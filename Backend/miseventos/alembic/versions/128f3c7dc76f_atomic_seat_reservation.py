@@ -0,0 +1,34 @@
+"""Atomic seat reservation
+
+Revision ID: 128f3c7dc76f
+Revises: 467e21bac955
+Create Date: 2026-10-18 09:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = '128f3c7dc76f'
+down_revision: Union[str, None] = '467e21bac955'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_unique_constraint('uq_attendances_user_session', 'attendances', ['user_id', 'session_id'])
+    # `current_attendees` pasa a ser la fuente de verdad para la reserva de plazas:
+    # se recalcula a partir de los registros confirmados existentes.
+    op.execute(
+        "UPDATE event_sessions SET current_attendees = ("
+        "SELECT COUNT(*) FROM attendances "
+        "WHERE attendances.session_id = event_sessions.id "
+        "AND attendances.status = 'CONFIRMED')"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_attendances_user_session', 'attendances', type_='unique')
@@ -0,0 +1,47 @@
+"""Events search index covers every public status
+
+Revision ID: 5a381523926a
+Revises: 8a8891082d40
+Create Date: 2026-10-18 18:42:07.512364
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a381523926a'
+down_revision: Union[str, None] = '8a8891082d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_SEARCH_VECTOR = (
+    "setweight(to_tsvector('spanish', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('spanish', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('spanish', coalesce(general_location, '')), 'C')"
+)
+
+
+def _create_search_index(statuses: str) -> None:
+    op.execute(
+        f"CREATE INDEX ix_events_search_vector ON events USING gin (({_SEARCH_VECTOR})) "
+        f"WHERE status IN ({statuses}) AND deleted_at IS NULL"
+    )
+
+
+def upgrade() -> None:
+    # El listado combina la búsqueda con el filtro de estado: el índice parcial
+    # debe cubrir todos los estados de `search_service.INDEXED_STATUSES`.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_events_search_vector', table_name='events')
+    _create_search_index("'PUBLISHED', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED'")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_events_search_vector', table_name='events')
+    _create_search_index("'PUBLISHED'")
@@ -0,0 +1,37 @@
+"""Session waitlist
+
+Revision ID: 5d7313ddce64
+Revises: 128f3c7dc76f
+Create Date: 2026-10-18 10:03:17.284410
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d7313ddce64'
+down_revision: Union[str, None] = '128f3c7dc76f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('attendances', sa.Column('waitlist_position', sa.Integer(), nullable=True))
+    op.add_column('event_sessions', sa.Column('waitlist_seq', sa.Integer(), nullable=False, server_default='0'))
+    op.create_index(
+        'ix_attendances_session_waitlist',
+        'attendances',
+        ['session_id', 'waitlist_position'],
+        unique=False,
+        postgresql_where=sa.text('waitlist_position IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_attendances_session_waitlist', table_name='attendances')
+    op.drop_column('event_sessions', 'waitlist_seq')
+    op.drop_column('attendances', 'waitlist_position')
@@ -0,0 +1,33 @@
+"""Maintain event capacity
+
+Revision ID: 748b811e1a66
+Revises: 87a390eed97e
+Create Date: 2026-10-18 12:04:09.611873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = '748b811e1a66'
+down_revision: Union[str, None] = '87a390eed97e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # `events.max_capacity` pasa a mantenerse de forma incremental desde session_service:
+    # se inicializa con la suma de las sesiones activas.
+    op.execute(
+        "UPDATE events SET max_capacity = ("
+        "SELECT COALESCE(SUM(event_sessions.max_capacity), 0) FROM event_sessions "
+        "WHERE event_sessions.event_id = events.id "
+        "AND event_sessions.deleted_at IS NULL)"
+    )
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,27 @@
+"""Session seat inventory switch
+
+Revision ID: 87a390eed97e
+Revises: 5d7313ddce64
+Create Date: 2026-10-18 11:26:52.917304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = '87a390eed97e'
+down_revision: Union[str, None] = '5d7313ddce64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('event_sessions', sa.Column('seat_inventory_enabled', sa.Boolean(), nullable=False, server_default=sa.false()))
+
+
+def downgrade() -> None:
+    op.drop_column('event_sessions', 'seat_inventory_enabled')
@@ -0,0 +1,51 @@
+"""Events browse filter indexes
+
+Revision ID: 8a8891082d40
+Revises: ccc103a40bcf
+Create Date: 2026-10-18 17:25:41.906312
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a8891082d40'
+down_revision: Union[str, None] = 'ccc103a40bcf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filtros del listado público (ver `event_service._filter_clauses`)
+    op.create_index(
+        'ix_events_status_deleted_start_date',
+        'events',
+        ['status', 'deleted_at', 'start_date', 'id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_events_status_category_start_date',
+        'events',
+        ['status', 'category', 'start_date'],
+        unique=False,
+        postgresql_where=sa.text('deleted_at IS NULL'),
+    )
+    # Filtro de ubicación: ILIKE '%texto%' sólo puede usar un índice de trigramas
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX ix_events_general_location_trgm ON events "
+        "USING gin (general_location gin_trgm_ops) WHERE deleted_at IS NULL"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_events_general_location_trgm', table_name='events')
+    op.drop_index('ix_events_status_category_start_date', table_name='events')
+    op.drop_index('ix_events_status_deleted_start_date', table_name='events')
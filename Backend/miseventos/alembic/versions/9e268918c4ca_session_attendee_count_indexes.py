@@ -0,0 +1,30 @@
+"""Session attendee count indexes
+
+Revision ID: 9e268918c4ca
+Revises: e7bf5c8b0d9a
+Create Date: 2026-10-18 15:02:17.448120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e268918c4ca'
+down_revision: Union[str, None] = 'e7bf5c8b0d9a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Carga de las sesiones de un evento (detalle y validación de horarios)
+    op.create_index(op.f('ix_event_sessions_event_id'), 'event_sessions', ['event_id'], unique=False)
+    # Recuento de asistentes confirmados por sesión
+    op.create_index('ix_attendances_session_status', 'attendances', ['session_id', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_attendances_session_status', table_name='attendances')
+    op.drop_index(op.f('ix_event_sessions_event_id'), table_name='event_sessions')
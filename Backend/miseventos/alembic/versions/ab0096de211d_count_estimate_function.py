@@ -0,0 +1,43 @@
+"""count_estimate function
+
+Revision ID: ab0096de211d
+Revises: e1a51b5e5a86
+Create Date: 2026-10-18 13:21:05.448193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ab0096de211d'
+down_revision: Union[str, None] = 'e1a51b5e5a86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Número de filas que el planificador estima para una consulta, sin ejecutarla.
+    # Lo usa el modo de total estimado del listado de eventos.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION count_estimate(query text) RETURNS bigint AS $$
+        DECLARE
+            plan jsonb;
+        BEGIN
+            EXECUTE 'EXPLAIN (FORMAT JSON) ' || query INTO plan;
+            RETURN (plan->0->'Plan'->>'Plan Rows')::bigint;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP FUNCTION IF EXISTS count_estimate(text)")
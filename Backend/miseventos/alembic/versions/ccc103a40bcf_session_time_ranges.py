@@ -0,0 +1,91 @@
+"""Session time ranges
+
+Revision ID: ccc103a40bcf
+Revises: ee31a6751afc
+Create Date: 2026-10-18 16:42:07.318254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ccc103a40bcf'
+down_revision: Union[str, None] = 'ee31a6751afc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _check_no_overlaps() -> None:
+    """
+    La validación anterior sólo se hacía al cambiar el horario, así que puede
+    haber sesiones activas solapadas. Se detectan antes de crear la
+    restricción para fallar con un mensaje claro en lugar de un error de gist.
+    Las sesiones eliminadas (soft delete) no cuentan: la restricción las excluye.
+    """
+    overlaps = op.get_bind().execute(sa.text(
+        "SELECT a.event_id, a.id, b.id FROM event_sessions a "
+        "JOIN event_sessions b ON b.event_id = a.event_id AND b.id > a.id "
+        "AND b.session_datetime < a.session_end AND a.session_datetime < b.session_end "
+        "WHERE a.deleted_at IS NULL AND b.deleted_at IS NULL "
+        "ORDER BY a.event_id, a.id, b.id LIMIT 20"
+    )).all()
+    if overlaps:
+        pairs = ", ".join(f"evento {event_id}: sesiones {a} y {b}" for event_id, a, b in overlaps)
+        raise RuntimeError(
+            "No se puede crear ex_event_sessions_no_overlap: hay sesiones activas solapadas "
+            f"({pairs}). Corrija sus horarios o elimínelas y vuelva a ejecutar la migración."
+        )
+
+
+def upgrade() -> None:
+    # Cada sesión guarda su duración y su fin. Se inicializan con la duración
+    # del evento (o 60 minutos), la que usaba hasta ahora la validación de horarios.
+    op.add_column('event_sessions', sa.Column('duration_minutes', sa.Integer(), nullable=False, server_default='60'))
+    op.add_column('event_sessions', sa.Column('session_end', sa.DateTime(), nullable=True))
+    op.execute(
+        "UPDATE event_sessions SET duration_minutes = COALESCE("
+        "(SELECT events.duration_minutes FROM events WHERE events.id = event_sessions.event_id), 60)"
+    )
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("UPDATE event_sessions SET session_end = session_datetime + duration_minutes * interval '1 minute'")
+    else:
+        # SQLite: se conserva la parte fraccionaria en el formato de SQLAlchemy
+        op.execute(
+            "UPDATE event_sessions SET session_end = "
+            "strftime('%Y-%m-%d %H:%M:%S', session_datetime, '+' || duration_minutes || ' minutes') "
+            "|| substr(session_datetime, 20)"
+        )
+    with op.batch_alter_table('event_sessions') as batch_op:
+        batch_op.alter_column('duration_minutes', server_default=None)
+        batch_op.alter_column('session_end', existing_type=sa.DateTime(), nullable=False)
+
+    op.create_index(
+        'ix_event_sessions_event_schedule',
+        'event_sessions',
+        ['event_id', 'session_datetime'],
+        unique=False,
+        postgresql_where=sa.text('deleted_at IS NULL'),
+    )
+
+    # Invariante en la base de datos: dos sesiones activas del mismo evento no
+    # pueden solaparse, tampoco con altas concurrentes.
+    if op.get_bind().dialect.name == 'postgresql':
+        _check_no_overlaps()
+        op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        op.execute(
+            "ALTER TABLE event_sessions ADD CONSTRAINT ex_event_sessions_no_overlap "
+            "EXCLUDE USING gist (event_id WITH =, tsrange(session_datetime, session_end) WITH &&) "
+            "WHERE (deleted_at IS NULL)"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("ALTER TABLE event_sessions DROP CONSTRAINT ex_event_sessions_no_overlap")
+    op.drop_index('ix_event_sessions_event_schedule', table_name='event_sessions')
+    op.drop_column('event_sessions', 'session_end')
+    op.drop_column('event_sessions', 'duration_minutes')
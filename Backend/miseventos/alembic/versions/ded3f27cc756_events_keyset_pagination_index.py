@@ -0,0 +1,34 @@
+"""Events keyset pagination index
+
+Revision ID: ded3f27cc756
+Revises: 748b811e1a66
+Create Date: 2026-10-18 12:31:47.205118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ded3f27cc756'
+down_revision: Union[str, None] = '748b811e1a66'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Índice parcial para el listado público ordenado por (start_date, id)
+    op.create_index(
+        'ix_events_published_start_date_id',
+        'events',
+        ['start_date', 'id'],
+        unique=False,
+        postgresql_where=sa.text("status = 'PUBLISHED' AND deleted_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_events_published_start_date_id', table_name='events')
@@ -0,0 +1,38 @@
+"""Events full-text search index
+
+Revision ID: e1a51b5e5a86
+Revises: ded3f27cc756
+Create Date: 2026-10-18 12:58:20.734410
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a51b5e5a86'
+down_revision: Union[str, None] = 'ded3f27cc756'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Índice GIN sobre el tsvector ponderado de `search_service.search_vector()`.
+    # La expresión debe coincidir exactamente con la de las consultas.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(
+        "CREATE INDEX ix_events_search_vector ON events USING gin (("
+        "setweight(to_tsvector('spanish', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('spanish', coalesce(description, '')), 'B') || "
+        "setweight(to_tsvector('spanish', coalesce(general_location, '')), 'C')"
+        ")) WHERE status = 'PUBLISHED' AND deleted_at IS NULL"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_events_search_vector', table_name='events')
@@ -0,0 +1,27 @@
+"""Events updated_at index
+
+Revision ID: ee31a6751afc
+Revises: fd738bd491c4
+Create Date: 2026-10-18 16:04:09.217583
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ee31a6751afc'
+down_revision: Union[str, None] = 'fd738bd491c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # MAX(updated_at) como versión del catálogo (ETag / Last-Modified)
+    op.create_index('ix_events_updated_at', 'events', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_events_updated_at', table_name='events')
@@ -0,0 +1,27 @@
+"""Attendances user registration index
+
+Revision ID: fd738bd491c4
+Revises: 9e268918c4ca
+Create Date: 2026-10-18 15:31:44.906215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fd738bd491c4'
+down_revision: Union[str, None] = '9e268918c4ca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Registros de un usuario ordenados por fecha (/users/me/registrations)
+    op.create_index('ix_attendances_user_registration_date', 'attendances', ['user_id', 'registration_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_attendances_user_registration_date', table_name='attendances')
@@ -0,0 +1,122 @@
+# app/cli/bench_json.py
+
+"""
+Compara la serialización de `app.core.json_response` con la de FastAPI.
+
+Uso:
+    python -m app.cli.bench_json [--events 100] [--rounds 200]
+
+Construye páginas de eventos en memoria (con sesiones, textos unicode,
+campos nulos, enums y fechas), comprueba que ambos caminos producen los
+mismos bytes y mide el tiempo por respuesta de cada uno.
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.json_response import render_json
+from app.models import Event, EventSession
+from app.schemas import event_schemas
+from app.utils.enums import EventCategory, EventStatus, SessionStatus
+
+
+def build_events(count: int, sessions_per_event: int = 0) -> List[Event]:
+    """Eventos transitorios (sin base de datos) con datos variados."""
+    base = datetime(2031, 3, 1, 9, 30, 15, 250000)
+    categories = list(EventCategory)
+    events = []
+    for i in range(count):
+        start = base + timedelta(days=i, minutes=i)
+        event = Event(
+            id=i + 1,
+            name=f"Jornada «{i}» — Música y café ☕",
+            general_location="Plaza Mayor, Bogotá" if i % 2 else "Auditorio Ñandú",
+            category=categories[i % len(categories)],
+            description="Descripción con \"comillas\", saltos\nde línea y emoji 🎉" * (1 + i % 3),
+            start_date=start,
+            end_date=start + timedelta(hours=8),
+            image_url=None if i % 3 else f"https://example.com/img/{i}.png",
+            creator_id=1 + i % 7,
+            status=EventStatus.PUBLISHED,
+        )
+        event.sessions = [
+            EventSession(
+                id=i * sessions_per_event + j + 1,
+                event_id=i + 1,
+                presenter=f"Ponente {j} – Pérez",
+                status=SessionStatus.SALE,
+                session_datetime=start + timedelta(hours=j),
+                duration_minutes=45,
+                session_end=start + timedelta(hours=j, minutes=45),
+                specific_location=f"Sala {j}",
+                max_capacity=50,
+                session_resources=None if j % 2 else "Diapositivas",
+                current_attendees=(i + j) % 51,
+            )
+            for j in range(sessions_per_event)
+        ]
+        events.append(event)
+    return events
+
+
+_loop = asyncio.new_event_loop()
+
+
+def fastapi_render(schema: Any, value: Any) -> bytes:
+    """Camino por defecto de FastAPI para un endpoint con `response_model=schema`."""
+    field = create_model_field(name="response", type_=schema, mode="serialization")
+    content = _loop.run_until_complete(serialize_response(field=field, response_content=value))
+    return JSONResponse(content=jsonable_encoder(content)).body
+
+
+def _time_per_call(fn: Callable[[], bytes], rounds: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds
+
+
+def _cases(count: int):
+    events = build_events(count)
+    page = event_schemas.EventListResponse(
+        events=events, current_page=1, total_pages=3, total=count * 3, limit=count
+    )
+    return [
+        ("EventListResponse", event_schemas.EventListResponse, page),
+        ("List[EventRead]", List[event_schemas.EventRead], events),
+        ("EventReadWithSessions", event_schemas.EventReadWithSessions, build_events(1, sessions_per_event=count)[0]),
+    ]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark fast JSON rendering against FastAPI's default path.")
+    parser.add_argument("--events", type=int, default=100, help="Events (or sessions) per response")
+    parser.add_argument("--rounds", type=int, default=200, help="Timed renders per case")
+    args = parser.parse_args(argv)
+
+    for name, schema, value in _cases(args.events):
+        expected = fastapi_render(schema, value)
+        actual = render_json(schema, value)
+        if actual != expected:
+            print(f"{name}: output differs from FastAPI's ({len(actual)} vs {len(expected)} bytes)")
+            return 1
+        default = _time_per_call(lambda: fastapi_render(schema, value), args.rounds)
+        fast = _time_per_call(lambda: render_json(schema, value), args.rounds)
+        print(
+            f"{name:<24} {len(actual):>8} bytes  default={default * 1000:.3f} ms  "
+            f"fast={fast * 1000:.3f} ms  speedup={default / fast:.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,73 @@
+# app/cli/import_users.py
+
+"""
+Importa usuarios en bloque desde un fichero CSV o NDJSON.
+
+Uso:
+    python -m app.cli.import_users usuarios.csv [--checkpoint usuarios.ckpt]
+
+Cada registro necesita `name`, `email` y `password`; `role` es opcional.
+Con `--checkpoint`, una importación interrumpida se reanuda donde quedó
+al volver a lanzar el mismo comando.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core.db import SessionLocal
+from app.services import user_import_service
+from app.services.user_import_service import ImportStats
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import users from a CSV or NDJSON file.")
+    parser.add_argument("path", help="CSV or NDJSON file with name, email, password and optional role")
+    parser.add_argument("--format", choices=("csv", "ndjson"), help="File format (inferred from the extension by default)")
+    parser.add_argument("--chunk-size", type=int, default=user_import_service.DEFAULT_CHUNK_SIZE, help="Users per transaction")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Password hashing processes (0 hashes in-process)")
+    parser.add_argument("--checkpoint", help="Checkpoint file used to resume an interrupted import")
+    return parser.parse_args(argv)
+
+
+def _print_progress(stats: ImportStats) -> None:
+    print(
+        f"processed={stats.processed} imported={stats.imported} existing={stats.existing} "
+        f"duplicates={stats.duplicates} invalid={stats.invalid}",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    file_format = args.format or user_import_service.detect_format(args.path)
+
+    executor = None
+    if args.workers:
+        executor = ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    db = SessionLocal()
+    try:
+        with open(args.path, newline="", encoding="utf-8") as f:
+            stats = user_import_service.import_users(
+                db,
+                user_import_service.read_records(f, file_format),
+                chunk_size=args.chunk_size,
+                executor=executor,
+                checkpoint_path=args.checkpoint,
+                on_progress=_print_progress,
+            )
+    finally:
+        db.close()
+        if executor is not None:
+            executor.shutdown()
+
+    _print_progress(stats)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
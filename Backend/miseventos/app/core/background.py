@@ -0,0 +1,64 @@
+# app/core/background.py
+
+import logging
+import threading
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from app.core.db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """
+    Ejecuta una función cada `interval` segundos en un hilo demonio.
+    Se usa para los procesos en segundo plano del backend (escrituras
+    diferidas, reconciliaciones, etc.). Los errores se registran y no
+    detienen el hilo.
+    """
+
+    def __init__(self, name: str, interval: float, func: Callable[[], None], run_on_start: bool = False):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        # Ejecuta la tarea nada más arrancar, sin esperar el primer intervalo
+        self.run_on_start = run_on_start
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def _run(self):
+        if self.run_on_start:
+            self.run_once()
+        while not self._stop_event.wait(self.interval):
+            self.run_once()
+
+    def run_once(self):
+        """Ejecuta la tarea una vez, registrando cualquier error."""
+        try:
+            self.func()
+        except Exception:
+            logger.exception("Background task %s failed", self.name)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self, run_final: bool = True):
+        """
+        Detiene el hilo. Con `run_final=True` ejecuta la tarea una última vez,
+        para no perder trabajo pendiente en un apagado ordenado.
+        """
+        self._stop_event.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        if run_final:
+            self.run_once()
+
+
+def with_db_session(func: Callable[[Session], None]) -> Callable[[], None]:
+    """Adapta una función que recibe una sesión de BD para usarla en un `PeriodicTask`."""
+    def runner():
+        with SessionLocal() as db:
+            func(db)
+    return runner
@@ -0,0 +1,194 @@
+# app/core/cache.py
+
+"""
+Caché en memoria por proceso, acotada (LRU) y con caducidad (TTL).
+
+Se usa para datos baratos de invalidar y caros de recalcular. Cada worker
+tiene la suya, por lo que el TTL acota lo desactualizado que puede quedar un
+valor cuando la escritura ocurre en otro proceso.
+
+`StaleWhileRevalidateCache` añade etiquetas para invalidar con precisión y
+sirve valores rancios mientras una sola petición los recalcula.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Caché LRU con TTL por entrada. Segura entre hilos."""
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > self._clock():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._data[key] = (self._clock() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Devuelve el valor cacheado o lo calcula con `factory`. El cálculo se
+        hace fuera del lock; dos peticiones simultáneas pueden calcularlo a la vez.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Elimina las entradas cuya clave cumple `predicate`."""
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+class _SWREntry:
+    __slots__ = ("value", "tags", "fresh_until", "expires_at", "refreshing")
+
+    def __init__(self, value: Any, tags: FrozenSet[Hashable], fresh_until: float, expires_at: float):
+        self.value = value
+        self.tags = tags
+        self.fresh_until = fresh_until
+        self.expires_at = expires_at
+        self.refreshing = False
+
+
+class StaleWhileRevalidateCache:
+    """
+    Caché LRU con etiquetas y `stale-while-revalidate`. Segura entre hilos.
+
+    Una entrada está fresca durante `ttl` segundos; después, o tras
+    invalidarse, sigue sirviéndose como rancia hasta `ttl + stale_ttl`. De
+    todas las peticiones que encuentran una entrada rancia, sólo la primera
+    recibe la orden de recalcularla (`lookup` devuelve `refresh=True`); las
+    demás reciben el valor rancio mientras tanto. Así una ráfaga tras una
+    invalidación provoca un único recálculo.
+
+    Uso:
+
+        value, refresh = cache.lookup(key)
+        if refresh:
+            generation = cache.generation
+            value = compute()          # si falla: cache.abandon(key)
+            cache.store(key, value, tags, generation)
+    """
+
+    def __init__(self, maxsize: int, ttl: float, stale_ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, _SWREntry]" = OrderedDict()
+        # Avanza con cada invalidación; un valor calculado antes se guarda ya rancio
+        self.generation = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def lookup(self, key: Hashable) -> Tuple[Any, bool]:
+        """Devuelve `(valor o None, refresh)`; con `refresh` el llamador debe calcular y guardar el valor."""
+        now = self._clock()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry.expires_at <= now:
+                self._data.pop(key, None)
+                self.misses += 1
+                return None, True
+            self._data.move_to_end(key)
+            if entry.fresh_until > now:
+                self.hits += 1
+                return entry.value, False
+            self.stale_hits += 1
+            if entry.refreshing:
+                return entry.value, False
+            entry.refreshing = True
+            return entry.value, True
+
+    def store(self, key: Hashable, value: Any, tags: Iterable[Hashable] = (), generation: Optional[int] = None) -> None:
+        now = self._clock()
+        with self._lock:
+            # Si hubo una invalidación durante el cálculo, el valor puede no reflejarla
+            fresh_until = now + self.ttl if generation is None or generation == self.generation else now
+            self._data[key] = _SWREntry(value, frozenset(tags), fresh_until, now + self.ttl + self.stale_ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def abandon(self, key: Hashable) -> None:
+        """Libera el recálculo de `key` tras un error, para que lo intente otra petición."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                entry.refreshing = False
+
+    def _mark_stale(self, predicate: Callable[[Hashable, _SWREntry], bool]) -> None:
+        now = self._clock()
+        with self._lock:
+            self.generation += 1
+            for key, entry in self._data.items():
+                if predicate(key, entry):
+                    entry.fresh_until = min(entry.fresh_until, now)
+
+    def invalidate_tags(self, tags: Iterable[Hashable]) -> None:
+        """Marca como rancias las entradas con alguna de las etiquetas."""
+        tags = frozenset(tags)
+        self._mark_stale(lambda key, entry: not tags.isdisjoint(entry.tags))
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Marca como rancias las entradas cuya clave cumple `predicate`."""
+        self._mark_stale(lambda key, entry: predicate(key))
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._data), "hits": self.hits, "stale_hits": self.stale_hits, "misses": self.misses}
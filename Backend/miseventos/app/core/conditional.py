@@ -0,0 +1,83 @@
+# app/core/conditional.py
+
+"""
+Peticiones condicionales (`If-None-Match` / `If-Modified-Since`).
+
+Los servicios calculan la versión de un recurso con una consulta barata
+(p. ej. el `updated_at` máximo) y las rutas la usan para responder 304 antes
+de cargar y serializar los modelos:
+
+    version = event_service.get_event_version(db, event_id)
+    if version and conditional.is_not_modified(request, version):
+        return conditional.not_modified(version)
+    conditional.set_validators(response, version)
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+
+@dataclass(frozen=True)
+class ResourceVersion:
+    """Validadores de un recurso: ETag fuerte y fecha de última modificación (UTC)."""
+    etag: str
+    last_modified: datetime
+
+    @classmethod
+    def from_parts(cls, last_modified: datetime, *parts) -> "ResourceVersion":
+        """Deriva el ETag de `last_modified` y de cualquier otro dato que afecte a la representación."""
+        digest = hashlib.sha1(repr((last_modified.isoformat(),) + parts).encode()).hexdigest()
+        return cls(etag=f'"{digest[:20]}"', last_modified=last_modified)
+
+    @property
+    def http_date(self) -> str:
+        return format_datetime(self.last_modified.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # If-None-Match usa comparación débil: se ignora el prefijo W/
+    if header.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in header.split(","))
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # Last-Modified tiene resolución de segundos
+    return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+
+
+def is_not_modified(request: Request, version: ResourceVersion) -> bool:
+    """True si el cliente ya tiene esta versión. `If-None-Match` tiene prioridad sobre `If-Modified-Since`."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, version.etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        return _not_modified_since(if_modified_since, version.last_modified)
+    return False
+
+
+def set_validators(response: Response, version: Optional[ResourceVersion]) -> None:
+    """Añade ETag y Last-Modified; `no-cache` obliga al navegador a revalidar antes de reutilizar."""
+    if version is None:
+        return
+    response.headers["ETag"] = version.etag
+    response.headers["Last-Modified"] = version.http_date
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def not_modified(version: ResourceVersion) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, version)
+    return response
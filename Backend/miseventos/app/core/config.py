@@ -22,6 +22,22 @@ class Settings(BaseSettings):
     POSTGRES_PORT: int = config("POSTGRES_PORT", default=5432, cast=int)
     POSTGRES_DB: str = config("POSTGRES_DB", default="miseventos_db")
     
+    # Activa la variante asíncrona (AsyncSession + asyncpg) de los routers
+    # de autenticación, eventos y registros. Requiere instalar el extra `async`.
+    DB_ASYNC_ENABLED: bool = config("DB_ASYNC_ENABLED", default=False, cast=bool)
+    
+    # --- Connection Pool Settings ---
+    DB_POOL_SIZE: int = config("DB_POOL_SIZE", default=5, cast=int)
+    DB_MAX_OVERFLOW: int = config("DB_MAX_OVERFLOW", default=10, cast=int)
+    DB_POOL_RECYCLE_SECONDS: int = config("DB_POOL_RECYCLE_SECONDS", default=1800, cast=int)
+    DB_POOL_TIMEOUT_SECONDS: float = config("DB_POOL_TIMEOUT_SECONDS", default=30.0, cast=float)
+    # `statement_timeout` del servidor en milisegundos (0 = sin límite)
+    DB_STATEMENT_TIMEOUT_MS: int = config("DB_STATEMENT_TIMEOUT_MS", default=0, cast=int)
+    # Estrategia de liveness: "pre_ping", "idle" (ping sólo a conexiones ociosas) o "none"
+    DB_LIVENESS_CHECK: str = config("DB_LIVENESS_CHECK", default="pre_ping")
+    DB_LIVENESS_IDLE_SECONDS: float = config("DB_LIVENESS_IDLE_SECONDS", default=30.0, cast=float)
+    DB_POOL_SATURATION_LOG_INTERVAL_SECONDS: float = config("DB_POOL_SATURATION_LOG_INTERVAL_SECONDS", default=10.0, cast=float)
+    
     # Construye la URL de la base de datos automáticamente
     @property
     def DATABASE_URL(self) -> str:
@@ -30,10 +46,83 @@ class Settings(BaseSettings):
             f"{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        """Misma base de datos que DATABASE_URL, usando el driver asyncpg."""
+        return self.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
     # --- JWT Settings ---
     SECRET_KEY: str = config("SECRET_KEY", default="your-secret-key-here-change-in-production")
     ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = config("ACCESS_TOKEN_EXPIRE_MINUTES", default=30, cast=int)
+    # Tokens de acceso de vida corta; se renuevan con el token de refresco sin volver a pedir la contraseña
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = config("ACCESS_TOKEN_EXPIRE_MINUTES", default=15, cast=int)
+    REFRESH_TOKEN_EXPIRE_DAYS: int = config("REFRESH_TOKEN_EXPIRE_DAYS", default=7, cast=int)
+
+    # Lista de revocación de tokens de acceso: sincronización entre workers y tamaño del filtro Bloom
+    TOKEN_REVOCATION_SYNC_INTERVAL_SECONDS: float = config("TOKEN_REVOCATION_SYNC_INTERVAL_SECONDS", default=2.0, cast=float)
+    # Margen con que se releen revocaciones ya sincronizadas: cubre las transacciones
+    # que confirman después de otra más reciente y el desfase de reloj entre workers
+    TOKEN_REVOCATION_SYNC_OVERLAP_SECONDS: float = config("TOKEN_REVOCATION_SYNC_OVERLAP_SECONDS", default=60.0, cast=float)
+    TOKEN_REVOCATION_BLOOM_CAPACITY: int = config("TOKEN_REVOCATION_BLOOM_CAPACITY", default=100000, cast=int)
+
+    # Caché del usuario autenticado (id, rol, is_active) por `sub` del token
+    PRINCIPAL_CACHE_TTL_SECONDS: float = config("PRINCIPAL_CACHE_TTL_SECONDS", default=60.0, cast=float)
+    PRINCIPAL_CACHE_SIZE: int = config("PRINCIPAL_CACHE_SIZE", default=10000, cast=int)
+
+    # `User.last_login` se acumula en memoria y se escribe en lote cada intervalo
+    LAST_LOGIN_WRITE_BEHIND_ENABLED: bool = config("LAST_LOGIN_WRITE_BEHIND_ENABLED", default=True, cast=bool)
+    LAST_LOGIN_FLUSH_INTERVAL_SECONDS: float = config("LAST_LOGIN_FLUSH_INTERVAL_SECONDS", default=5.0, cast=float)
+
+    # --- Password Hashing Settings ---
+    # Coste de bcrypt; al cambiarlo, los hashes antiguos se rehacen en el siguiente login
+    BCRYPT_ROUNDS: int = config("BCRYPT_ROUNDS", default=12, cast=int)
+    # Procesos dedicados al hashing (0 = en el propio hilo de la petición)
+    PASSWORD_HASH_WORKERS: int = config("PASSWORD_HASH_WORKERS", default=2, cast=int)
+    # Operaciones en curso o en cola antes de rechazar con 503
+    PASSWORD_HASH_MAX_PENDING: int = config("PASSWORD_HASH_MAX_PENDING", default=16, cast=int)
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS: float = config("PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS", default=2.0, cast=float)
+
+    # --- Seat Inventory Settings ---
+    # Inventario de plazas en memoria para sesiones en preventa/venta.
+    # Además de este interruptor global, cada sesión debe activarlo con
+    # `EventSession.seat_inventory_enabled`.
+    SEAT_INVENTORY_ENABLED: bool = config("SEAT_INVENTORY_ENABLED", default=False, cast=bool)
+    SEAT_INVENTORY_SHARDS: int = config("SEAT_INVENTORY_SHARDS", default=8, cast=int)
+    SEAT_INVENTORY_LEASE_SIZE: int = config("SEAT_INVENTORY_LEASE_SIZE", default=50, cast=int)
+    SEAT_INVENTORY_FLUSH_INTERVAL_SECONDS: float = config("SEAT_INVENTORY_FLUSH_INTERVAL_SECONDS", default=1.0, cast=float)
+    SEAT_INVENTORY_RECONCILE_INTERVAL_SECONDS: float = config("SEAT_INVENTORY_RECONCILE_INTERVAL_SECONDS", default=30.0, cast=float)
+
+    # --- Event Listing Settings ---
+    # Caché de totales del listado de eventos, por filtro normalizado
+    EVENT_COUNT_CACHE_TTL_SECONDS: float = config("EVENT_COUNT_CACHE_TTL_SECONDS", default=30.0, cast=float)
+    EVENT_COUNT_CACHE_SIZE: int = config("EVENT_COUNT_CACHE_SIZE", default=1024, cast=int)
+    # En modo estimado, por debajo de este número de filas (según el planificador) se cuenta exacto
+    EVENT_COUNT_ESTIMATE_MIN_ROWS: int = config("EVENT_COUNT_ESTIMATE_MIN_ROWS", default=10000, cast=int)
+    # Caché de respuestas del catálogo público (GET /events y /events/search), ya serializadas
+    CATALOG_CACHE_ENABLED: bool = config("CATALOG_CACHE_ENABLED", default=True, cast=bool)
+    CATALOG_CACHE_SIZE: int = config("CATALOG_CACHE_SIZE", default=512, cast=int)
+    CATALOG_CACHE_TTL_SECONDS: float = config("CATALOG_CACHE_TTL_SECONDS", default=10.0, cast=float)
+    # Tras caducar o invalidarse, se sirve la respuesta anterior mientras una sola petición la recalcula
+    CATALOG_CACHE_STALE_SECONDS: float = config("CATALOG_CACHE_STALE_SECONDS", default=30.0, cast=float)
+
+    # --- Response Serialization Settings ---
+    # Serializar las respuestas grandes directamente con pydantic-core (ver app/core/json_response.py)
+    FAST_JSON_ENABLED: bool = config("FAST_JSON_ENABLED", default=True, cast=bool)
+
+    # --- Rate Limiting Settings ---
+    # Token buckets por IP (auth) y por usuario (inscripciones). Límites "<peticiones>/<segundos>";
+    # una regla vacía desactiva el límite de esa ruta.
+    RATE_LIMIT_ENABLED: bool = config("RATE_LIMIT_ENABLED", default=True, cast=bool)
+    # local (en memoria, por worker) | redis (compartido, requiere `poetry install -E ratelimit`)
+    RATE_LIMIT_BACKEND: str = config("RATE_LIMIT_BACKEND", default="local")
+    RATE_LIMIT_REDIS_URL: str = config("RATE_LIMIT_REDIS_URL", default="redis://localhost:6379/0")
+    RATE_LIMIT_MAX_KEYS: int = config("RATE_LIMIT_MAX_KEYS", default=100000, cast=int)
+    # Usar X-Forwarded-For como IP del cliente (sólo detrás de un proxy de confianza)
+    RATE_LIMIT_TRUST_FORWARDED: bool = config("RATE_LIMIT_TRUST_FORWARDED", default=False, cast=bool)
+    RATE_LIMIT_LOGIN: str = config("RATE_LIMIT_LOGIN", default="10/60")
+    RATE_LIMIT_REGISTER: str = config("RATE_LIMIT_REGISTER", default="5/60")
+    RATE_LIMIT_REFRESH: str = config("RATE_LIMIT_REFRESH", default="30/60")
+    RATE_LIMIT_REGISTRATIONS: str = config("RATE_LIMIT_REGISTRATIONS", default="20/60")
 
     @property
     def is_development(self) -> bool:
@@ -1,18 +1,80 @@
 # app/core/db.py
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel
 
 from app.core.config import settings
+from app.core.pool_metrics import (
+    PoolMetrics, InstrumentedQueuePool, InstrumentedAsyncQueuePool, instrument_engine
+)
+
+def _pool_kwargs() -> dict:
+    """Parámetros del pool de conexiones comunes a los motores síncrono y asíncrono."""
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        # Con "idle" o "none" el ping lo gestiona `instrument_engine` (o no se hace).
+        "pool_pre_ping": settings.DB_LIVENESS_CHECK == "pre_ping",
+    }
+
+def _new_pool_metrics(name: str) -> PoolMetrics:
+    return PoolMetrics(
+        name,
+        capacity=settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW,
+        saturation_log_interval=settings.DB_POOL_SATURATION_LOG_INTERVAL_SECONDS,
+    )
+
+# `statement_timeout` se fija por conexión en el servidor.
+connect_args = {}
+async_connect_args = {}
+if settings.DB_STATEMENT_TIMEOUT_MS:
+    connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    async_connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
 
 # Crea el motor de SQLAlchemy usando la URL de la configuración.
-# `pool_pre_ping=True` ayuda a manejar conexiones que se han cerrado por parte de la BD.
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+# El pool es configurable desde Settings y está instrumentado (ver `pool_metrics`).
+engine = create_engine(
+    settings.DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    connect_args=connect_args,
+    **_pool_kwargs(),
+)
+pool_metrics = _new_pool_metrics("sync")
+instrument_engine(engine, pool_metrics, settings.DB_LIVENESS_CHECK, settings.DB_LIVENESS_IDLE_SECONDS)
 
 # Crea una clase SessionLocal que será la fábrica de sesiones de base de datos.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Variante asíncrona (opcional). Sólo se crea si está activada, porque
+# necesita el driver asyncpg. `expire_on_commit=False` evita que la
+# serialización de la respuesta dispare cargas perezosas fuera del event loop.
+async_engine = None
+async_pool_metrics = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC_ENABLED:
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL,
+        poolclass=InstrumentedAsyncQueuePool,
+        connect_args=async_connect_args,
+        **_pool_kwargs(),
+    )
+    async_pool_metrics = _new_pool_metrics("async")
+    instrument_engine(
+        async_engine.sync_engine, async_pool_metrics, settings.DB_LIVENESS_CHECK, settings.DB_LIVENESS_IDLE_SECONDS
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+def get_pool_stats() -> dict:
+    """Estadísticas en vivo de los pools de conexiones."""
+    stats = {"sync": pool_metrics.snapshot(engine.pool)}
+    if async_engine is not None:
+        stats["async"] = async_pool_metrics.snapshot(async_engine.sync_engine.pool)
+    return stats
+
 def create_db_and_tables():
     """
     Función para crear todas las tablas en la base de datos.
@@ -0,0 +1,48 @@
+# app/core/json_response.py
+
+"""
+Serialización JSON rápida para endpoints con respuestas grandes.
+
+Por defecto FastAPI valida el valor devuelto contra `response_model`, lo
+vuelca a objetos Python con `jsonable_encoder` y después lo codifica con
+`json.dumps`. Aquí se valida una sola vez contra el schema de `app/schemas`
+(un `TypeAdapter` cacheado por tipo) y se codifica directamente a bytes con
+el serializador de pydantic-core, sin pasar por objetos intermedios.
+
+El resultado es idéntico byte a byte al de FastAPI (ver
+`app/cli/bench_json.py`). Los endpoints lo usan de forma explícita y siguen
+declarando `response_model` para la documentación OpenAPI; con
+`FAST_JSON_ENABLED=false` se vuelve al camino por defecto.
+"""
+
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def render_json(schema: Any, value: Any) -> bytes:
+    """
+    Serializa `value` (modelos ORM, schemas o listas de ellos) como `schema`.
+    Un valor que ya es instancia del schema no se vuelve a validar.
+    """
+    adapter = _adapter(schema)
+    validated = adapter.validate_python(value, from_attributes=True)
+    if settings.FAST_JSON_ENABLED:
+        return adapter.dump_json(validated)
+    return JSONResponse(content=jsonable_encoder(adapter.dump_python(validated, mode="json"))).body
+
+
+def json_response(schema: Any, value: Any, status_code: int = 200) -> Response:
+    """Respuesta JSON ya serializada con `render_json`."""
+    return Response(content=render_json(schema, value), status_code=status_code, media_type="application/json")
@@ -0,0 +1,170 @@
+# app/core/pool_metrics.py
+
+"""
+Instrumentación del pool de conexiones de SQLAlchemy.
+
+Permite saber si la latencia viene de esperar una conexión libre o de las
+consultas: cuenta checkouts, timeouts y fallos de liveness, mantiene un
+histograma del tiempo de espera en el pool y avisa en el log cuando el pool
+está saturado.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Límites superiores (en ms) de los buckets del histograma de espera.
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolMetrics:
+    """Contadores de un pool de conexiones. Seguro entre hilos."""
+
+    def __init__(self, name: str, capacity: int, saturation_log_interval: float = 10.0):
+        self.name = name
+        # Conexiones máximas: pool_size + max_overflow
+        self.capacity = capacity
+        self.saturation_log_interval = saturation_log_interval
+        self._lock = threading.Lock()
+        self._last_saturation_log = 0.0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.invalidations = 0
+        self.liveness_failures = 0
+        self.wait_ms_sum = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def observe_wait(self, seconds: float, pool: QueuePool):
+        wait_ms = seconds * 1000
+        index = next((i for i, bound in enumerate(WAIT_BUCKETS_MS) if wait_ms <= bound), len(WAIT_BUCKETS_MS))
+        with self._lock:
+            self.wait_ms_sum += wait_ms
+            self.wait_buckets[index] += 1
+        if pool.checkedout() >= self.capacity:
+            self._log_saturation(pool, wait_ms)
+
+    def record_checkout(self):
+        with self._lock:
+            self.checkouts += 1
+
+    def record_timeout(self, pool: QueuePool):
+        with self._lock:
+            self.timeouts += 1
+        self._log_saturation(pool, None)
+
+    def record_invalidation(self, liveness_failure: bool):
+        with self._lock:
+            self.invalidations += 1
+            if liveness_failure:
+                self.liveness_failures += 1
+
+    def _log_saturation(self, pool: QueuePool, wait_ms: Optional[float]):
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_saturation_log < self.saturation_log_interval:
+                return
+            self._last_saturation_log = now
+        logger.warning(
+            "DB pool %s saturated: %d/%d connections checked out, overflow=%d, last wait=%s, timeouts=%d",
+            self.name,
+            pool.checkedout(),
+            self.capacity,
+            pool.overflow(),
+            f"{wait_ms:.1f}ms" if wait_ms is not None else "timeout",
+            self.timeouts,
+        )
+
+    def snapshot(self, pool: QueuePool) -> Dict:
+        """Estado actual del pool y contadores acumulados."""
+        with self._lock:
+            histogram = {
+                **{f"le_{bound}ms": count for bound, count in zip(WAIT_BUCKETS_MS, self.wait_buckets)},
+                "le_inf": self.wait_buckets[-1],
+            }
+            return {
+                "name": self.name,
+                "pool_size": pool.size(),
+                "capacity": self.capacity,
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "saturated": pool.checkedout() >= self.capacity,
+                "checkouts_total": self.checkouts,
+                "timeouts_total": self.timeouts,
+                "invalidations_total": self.invalidations,
+                "liveness_failures_total": self.liveness_failures,
+                "wait_ms_sum": round(self.wait_ms_sum, 3),
+                "wait_ms_histogram": histogram,
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Mide cuánto tarda cada petición en obtener una conexión del pool."""
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_timeout(self)
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.observe_wait(time.perf_counter() - start, self)
+
+    def recreate(self):
+        # SQLAlchemy recrea el pool al invalidarlo; se conservan las métricas.
+        new_pool = super().recreate()
+        new_pool.metrics = self.metrics
+        return new_pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine: Engine, metrics: PoolMetrics, liveness: str, idle_seconds: float):
+    """
+    Conecta las métricas al pool del motor y configura la estrategia de
+    liveness:
+
+    - "pre_ping": ping antes de cada checkout (`pool_pre_ping=True` en el motor).
+    - "idle": sólo se hace ping a conexiones que llevan más de `idle_seconds`
+      sin usarse; las conexiones calientes se entregan sin ida y vuelta extra.
+    - "none": sin comprobación; se confía en `pool_recycle`.
+    """
+    pool = engine.pool
+    pool.metrics = metrics
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        if liveness == "idle":
+            idle_since = connection_record.info.get("checked_in_at")
+            if idle_since is not None and time.monotonic() - idle_since > idle_seconds:
+                try:
+                    engine.dialect.do_ping(dbapi_connection)
+                except Exception as e:
+                    # El pool descarta la conexión y reintenta con otra.
+                    raise exc.DisconnectionError() from e
+        metrics.record_checkout()
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(pool, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.record_invalidation(liveness_failure=isinstance(exception, exc.DisconnectionError))
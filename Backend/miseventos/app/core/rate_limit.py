@@ -0,0 +1,224 @@
+# app/core/rate_limit.py
+
+"""
+Limitación de peticiones con token buckets.
+
+`RateLimitMiddleware` es un middleware ASGI puro: antes de llegar al router
+consume un token del bucket de cada regla que aplica a la petición (por IP o
+por usuario) y, si alguno está vacío, responde 429 con `Retry-After` sin
+tocar la base de datos ni bcrypt.
+
+Los buckets se guardan en un `BucketStore`:
+
+- `LocalBucketStore`: en memoria del proceso, acotado (LRU). Es el valor por
+  defecto y el que se usa en tests; los límites son por worker.
+- `RedisBucketStore`: compartido entre workers, con la actualización del
+  bucket en un script Lua atómico. Requiere el extra `ratelimit` (redis).
+"""
+
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from jose import JWTError
+
+from app.core import security
+
+# Alcance de una regla
+SCOPE_IP = "ip"
+SCOPE_USER = "user"
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """`capacity` peticiones por `period` segundos para `method` + `paths`, por IP o por usuario."""
+    name: str
+    method: str
+    paths: Tuple[str, ...]
+    capacity: int
+    period: float
+    scope: str = SCOPE_IP
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.period
+
+    def matches(self, method: str, path: str) -> bool:
+        return method == self.method and path.rstrip("/") in self.paths
+
+
+def parse_rate(spec: str) -> Tuple[int, float]:
+    """Convierte "10/60" (10 peticiones cada 60 s) en `(10, 60.0)`."""
+    try:
+        capacity, period = spec.split("/")
+        capacity, period = int(capacity), float(period)
+    except ValueError:
+        raise ValueError(f"Invalid rate limit '{spec}', expected '<requests>/<seconds>'")
+    if capacity < 1 or period <= 0:
+        raise ValueError(f"Invalid rate limit '{spec}'")
+    return capacity, period
+
+
+class LocalBucketStore:
+    """
+    Buckets en memoria del proceso. Cada bucket ocupa una tupla
+    `(tokens, última actualización)`; se guardan como mucho `max_keys`,
+    descartando los menos usados (un bucket descartado vuelve lleno).
+    """
+
+    def __init__(self, max_keys: int = 100000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def consume(self, key: str, capacity: int, refill_rate: float) -> Tuple[bool, float]:
+        """Consume un token. Devuelve `(permitido, segundos hasta el siguiente token)`."""
+        now = self._clock()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (float(capacity), now))
+            tokens = min(float(capacity), tokens + (now - updated_at) * refill_rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (1 - tokens) / refill_rate
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+# Script Lua: lee el bucket, lo recarga, consume y guarda, de forma atómica.
+_REDIS_TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBucketStore:
+    """Buckets compartidos entre workers en Redis."""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError as e:
+            raise RuntimeError(
+                "RATE_LIMIT_BACKEND=redis requires the 'redis' package (poetry install -E ratelimit)"
+            ) from e
+        self._client = redis_asyncio.from_url(url)
+        self._script = self._client.register_script(_REDIS_TOKEN_BUCKET)
+        self._prefix = prefix
+
+    async def consume(self, key: str, capacity: int, refill_rate: float) -> Tuple[bool, float]:
+        allowed, tokens = await self._script(keys=[self._prefix + key], args=[capacity, refill_rate, time.time()])
+        tokens = float(tokens)
+        return bool(allowed), 0.0 if allowed else (1 - tokens) / refill_rate
+
+
+def _client_ip(scope, trust_forwarded: bool) -> str:
+    if trust_forwarded:
+        for name, value in scope.get("headers", ()):
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _token_subject(scope) -> Optional[str]:
+    """`sub` del token Bearer, si es válido. Sin token válido se limita por IP."""
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return None
+            try:
+                return security.decode_jwt_token(token).get("sub")
+            except JWTError:
+                return None
+    return None
+
+
+class RateLimitMiddleware:
+    """Middleware ASGI que aplica las reglas de `rules` usando `store`."""
+
+    def __init__(self, app, rules: Sequence[RateLimitRule], store, trust_forwarded: bool = False):
+        self.app = app
+        self.rules = list(rules)
+        self.store = store
+        self.trust_forwarded = trust_forwarded
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        method, path = scope["method"], scope["path"]
+        retry_after = 0.0
+        for rule in self.rules:
+            if not rule.matches(method, path):
+                continue
+            identity = _token_subject(scope) if rule.scope == SCOPE_USER else None
+            key = f"{rule.name}:{'user:' + identity if identity else 'ip:' + _client_ip(scope, self.trust_forwarded)}"
+            allowed, wait = await self.store.consume(key, rule.capacity, rule.refill_rate)
+            if not allowed:
+                retry_after = max(retry_after, wait)
+
+        if retry_after:
+            return await self._reject(send, retry_after)
+        return await self.app(scope, receive, send)
+
+    async def _reject(self, send, retry_after: float):
+        body = json.dumps({"detail": "Too many requests"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def build_rules(settings) -> List[RateLimitRule]:
+    """Reglas por ruta a partir de `Settings` (formato "<peticiones>/<segundos>")."""
+    prefix = settings.API_V1_STR
+    specs = [
+        ("login", "POST", (f"{prefix}/auth/login", f"{prefix}/auth/login-json"), settings.RATE_LIMIT_LOGIN, SCOPE_IP),
+        ("register", "POST", (f"{prefix}/auth/register",), settings.RATE_LIMIT_REGISTER, SCOPE_IP),
+        ("refresh", "POST", (f"{prefix}/auth/refresh",), settings.RATE_LIMIT_REFRESH, SCOPE_IP),
+        ("registrations", "POST", (f"{prefix}/registrations", f"{prefix}/registrations/batch"), settings.RATE_LIMIT_REGISTRATIONS, SCOPE_USER),
+    ]
+    rules = []
+    for name, method, paths, spec, scope in specs:
+        if spec:
+            capacity, period = parse_rate(spec)
+            rules.append(RateLimitRule(name, method, paths, capacity, period, scope))
+    return rules
+
+
+def build_store(settings):
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisBucketStore(settings.RATE_LIMIT_REDIS_URL)
+    return LocalBucketStore(max_keys=settings.RATE_LIMIT_MAX_KEYS)
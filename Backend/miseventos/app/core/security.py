@@ -1,7 +1,13 @@
 # app/core/security.py
 
+import asyncio
+import math
+import multiprocessing
+import threading
+import uuid
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, List, Optional, Sequence, Tuple, Union
 
 from jose import jwt, JWTError
 from passlib.context import CryptContext
@@ -11,20 +17,120 @@ from app.core.config import settings
 # --- Manejo de Contraseñas ---
 
 # Se crea un contexto para el hashing de contraseñas.
-# bcrypt es el algoritmo recomendado.
-password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt es el algoritmo recomendado. El coste es configurable; los hashes
+# con otro coste se consideran desactualizados (`needs_update`).
+password_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+class PasswordHasherBusyError(Exception):
+    """El pool de hashing está saturado; el cliente debe reintentar más tarde."""
+    def __init__(self, retry_after: int):
+        super().__init__("Password hashing is saturated, retry later.")
+        self.retry_after = retry_after
+
+def _hash_in_worker(password: str) -> str:
+    return password_context.hash(password)
+
+def _verify_and_update_in_worker(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return password_context.verify_and_update(password, hashed_password)
+
+class PasswordHasher:
+    """
+    Ejecuta bcrypt en un pool de procesos dedicado y acotado, para que el
+    coste de CPU no retenga el GIL del worker web.
+
+    Como máximo hay `max_pending` operaciones en curso o en cola; por encima
+    se espera hasta `queue_timeout` segundos y después se rechaza con
+    `PasswordHasherBusyError`. Con `workers=0` se ejecuta en el propio hilo.
+    """
+
+    def __init__(self, workers: int, max_pending: int, queue_timeout: float):
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max(max_pending, 1))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # "spawn": hacer fork de un proceso con hilos puede heredar locks tomados
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _acquire(self, timeout: Optional[float]):
+        acquired = self._slots.acquire(timeout=timeout) if timeout else self._slots.acquire(blocking=False)
+        if not acquired:
+            raise PasswordHasherBusyError(retry_after=max(1, math.ceil(self.queue_timeout)))
+
+    def _submit(self, func, *args) -> Future:
+        future = self._get_executor().submit(func, *args)
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, func, *args):
+        """Ejecuta `func` en el pool y espera el resultado (código síncrono)."""
+        if not self.workers:
+            return func(*args)
+        self._acquire(self.queue_timeout)
+        return self._submit(func, *args).result()
+
+    async def run_async(self, func, *args):
+        """Ejecuta `func` en el pool sin bloquear el event loop; rechaza en vez de esperar un hueco."""
+        if not self.workers:
+            return func(*args)
+        self._acquire(None)
+        return await asyncio.wrap_future(self._submit(func, *args))
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS,
+)
 
 def hash_password(password: str) -> str:
     """
     Genera el hash de una contraseña.
     """
-    return password_context.hash(password)
+    return password_hasher.run(_hash_in_worker, password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verifica una contraseña en texto plano contra su hash.
     """
-    return password_context.verify(plain_password, hashed_password)
+    return verify_and_update_password(plain_password, hashed_password)[0]
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica la contraseña y, si el hash usa una configuración desactualizada
+    (p. ej. otro coste de bcrypt), devuelve también el nuevo hash.
+    """
+    return password_hasher.run(_verify_and_update_in_worker, plain_password, hashed_password)
+
+def hash_passwords(passwords: Sequence[str], executor: Optional[Executor] = None) -> List[str]:
+    """
+    Hashea un lote de contraseñas en `executor` (p. ej. un pool de procesos
+    propio de una importación masiva) o, sin él, en el hilo actual. No pasa
+    por `password_hasher`, reservado a las peticiones web.
+    """
+    if executor is None:
+        return [_hash_in_worker(password) for password in passwords]
+    return list(executor.map(_hash_in_worker, passwords))
+
+async def hash_password_async(password: str) -> str:
+    return await password_hasher.run_async(_hash_in_worker, password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await password_hasher.run_async(_verify_and_update_in_worker, plain_password, hashed_password)
 
 
 # --- Manejo de JSON Web Tokens (JWT) ---
@@ -42,7 +148,8 @@ def create_jwt_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     
-    to_encode = {"exp": expire, "sub": str(subject)}
+    # `jti` identifica el token para poder revocarlo (ver `token_revocation`)
+    to_encode = {"exp": expire, "sub": str(subject), "jti": uuid.uuid4().hex}
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
@@ -1,15 +1,18 @@
 # app/dependencies.py
 
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlmodel import select
 from jose import jwt, JWTError
 
-from app.core.db import SessionLocal
+from app.core.db import SessionLocal, AsyncSessionLocal
 from app.core import security
 from app.models import User, Event, EventSession
+from app.services import principal_service, token_revocation
+from app.services.principal_service import Principal
 
 # Esquema de seguridad para obtener el token de la cabecera "Authorization"
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
@@ -24,28 +27,89 @@ def get_db() -> Generator:
     finally:
         db.close()
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
+async def get_async_db() -> AsyncGenerator:
     """
-    Decodifica el token JWT y obtiene el usuario actual.
+    Generador de sesión asíncrona de base de datos (DB_ASYNC_ENABLED).
     """
-    credentials_exception = HTTPException(
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def _token_claims(token: str) -> dict:
+    """
+    Decodifica el token JWT y comprueba que no esté revocado. La comprobación
+    es en memoria (`token_revocation`), sin acceso a la base de datos.
+    """
     try:
         payload = security.decode_jwt_token(token)
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
-    
-    user = db.exec(select(User).where(User.email == email)).first()
+        raise _credentials_exception()
+    if payload.get("sub") is None:
+        raise _credentials_exception()
+    jti = payload.get("jti")
+    if jti and token_revocation.revocation_list.is_revoked(jti):
+        raise _credentials_exception()
+    return payload
+
+def _token_subject(token: str) -> str:
+    """Devuelve el `sub` (email) de un token válido y no revocado."""
+    return _token_claims(token)["sub"]
+
+def get_token_claims(token: str = Depends(oauth2_scheme)) -> dict:
+    """
+    Claims del token de acceso actual (p. ej. para revocarlo en el logout).
+    """
+    return _token_claims(token)
+
+def get_current_principal(
+    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> Principal:
+    """
+    Identifica al usuario del token. Usa la caché de principales, así que en
+    un acierto no se toca la base de datos (la sesión no llega a pedir conexión).
+    """
+    principal = principal_service.get_principal(db, _token_subject(token))
+    if principal is None:
+        raise _credentials_exception()
+    return principal
+
+def get_current_active_principal(
+    principal: Principal = Depends(get_current_principal),
+) -> Principal:
+    """
+    Verifica si el usuario actual está activo.
+    """
+    if not principal.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return principal
+
+def get_current_admin_principal(
+    principal: Principal = Depends(get_current_active_principal),
+) -> Principal:
+    """
+    Exige un administrador (p. ej. endpoints de diagnóstico con contadores internos).
+    """
+    if not principal.is_admin:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    return principal
+
+def get_current_user(
+    db: Session = Depends(get_db), principal: Principal = Depends(get_current_principal)
+) -> User:
+    """
+    Obtiene el usuario completo del token, para los endpoints que lo necesitan
+    (p. ej. devolver el perfil). Para comprobar identidad o rol basta con
+    `get_current_principal`.
+    """
+    user = db.get(User, principal.id)
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     return user
 
 def get_current_active_user(
@@ -58,6 +122,52 @@ def get_current_active_user(
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
+async def get_current_principal_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+) -> Principal:
+    """
+    Variante asíncrona de `get_current_principal`.
+    """
+    email = _token_subject(token)
+    principal = principal_service.get_cached_principal(email)
+    if principal is None:
+        user = (await db.execute(select(User).where(User.email == email))).scalars().first()
+        if user is None:
+            raise _credentials_exception()
+        principal = principal_service.cache_principal(user)
+    return principal
+
+async def get_current_active_principal_async(
+    principal: Principal = Depends(get_current_principal_async),
+) -> Principal:
+    """
+    Variante asíncrona de `get_current_active_principal`.
+    """
+    if not principal.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return principal
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), principal: Principal = Depends(get_current_principal_async)
+) -> User:
+    """
+    Variante asíncrona de `get_current_user`.
+    """
+    user = await db.get(User, principal.id)
+    if user is None:
+        raise _credentials_exception()
+    return user
+
+async def get_current_active_user_async(
+    current_user: User = Depends(get_current_user_async),
+) -> User:
+    """
+    Variante asíncrona de `get_current_active_user`.
+    """
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
 # Dependencias para obtener objetos por ID, manejando el error 404
 def get_event_by_id(event_id: int, db: Session = Depends(get_db)) -> Event:
     event = db.get(Event, event_id)
@@ -70,3 +180,15 @@ def get_session_by_id(session_id: int, db: Session = Depends(get_db)) -> EventSe
     if not session or session.deleted_at:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
     return session
+
+async def get_event_by_id_async(event_id: int, db: AsyncSession = Depends(get_async_db)) -> Event:
+    event = await db.get(Event, event_id)
+    if not event or event.deleted_at:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
+    return event
+
+async def get_session_by_id_async(session_id: int, db: AsyncSession = Depends(get_async_db)) -> EventSession:
+    session = await db.get(EventSession, session_id)
+    if not session or session.deleted_at:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
+    return session
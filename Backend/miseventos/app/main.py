@@ -1,17 +1,86 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 # --- Importación de configuraciones y routers ---
 from app.core.config import settings
-from app.routers import auth, events, registrations, users
+from app.core.background import PeriodicTask, with_db_session
+from app.core.db import async_engine, get_pool_stats
+from app.core.rate_limit import RateLimitMiddleware, build_rules, build_store
+from app.core.security import password_hasher
+from app.dependencies import get_current_admin_principal
+from app.routers import users
+from app.services import auth_service, catalog_cache, event_service, principal_service, registration_service, token_service
+
+# Los routers de autenticación, eventos y registros tienen una variante
+# asíncrona (AsyncSession + asyncpg) que se elige por configuración.
+if settings.DB_ASYNC_ENABLED:
+    from app.routers import async_auth as auth, async_events as events, async_registrations as registrations
+else:
+    from app.routers import auth, events, registrations
+
+# --- Tareas en segundo plano ---
+def _build_background_tasks() -> list:
+    tasks = [
+        PeriodicTask(
+            "token-revocation-sync",
+            settings.TOKEN_REVOCATION_SYNC_INTERVAL_SECONDS,
+            with_db_session(token_service.sync_revocations),
+            run_on_start=True,
+        ),
+        PeriodicTask("token-revocation-purge", 3600, with_db_session(token_service.purge_revoked_tokens)),
+    ]
+    if settings.LAST_LOGIN_WRITE_BEHIND_ENABLED:
+        tasks.append(PeriodicTask(
+            "last-login-flush",
+            settings.LAST_LOGIN_FLUSH_INTERVAL_SECONDS,
+            with_db_session(auth_service.flush_last_logins),
+        ))
+    if settings.SEAT_INVENTORY_ENABLED:
+        tasks.append(PeriodicTask(
+            "seat-inventory-flush",
+            settings.SEAT_INVENTORY_FLUSH_INTERVAL_SECONDS,
+            with_db_session(registration_service.flush_seat_inventory),
+        ))
+        tasks.append(PeriodicTask(
+            "seat-inventory-reconcile",
+            settings.SEAT_INVENTORY_RECONCILE_INTERVAL_SECONDS,
+            with_db_session(registration_service.reconcile_seat_inventory),
+        ))
+    return tasks
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = _build_background_tasks()
+    for task in tasks:
+        task.start()
+    yield
+    # Apagado ordenado: cada tarea se ejecuta una última vez.
+    for task in reversed(tasks):
+        task.stop()
+    password_hasher.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 # --- Creación de la instancia principal de la aplicación ---
 app = FastAPI(
     title=settings.PROJECT_NAME,
     debug=settings.DEBUG,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json" if settings.is_development else None
+    openapi_url=f"{settings.API_V1_STR}/openapi.json" if settings.is_development else None,
+    lifespan=lifespan,
 )
 
+# Límite de peticiones en auth e inscripciones. Se añade antes que CORS para
+# que las respuestas 429 también lleven las cabeceras CORS.
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        rules=build_rules(settings),
+        store=build_store(settings),
+        trust_forwarded=settings.RATE_LIMIT_TRUST_FORWARDED,
+    )
+
 # Configuración de CORS
 origins = [
     "http://localhost",
@@ -44,4 +113,19 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy", "environment": settings.ENVIRONMENT}
\ No newline at end of file
+    return {"status": "healthy", "environment": settings.ENVIRONMENT}
+
+# Los endpoints de diagnóstico exponen contadores internos: sólo para administradores
+@app.get("/health/db-pool", dependencies=[Depends(get_current_admin_principal)])
+def db_pool_stats():
+    """Estadísticas en vivo del pool de conexiones (esperas, overflow, fallos de liveness)."""
+    return get_pool_stats()
+
+@app.get("/health/caches", dependencies=[Depends(get_current_admin_principal)])
+def cache_stats():
+    """Tamaño y aciertos/fallos de las cachés en memoria de este proceso."""
+    return {
+        "principals": principal_service.principal_cache.stats(),
+        "event_counts": event_service.count_cache.stats(),
+        "catalog": catalog_cache.cache.stats(),
+    }
\ No newline at end of file
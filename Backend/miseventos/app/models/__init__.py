@@ -20,4 +20,6 @@ from .base import BaseModel
 from .user import User
 from .event import Event
 from .session import EventSession
-from .attendance import Attendance
\ No newline at end of file
+from .attendance import Attendance
+from .refresh_token import RefreshToken
+from .revoked_token import RevokedToken
\ No newline at end of file
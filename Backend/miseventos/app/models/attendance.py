@@ -1,5 +1,6 @@
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
+from sqlalchemy import Index, UniqueConstraint, text
 from sqlmodel import Field, Relationship
 from app.models.base import BaseModel
 from app.utils.enums import AttendanceStatus
@@ -18,9 +19,23 @@ class Attendance(BaseModel, table=True):
     registration_date: datetime = Field(default_factory=datetime.utcnow)
     status: AttendanceStatus = Field(default=AttendanceStatus.CONFIRMED)
     attendee_role: Optional[str] = Field(default=None, max_length=100)
+    # Posición FIFO en la lista de espera; sólo tiene valor con status WAITLIST
+    waitlist_position: Optional[int] = Field(default=None, nullable=True)
     
     # Índice único para evitar duplicados
     __table_args__ = (
+        UniqueConstraint("user_id", "session_id", name="uq_attendances_user_session"),
+        # Índice para obtener la cabeza de la lista de espera en O(log n)
+        Index(
+            "ix_attendances_session_waitlist",
+            "session_id",
+            "waitlist_position",
+            postgresql_where=text("waitlist_position IS NOT NULL"),
+        ),
+        # Registros de un usuario, del más reciente al más antiguo (`/users/me/registrations`)
+        Index("ix_attendances_user_registration_date", "user_id", "registration_date"),
+        # Recuento agregado de confirmados por sesión (detalle de evento)
+        Index("ix_attendances_session_status", "session_id", "status"),
         {"mysql_engine": "InnoDB"},
     )
     
@@ -31,7 +46,14 @@ class Attendance(BaseModel, table=True):
     def confirm(self):
         """Confirma la asistencia."""
         self.status = AttendanceStatus.CONFIRMED
+        self.waitlist_position = None
 
     def cancel(self):
         """Cancela la asistencia."""
-        self.status = AttendanceStatus.CANCELLED
\ No newline at end of file
+        self.status = AttendanceStatus.CANCELLED
+        self.waitlist_position = None
+
+    def join_waitlist(self, position: int):
+        """Coloca la asistencia en la lista de espera."""
+        self.status = AttendanceStatus.WAITLIST
+        self.waitlist_position = position
\ No newline at end of file
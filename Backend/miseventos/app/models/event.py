@@ -1,5 +1,6 @@
 from datetime import datetime
 from typing import Optional, List, TYPE_CHECKING
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship
 from app.models.base import BaseModel
 from app.utils.enums import EventCategory, EventStatus
@@ -12,6 +13,31 @@ if TYPE_CHECKING:
 class Event(BaseModel, table=True):
     """Modelo de tabla Evento"""
     __tablename__ = "events"
+    __table_args__ = (
+        # Soporta el orden (start_date, id) del listado público y la paginación por cursor
+        Index(
+            "ix_events_published_start_date_id",
+            "start_date",
+            "id",
+            postgresql_where=text("status = 'PUBLISHED' AND deleted_at IS NULL"),
+        ),
+        # MAX(updated_at): versión del catálogo para peticiones condicionales
+        Index("ix_events_updated_at", "updated_at"),
+        # Listado filtrado por estado y rango de fechas, en el orden del listado
+        Index("ix_events_status_deleted_start_date", "status", "deleted_at", "start_date", "id"),
+        # Listado filtrado por categoría y facetas por (categoría, mes)
+        Index(
+            "ix_events_status_category_start_date",
+            "status",
+            "category",
+            "start_date",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # El índice GIN de búsqueda (`ix_events_search_vector`) es una expresión
+        # sólo de PostgreSQL y se crea por migración; ver `search_service`.
+        # También lo es el de trigramas para el filtro de ubicación
+        # (`ix_events_general_location_trgm`).
+    )
     
     name: str = Field(index=True, min_length=1, max_length=255)
     general_location: str = Field(min_length=1, max_length=500)
@@ -24,7 +50,7 @@ class Event(BaseModel, table=True):
     end_date: datetime
     event_resources: Optional[str] = Field(default=None)
     creator_id: int = Field(foreign_key="users.id", nullable=False)
-    max_capacity: Optional[int] = Field(default=None, ge=1)  # Calculado desde sesiones
+    max_capacity: Optional[int] = Field(default=None, ge=0)  # Suma de las sesiones activas, mantenida por session_service
     
     # Relaciones
     creator: "User" = Relationship(back_populates="created_events")
@@ -49,7 +75,9 @@ class Event(BaseModel, table=True):
 
     @property
     def total_capacity(self) -> int:
-        """Calcula la capacidad total del evento sumando la de sus sesiones."""
-        if not self.sessions:
-            return 0
-        return sum(session.max_capacity for session in self.sessions)
\ No newline at end of file
+        """
+        Capacidad total del evento.
+        Se lee de la columna desnormalizada `max_capacity`, así que no carga
+        las sesiones (evita N+1 al listar eventos).
+        """
+        return self.max_capacity or 0
\ No newline at end of file
@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Optional, TYPE_CHECKING
+from sqlmodel import Field, Relationship
+from app.models.base import BaseModel
+
+if TYPE_CHECKING:
+    from app.models.user import User
+
+
+class RefreshToken(BaseModel, table=True):
+    """
+    Modelo de tabla Token de refresco.
+    Sólo se guarda el hash SHA-256 del token. Cada rotación crea un token
+    nuevo en la misma familia (`family_id`) y revoca el anterior.
+    """
+    __tablename__ = "refresh_tokens"
+    
+    user_id: int = Field(foreign_key="users.id", nullable=False, index=True)
+    token_hash: str = Field(unique=True, index=True, max_length=64)
+    family_id: str = Field(index=True, max_length=32)
+    expires_at: datetime = Field(nullable=False)
+    revoked_at: Optional[datetime] = Field(default=None, nullable=True)
+    
+    # Relaciones
+    user: "User" = Relationship()
+
+    @property
+    def is_active(self) -> bool:
+        """Propiedad para verificar si el token se puede usar."""
+        return self.revoked_at is None and self.expires_at > datetime.utcnow()
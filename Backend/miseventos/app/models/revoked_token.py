@@ -0,0 +1,16 @@
+from datetime import datetime
+from sqlmodel import Field
+from app.models.base import BaseModel
+
+
+class RevokedToken(BaseModel, table=True):
+    """
+    Modelo de tabla Token revocado.
+    Registra el `jti` de los tokens de acceso revocados hasta que caducan.
+    Los workers leen las filas por `created_at`, con un margen de solapamiento,
+    para sincronizar su lista de revocación en memoria.
+    """
+    __tablename__ = "revoked_tokens"
+    
+    jti: str = Field(unique=True, index=True, max_length=32)
+    expires_at: datetime = Field(nullable=False, index=True)
@@ -1,27 +1,47 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional, List, TYPE_CHECKING
+from sqlalchemy import Index, event, text
 from sqlmodel import Field, Relationship
 from app.models.base import BaseModel
 from app.utils.enums import SessionStatus
-from app.utils.enums import SessionStatus, AttendanceStatus
 
 if TYPE_CHECKING:
     from app.models.event import Event
     from app.models.attendance import Attendance
+    from app.models.user import User
+
+# Duración de una sesión cuando ni ella ni su evento la indican
+DEFAULT_SESSION_MINUTES = 60
 
 
 class EventSession(BaseModel, table=True):
     """Modelo de tabla Sesión de Evento"""
     __tablename__ = "event_sessions"
+    __table_args__ = (
+        # Búsqueda de la sesión anterior en la validación de horarios (ver
+        # `session_service._check_schedule_conflict`). En PostgreSQL, además,
+        # la restricción de exclusión `ex_event_sessions_no_overlap` (gist sobre
+        # `tsrange(session_datetime, session_end)`) se crea por migración.
+        Index(
+            "ix_event_sessions_event_schedule",
+            "event_id",
+            "session_datetime",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
     
-    event_id: int = Field(foreign_key="events.id", nullable=False)
+    event_id: int = Field(foreign_key="events.id", nullable=False, index=True)
     presenter: str = Field(min_length=1, max_length=255)
     status: SessionStatus = Field(default=SessionStatus.DRAFT)
     session_datetime: datetime
+    duration_minutes: int = Field(default=DEFAULT_SESSION_MINUTES, ge=1)
+    session_end: Optional[datetime] = Field(default=None, nullable=False)  # session_datetime + duration_minutes
     specific_location: str = Field(min_length=1, max_length=500)
     max_capacity: int = Field(ge=1)
     session_resources: Optional[str] = Field(default=None)
     current_attendees: int = Field(default=0, ge=0)  # Contador de asistentes actuales
+    waitlist_seq: int = Field(default=0, ge=0)  # Última posición asignada en la lista de espera
+    seat_inventory_enabled: bool = Field(default=False)  # Registro vía inventario en memoria (preventa/venta)
     
     # Relaciones
     event: "Event" = Relationship(back_populates="sessions")
@@ -29,10 +49,18 @@ class EventSession(BaseModel, table=True):
 
     @property
     def attendee_count(self) -> int:
-        """Cuenta el número actual de asistentes confirmados."""
-        # Esto asume que la relación `attendances` está cargada.
-        # Filtra por un estado si es necesario, ej. CONFIRMED.
-        return sum(1 for att in self.attendances if att.status == AttendanceStatus.CONFIRMED)
+        """
+        Número de asistentes confirmados, sin cargar `attendances`.
+
+        `current_attendees` lo mantiene el registro en la misma transacción
+        que la asistencia. Con el inventario en memoria, en cambio, incluye
+        las plazas reservadas en bloque y aún sin vender: para esas sesiones
+        se usa el recuento precargado por `session_service.load_attendee_counts`.
+        """
+        confirmed = getattr(self, "_confirmed_attendees", None)
+        if self.seat_inventory_enabled and confirmed is not None:
+            return confirmed
+        return self.current_attendees
 
     @property
     def is_full(self) -> bool:
@@ -47,4 +75,11 @@ class EventSession(BaseModel, table=True):
         for attendance in self.attendances:
             if attendance.user_id == user.id:
                 return False
-        return True
\ No newline at end of file
+        return True
+
+
+@event.listens_for(EventSession, "before_insert")
+@event.listens_for(EventSession, "before_update")
+def _sync_session_end(mapper, connection, target: EventSession):
+    """Mantiene `session_end`, el final del intervalo [inicio, fin) de la sesión."""
+    target.session_end = target.session_datetime + timedelta(minutes=target.duration_minutes)
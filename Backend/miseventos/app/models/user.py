@@ -4,7 +4,7 @@ from sqlmodel import Field, Relationship
 from pydantic import EmailStr
 from app.models.base import BaseModel
 from app.utils.enums import UserRole
-from app.core.security import password_context
+from app.core.security import hash_password, verify_password
 
 if TYPE_CHECKING:
     from app.models.event import Event
@@ -27,12 +27,12 @@ class User(BaseModel, table=True):
     attendances: List["Attendance"] = Relationship(back_populates="user")
 
     def set_password(self, plain_password: str):
-        """Hashea y establece la contraseña del usuario."""
-        self.password_hash = password_context.hash(plain_password)
+        """Hashea y establece la contraseña del usuario (en el pool de hashing)."""
+        self.password_hash = hash_password(plain_password)
 
     def check_password(self, plain_password: str) -> bool:
         """Verifica una contraseña en texto plano contra el hash almacenado."""
-        return password_context.verify(plain_password, self.password_hash)
+        return verify_password(plain_password, self.password_hash)
 
     @property
     def is_admin(self) -> bool:
@@ -0,0 +1,125 @@
+# app/routers/async_auth.py
+# Variante asíncrona de app/routers/auth.py (DB_ASYNC_ENABLED).
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services import async_auth_service, token_service
+from app.schemas import user_schemas, token_schemas, auth_schemas
+from app.core.security import PasswordHasherBusyError
+from app.dependencies import get_async_db, get_current_user_async, get_token_claims
+from app.models.user import User
+
+router = APIRouter(
+    prefix="/auth",
+    tags=["Authentication"]
+)
+
+def _hashing_busy(e: PasswordHasherBusyError) -> HTTPException:
+    """El pool de hashing está saturado: 503 con Retry-After en lugar de encolar sin límite."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(e),
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+@router.post("/register", response_model=user_schemas.UserRead, status_code=status.HTTP_201_CREATED)
+async def register_user(
+    user_in: user_schemas.UserCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Endpoint para registrar un nuevo usuario.
+    """
+    try:
+        return await async_auth_service.register_new_user(db=db, user_data=user_in)
+    except async_auth_service.EmailAlreadyExistsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
+    except PasswordHasherBusyError as e:
+        raise _hashing_busy(e)
+
+@router.post("/login", response_model=token_schemas.Token)
+async def login_for_access_token(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Endpoint para el inicio de sesión usando OAuth2PasswordRequestForm.
+    """
+    try:
+        user = await async_auth_service.authenticate_user(db=db, email=form_data.username, password=form_data.password)
+    except PasswordHasherBusyError as e:
+        raise _hashing_busy(e)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return await async_auth_service.issue_tokens(db=db, user=user)
+
+@router.post("/login-json", response_model=token_schemas.Token)
+async def login_with_json(
+    login_data: auth_schemas.LoginRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Endpoint alternativo para login con JSON (más conveniente para frontend).
+    """
+    try:
+        user = await async_auth_service.authenticate_user(db=db, email=login_data.email, password=login_data.password)
+    except PasswordHasherBusyError as e:
+        raise _hashing_busy(e)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return await async_auth_service.issue_tokens(db=db, user=user)
+
+@router.post("/refresh", response_model=token_schemas.Token)
+async def refresh_access_token(
+    body: auth_schemas.RefreshTokenRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Emite un token de acceso nuevo a partir del token de refresco, sin volver
+    a verificar la contraseña. El token de refresco se rota: hay que guardar
+    el que devuelve la respuesta.
+    """
+    try:
+        return await async_auth_service.refresh_tokens(db=db, refresh_token=body.refresh_token)
+    except token_service.InvalidRefreshTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    body: Optional[auth_schemas.RefreshTokenRequest] = None,
+    claims: dict = Depends(get_token_claims),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Cierra la sesión: revoca el token de acceso actual (en todos los workers
+    en pocos segundos) y, si se envía, el token de refresco del dispositivo.
+    """
+    await async_auth_service.logout(db=db, claims=claims, refresh_token=body.refresh_token if body else None)
+
+@router.get("/me", response_model=user_schemas.UserRead)
+async def get_current_user_info(
+    current_user: User = Depends(get_current_user_async)
+):
+    """
+    Obtener información del usuario actual.
+    """
+    return current_user
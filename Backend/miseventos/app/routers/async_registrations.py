@@ -0,0 +1,84 @@
+# app/routers/async_registrations.py
+# Variante asíncrona de app/routers/registrations.py (DB_ASYNC_ENABLED).
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Event
+from app.schemas import attendance_schemas
+from app.services import async_registration_service, registration_service
+from app.services.principal_service import Principal
+from app.dependencies import get_async_db, get_current_active_principal_async, get_session_by_id_async
+
+router = APIRouter(
+    prefix="/registrations",
+    tags=["Event Registrations"]
+)
+
+@router.post("", response_model=attendance_schemas.AttendanceRead, status_code=status.HTTP_201_CREATED)
+async def register_for_session(
+    registration_in: attendance_schemas.AttendanceCreate,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_principal_async)
+):
+    """
+    Registra al usuario autenticado en una sesión específica.
+    Responde 202 si la plaza se admitió desde el inventario en memoria y
+    el registro aún no se ha escrito en la base de datos (la variante
+    asíncrona del servicio no usa el inventario, ver `async_registration_service`).
+    """
+    session = await get_session_by_id_async(session_id=registration_in.session_id, db=db)
+
+    try:
+        attendance = await async_registration_service.register_user_for_session(db=db, user=current_user, session=session)
+        if attendance.id is None:
+            response.status_code = status.HTTP_202_ACCEPTED
+        return attendance
+    except registration_service.RegistrationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.post("/batch", response_model=attendance_schemas.BatchRegistrationResponse)
+async def register_batch(
+    batch_in: attendance_schemas.BatchRegistrationCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_principal_async)
+):
+    """
+    Registra a varios usuarios en varias sesiones de un mismo evento.
+    Solo para el organizador del evento o administradores.
+    """
+    try:
+        sessions = await async_registration_service.get_batch_sessions(db=db, session_ids=batch_in.session_ids)
+    except registration_service.RegistrationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    event = await db.get(Event, sessions[0].event_id)
+    if event.creator_id != current_user.id and not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to register users for this event")
+
+    return await async_registration_service.register_users_batch(db=db, user_ids=batch_in.user_ids, sessions=sessions)
+
+@router.delete("/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def cancel_registration_for_session(
+    session_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_principal_async)
+):
+    """
+    Cancela el registro del usuario autenticado para una sesión.
+    """
+    session = await get_session_by_id_async(session_id=session_id, db=db)
+
+    try:
+        await async_registration_service.cancel_registration(db=db, user=current_user, session=session)
+    except registration_service.RegistrationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+
+    return None # Retorna 204 No Content
@@ -1,11 +1,13 @@
 # app/routers/auth.py
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
-from app.services import auth_service
+from app.services import auth_service, token_service
 from app.schemas import user_schemas, token_schemas, auth_schemas
-from app.dependencies import get_db, get_current_user
+from app.core.security import PasswordHasherBusyError
+from app.dependencies import get_db, get_current_user, get_token_claims
 from app.models.user import User
 
 router = APIRouter(
@@ -13,6 +15,14 @@ router = APIRouter(
     tags=["Authentication"]
 )
 
+def _hashing_busy(e: PasswordHasherBusyError) -> HTTPException:
+    """El pool de hashing está saturado: 503 con Retry-After en lugar de encolar sin límite."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(e),
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
 @router.post("/register", response_model=user_schemas.UserRead, status_code=status.HTTP_201_CREATED)
 def register_user(
     user_in: user_schemas.UserCreate,
@@ -29,6 +39,8 @@ def register_user(
             status_code=status.HTTP_409_CONFLICT,
             detail=str(e),
         )
+    except PasswordHasherBusyError as e:
+        raise _hashing_busy(e)
 
 @router.post("/login", response_model=token_schemas.Token)
 def login_for_access_token(
@@ -38,7 +50,10 @@ def login_for_access_token(
     """
     Endpoint para el inicio de sesión usando OAuth2PasswordRequestForm.
     """
-    user = auth_service.authenticate_user(db=db, email=form_data.username, password=form_data.password)
+    try:
+        user = auth_service.authenticate_user(db=db, email=form_data.username, password=form_data.password)
+    except PasswordHasherBusyError as e:
+        raise _hashing_busy(e)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -46,9 +61,7 @@ def login_for_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token = auth_service.create_access_token(user=user)
-    
-    return token_schemas.Token(access_token=access_token, token_type="bearer")
+    return auth_service.issue_tokens(db=db, user=user)
 
 @router.post("/login-json", response_model=token_schemas.Token)
 def login_with_json(
@@ -58,7 +71,10 @@ def login_with_json(
     """
     Endpoint alternativo para login con JSON (más conveniente para frontend).
     """
-    user = auth_service.authenticate_user(db=db, email=login_data.email, password=login_data.password)
+    try:
+        user = auth_service.authenticate_user(db=db, email=login_data.email, password=login_data.password)
+    except PasswordHasherBusyError as e:
+        raise _hashing_busy(e)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -66,9 +82,38 @@ def login_with_json(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token = auth_service.create_access_token(user=user)
-    
-    return token_schemas.Token(access_token=access_token, token_type="bearer")
+    return auth_service.issue_tokens(db=db, user=user)
+
+@router.post("/refresh", response_model=token_schemas.Token)
+def refresh_access_token(
+    body: auth_schemas.RefreshTokenRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Emite un token de acceso nuevo a partir del token de refresco, sin volver
+    a verificar la contraseña. El token de refresco se rota: hay que guardar
+    el que devuelve la respuesta.
+    """
+    try:
+        return auth_service.refresh_tokens(db=db, refresh_token=body.refresh_token)
+    except token_service.InvalidRefreshTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    body: Optional[auth_schemas.RefreshTokenRequest] = None,
+    claims: dict = Depends(get_token_claims),
+    db: Session = Depends(get_db)
+):
+    """
+    Cierra la sesión: revoca el token de acceso actual (en todos los workers
+    en pocos segundos) y, si se envía, el token de refresco del dispositivo.
+    """
+    auth_service.logout(db=db, claims=claims, refresh_token=body.refresh_token if body else None)
 
 @router.get("/me", response_model=user_schemas.UserRead)
 def get_current_user_info(
@@ -1,12 +1,17 @@
 # app/routers/events.py
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from datetime import datetime
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from sqlalchemy.orm import Session
 
-from app.models import User, Event
+from app.core import conditional
+from app.core.json_response import json_response
+from app.models import Event
 from app.schemas import event_schemas, session_schemas
-from app.services import event_service, session_service
-from app.dependencies import get_db, get_current_active_user, get_event_by_id
+from app.services import catalog_cache, event_service, session_service
+from app.services.principal_service import Principal
+from app.utils.enums import EventCategory, EventStatus
+from app.dependencies import get_db, get_current_active_principal, get_event_by_id, get_session_by_id
 
 router = APIRouter(
     prefix="/events",
@@ -17,26 +22,70 @@ router = APIRouter(
 
 @router.get("", response_model=event_schemas.EventListResponse)
 def list_events(
+    request: Request,
     page: int = Query(1, ge=1, description="Número de página"),
     limit: int = Query(10, ge=1, le=100, description="Eventos por página"),
-    search: Optional[str] = Query(None, description="Buscar por nombre"),
+    search: Optional[str] = Query(None, description="Búsqueda de texto en nombre, descripción, ubicación y categoría"),
+    pagination: Literal["page", "cursor"] = Query("page", description="Paginación por página u opaca por cursor"),
+    cursor: Optional[str] = Query(None, description="Cursor devuelto en `next_cursor` (implica paginación por cursor)"),
+    include_total: Optional[bool] = Query(None, description="Calcular el total (por defecto sólo en paginación por página)"),
+    count_mode: Literal["exact", "estimated"] = Query("exact", description="Total exacto o estimado por el planificador para listados amplios"),
+    category: Optional[EventCategory] = Query(None, description="Filtrar por categoría"),
+    date_from: Optional[datetime] = Query(None, description="Eventos que empiezan desde esta fecha"),
+    date_to: Optional[datetime] = Query(None, description="Eventos que empiezan hasta esta fecha"),
+    location: Optional[str] = Query(None, min_length=2, description="Texto contenido en la ubicación"),
+    event_status: EventStatus = Query(EventStatus.PUBLISHED, alias="status", description="Estado (publicado, en curso, finalizado o cancelado)"),
+    facets: bool = Query(False, description="Incluir recuentos por categoría y por mes"),
     db: Session = Depends(get_db)
 ):
     """
-    Lista eventos con paginación y búsqueda opcional.
+    Lista eventos con paginación, búsqueda y filtros opcionales, y con
+    recuentos por faceta si se piden. La respuesta se sirve desde la caché
+    del catálogo (ver `catalog_cache`) y es 304 si el cliente ya tiene la
+    versión actual.
     """
-    return event_service.get_events_paginated(
-        db=db, 
-        page=page, 
-        limit=limit, 
-        search=search
+    use_cursor = pagination == "cursor" or cursor is not None
+    if include_total is None:
+        include_total = not use_cursor
+    estimate_total = count_mode == "estimated"
+    try:
+        filters = event_service.EventFilters(
+            category=category, date_from=date_from, date_to=date_to, location=location, status=event_status
+        ).normalized()
+    except event_service.InvalidFilterError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    def build():
+        result = event_service.get_events_paginated(
+            db=db,
+            page=page,
+            limit=limit,
+            search=search,
+            cursor=cursor,
+            use_cursor=use_cursor,
+            include_total=include_total,
+            estimate_total=estimate_total,
+            filters=filters,
+            include_facets=facets,
+        )
+        return result, [event.id for event in result.events]
+
+    key = catalog_cache.list_key(
+        page, limit, search, cursor, use_cursor, include_total, estimate_total,
+        filters if filters.active else None, facets,
     )
+    try:
+        return catalog_cache.serve(
+            request, key, event_schemas.EventListResponse, lambda: event_service.get_catalog_version(db), build
+        )
+    except event_service.InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 @router.post("", response_model=event_schemas.EventRead, status_code=status.HTTP_201_CREATED)
 def create_event(
     event_in: event_schemas.EventCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_principal)
 ):
     """
     Crea un nuevo evento. Solo para usuarios autenticados.
@@ -45,29 +94,53 @@ def create_event(
 
 @router.get("/search", response_model=List[event_schemas.EventRead])
 def search_events(
+    request: Request,
     q: str = Query(..., min_length=3, description="Texto de búsqueda"),
+    limit: int = Query(20, ge=1, le=100, description="Máximo de resultados"),
     db: Session = Depends(get_db)
 ):
     """
-    Busca eventos públicos por nombre.
+    Busca eventos públicos por nombre, descripción, ubicación o categoría,
+    ordenados por relevancia. Se sirve desde la caché del catálogo.
     """
-    return event_service.search_events_by_name(db=db, query=q)
+    def build():
+        events = event_service.search_events_by_name(db=db, query=q, limit=limit)
+        return events, [event.id for event in events]
+
+    return catalog_cache.serve(
+        request,
+        catalog_cache.search_key(q, limit),
+        List[event_schemas.EventRead],
+        lambda: event_service.get_catalog_version(db),
+        build,
+    )
 
 @router.get("/{event_id}", response_model=event_schemas.EventReadWithSessions)
 def read_event(
-    event: Event = Depends(get_event_by_id)
+    event_id: int,
+    request: Request,
+    db: Session = Depends(get_db)
 ):
     """
     Obtiene los detalles de un evento específico, incluyendo sus sesiones.
-    """
-    return event
+    Responde 304 si el evento y sus sesiones no han cambiado.
+    """
+    version = event_service.get_event_version(db, event_id)
+    if version and conditional.is_not_modified(request, version):
+        return conditional.not_modified(version)
+    event = event_service.get_event_with_sessions(db=db, event_id=event_id)
+    if not event:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
+    response = json_response(event_schemas.EventReadWithSessions, event)
+    conditional.set_validators(response, version)
+    return response
 
 @router.patch("/{event_id}", response_model=event_schemas.EventRead)
 def update_event(
     event_update: event_schemas.EventUpdate,
     event: Event = Depends(get_event_by_id),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_principal)
 ):
     """
     Actualiza un evento.
@@ -80,7 +153,7 @@ def update_event(
 def delete_event(
     event: Event = Depends(get_event_by_id),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_principal)
 ):
     """
     Elimina (soft delete) un evento.
@@ -93,7 +166,7 @@ def delete_event(
 def publish_event(
     event: Event = Depends(get_event_by_id),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_principal)
 ):
     """
     Publica un evento.
@@ -113,7 +186,7 @@ def add_session_to_event(
     session_in: session_schemas.EventSessionCreate,
     event: Event = Depends(get_event_by_id),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_principal)
 ):
     """
     Añade una sesión a un evento existente.
@@ -124,4 +197,48 @@ def add_session_to_event(
     try:
         return session_service.add_session_to_event(db=db, session_data=session_in, event=event)
     except session_service.SessionConflictError as e:
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+@router.post("/{event_id}/sessions/bulk", response_model=List[session_schemas.EventSessionRead], status_code=status.HTTP_201_CREATED)
+def add_sessions_to_event(
+    batch_in: session_schemas.BatchSessionCreate,
+    event: Event = Depends(get_event_by_id),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_principal)
+):
+    """
+    Crea de una vez todas las sesiones de un evento (su programa).
+    Si alguna se solapa con otra del lote o con una existente, no se crea
+    ninguna y se devuelven todos los solapamientos.
+    """
+    if event.creator_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to add sessions to this event")
+
+    try:
+        return session_service.add_sessions_to_event(db=db, sessions_data=batch_in.sessions, event=event)
+    except session_service.ScheduleConflictsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": str(e), "conflicts": [conflict.model_dump() for conflict in e.conflicts]},
+        )
+    except session_service.SessionConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+@router.delete("/{event_id}/sessions/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_session(
+    session_id: int,
+    event: Event = Depends(get_event_by_id),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_principal)
+):
+    """
+    Elimina (soft delete) una sesión de un evento.
+    """
+    if event.creator_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to delete sessions of this event")
+
+    session = get_session_by_id(session_id=session_id, db=db)
+    if session.event_id != event.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
+
+    session_service.delete_session(db=db, session=session)
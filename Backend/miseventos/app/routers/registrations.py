@@ -1,12 +1,13 @@
 # app/routers/registrations.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
-from app.models import User, EventSession
+from app.models import Event, EventSession
 from app.schemas import attendance_schemas
 from app.services import registration_service
-from app.dependencies import get_db, get_current_active_user, get_session_by_id
+from app.services.principal_service import Principal
+from app.dependencies import get_db, get_current_active_principal, get_session_by_id
 
 router = APIRouter(
     prefix="/registrations",
@@ -16,17 +17,23 @@ router = APIRouter(
 @router.post("", response_model=attendance_schemas.AttendanceRead, status_code=status.HTTP_201_CREATED)
 def register_for_session(
     registration_in: attendance_schemas.AttendanceCreate,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_principal)
 ):
     """
     Registra al usuario autenticado en una sesión específica.
+    Responde 202 si la plaza se admitió desde el inventario en memoria y
+    el registro aún no se ha escrito en la base de datos.
     """
     # Obtenemos la sesión usando una dependencia o directamente
     session = get_session_by_id(session_id=registration_in.session_id, db=db)
     
     try:
-        return registration_service.register_user_for_session(db=db, user=current_user, session=session)
+        attendance = registration_service.register_user_for_session(db=db, user=current_user, session=session)
+        if attendance.id is None:
+            response.status_code = status.HTTP_202_ACCEPTED
+        return attendance
     except registration_service.RegistrationError as e:
         # Captura errores de negocio específicos del servicio
         raise HTTPException(
@@ -34,11 +41,33 @@ def register_for_session(
             detail=str(e)
         )
 
+@router.post("/batch", response_model=attendance_schemas.BatchRegistrationResponse)
+def register_batch(
+    batch_in: attendance_schemas.BatchRegistrationCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_principal)
+):
+    """
+    Registra a varios usuarios en varias sesiones de un mismo evento.
+    Solo para el organizador del evento o administradores.
+    Devuelve el resultado de cada par (usuario, sesión).
+    """
+    try:
+        sessions = registration_service.get_batch_sessions(db=db, session_ids=batch_in.session_ids)
+    except registration_service.RegistrationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    event = db.get(Event, sessions[0].event_id)
+    if event.creator_id != current_user.id and not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to register users for this event")
+
+    return registration_service.register_users_batch(db=db, user_ids=batch_in.user_ids, sessions=sessions)
+
 @router.delete("/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
 def cancel_registration_for_session(
     session_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_principal)
 ):
     """
     Cancela el registro del usuario autenticado para una sesión.
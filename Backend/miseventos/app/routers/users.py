@@ -1,13 +1,19 @@
 # app/routers/users.py
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
+from app.core.json_response import json_response
 from app.models.user import User
 from app.schemas import user_schemas, attendance_schemas
-from app.dependencies import get_db, get_current_active_user
+from app.dependencies import get_db, get_current_active_user, get_current_active_principal
 from app.services import registration_service
+from app.services.principal_service import Principal
+from app.utils.enums import AttendanceStatus
+
+# Tamaño de página de `/me/registrations` cuando se pide una página sin `limit`
+DEFAULT_REGISTRATIONS_PAGE_SIZE = 50
 
 router = APIRouter(
     prefix="/users",
@@ -25,28 +31,26 @@ def read_users_me(
 
 @router.get("/me/registrations", response_model=List[attendance_schemas.UserEventRegistration])
 def get_my_registrations(
-    current_user: User = Depends(get_current_active_user),
+    page: Optional[int] = Query(None, ge=1, description="Número de página"),
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Registros por página (por defecto 50 si se indica `page`)"),
+    upcoming: bool = Query(False, description="Sólo sesiones que aún no han empezado"),
+    registration_status: Optional[AttendanceStatus] = Query(None, alias="status", description="Filtrar por estado del registro"),
+    current_user: Principal = Depends(get_current_active_principal),
     db: Session = Depends(get_db)
 ):
     """
-    Obtiene una lista de todos los eventos/sesiones a los que el usuario
-    actual está registrado.
+    Obtiene los eventos/sesiones a los que el usuario actual está
+    registrado, del registro más reciente al más antiguo. Sin `page` ni
+    `limit` devuelve la lista completa.
     """
-    # El servicio obtiene los datos crudos de asistencia
-    attendances = registration_service.get_user_registrations(db=db, user=current_user)
-    
-    # Transformamos los datos al schema específico que el frontend necesita
-    registrations = []
-    for att in attendances:
-        registrations.append(
-            attendance_schemas.UserEventRegistration(
-                event_name=att.session.event.name,
-                event_category=att.session.event.category,
-                session_datetime=att.session.session_datetime,
-                session_location=att.session.specific_location,
-                registration_status=att.status,
-                event_id=att.session.event.id,
-                session_id=att.session.id
-            )
-        )
-    return registrations
+    if page is not None and limit is None:
+        limit = DEFAULT_REGISTRATIONS_PAGE_SIZE
+    registrations = registration_service.get_user_registrations(
+        db=db,
+        user_id=current_user.id,
+        page=page or 1,
+        limit=limit,
+        upcoming=upcoming,
+        status=registration_status,
+    )
+    return json_response(List[attendance_schemas.UserEventRegistration], registrations)
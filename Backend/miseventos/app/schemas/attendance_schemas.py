@@ -1,8 +1,8 @@
 # app/schemas/attendance_schemas.py
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from sqlmodel import SQLModel, Field
-from app.utils.enums import AttendanceStatus, EventCategory
+from app.utils.enums import AttendanceStatus, EventCategory, RegistrationOutcome
 from .user_schemas import UserRead
 from .event_schemas import EventRead
 from .session_schemas import EventSessionRead
@@ -15,11 +15,34 @@ class AttendanceCreate(SQLModel):
     session_id: int
 
 class AttendanceRead(AttendanceBase):
-    """Schema para leer un registro de asistencia."""
-    id: int
+    """
+    Schema para leer un registro de asistencia.
+    `id` es None mientras una reserva del inventario en memoria no se ha
+    escrito en la base de datos.
+    """
+    id: Optional[int] = None
     user_id: int
     session_id: int
     registration_date: datetime
+    waitlist_position: Optional[int] = None
+
+class BatchRegistrationCreate(SQLModel):
+    """Schema para registrar a varios usuarios en varias sesiones de un mismo evento."""
+    user_ids: List[int] = Field(min_length=1, max_length=500)
+    session_ids: List[int] = Field(min_length=1, max_length=50)
+
+class BatchRegistrationItem(SQLModel):
+    """Resultado de un par (usuario, sesión) dentro del lote."""
+    user_id: int
+    session_id: int
+    outcome: RegistrationOutcome
+    attendance_id: Optional[int] = None
+
+class BatchRegistrationResponse(SQLModel):
+    """Schema de respuesta del registro por lotes."""
+    results: List[BatchRegistrationItem]
+    registered: int
+    failed: int
 
 class AttendanceReadWithDetails(AttendanceRead):
     """Schema para ver una asistencia con detalles del usuario y la sesión."""
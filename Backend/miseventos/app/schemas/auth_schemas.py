@@ -10,6 +10,10 @@ class LoginRequest(SQLModel):
     email: str
     password: str
 
+class RefreshTokenRequest(SQLModel):
+    """Schema para renovar el token de acceso (o cerrar sesión) con el token de refresco."""
+    refresh_token: str
+
 class PasswordChange(SQLModel):
     """Schema para cuando un usuario logueado quiere cambiar su contraseña."""
     current_password: str
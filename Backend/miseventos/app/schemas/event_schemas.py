@@ -41,10 +41,32 @@ class EventReadWithSessions(EventRead):
     """Schema para leer un evento con sus sesiones."""
     sessions: List[EventSessionRead] = []
 
+class FacetCount(SQLModel):
+    """Número de eventos para un valor de una faceta."""
+    value: str
+    count: int
+
+class EventFacets(SQLModel):
+    """
+    Recuentos del listado filtrado por categoría y por mes de inicio (`YYYY-MM`).
+    Los de categoría no aplican el filtro de categoría, para poder mostrar
+    cuántos eventos hay en las demás.
+    """
+    categories: List[FacetCount]
+    months: List[FacetCount]
+
 class EventListResponse(SQLModel):
-    """Schema para respuesta paginada de eventos."""
+    """
+    Schema para respuesta paginada de eventos.
+    En modo cursor `current_page` no aplica, y `total`/`total_pages` sólo se
+    calculan si se piden. `total_is_estimate` indica un total estimado, y
+    `facets` sólo se incluye si se pide.
+    """
     events: List[EventRead]
-    current_page: int
-    total_pages: int
-    total: int
-    limit: int
\ No newline at end of file
+    current_page: Optional[int] = None
+    total_pages: Optional[int] = None
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+    limit: int
+    next_cursor: Optional[str] = None
+    facets: Optional[EventFacets] = None
\ No newline at end of file
@@ -1,6 +1,6 @@
 # app/schemas/session_schemas.py
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from sqlmodel import SQLModel, Field
 from app.utils.enums import SessionStatus
 
@@ -8,28 +8,49 @@ class EventSessionBase(SQLModel):
     """Schema base para una sesión."""
     presenter: str = Field(min_length=1, max_length=255)
     session_datetime: datetime
+    # Si no se indica, se usa la del evento o, en su defecto, 60 minutos
+    duration_minutes: Optional[int] = Field(default=None, ge=1)
     specific_location: str = Field(min_length=1, max_length=500)
     max_capacity: int = Field(ge=1)
     session_resources: Optional[str] = None
+    seat_inventory_enabled: bool = False
 
 class EventSessionCreate(EventSessionBase):
     """Schema usado para crear una nueva sesión."""
     pass
 
+class BatchSessionCreate(SQLModel):
+    """Schema para crear de una vez el programa (todas las sesiones) de un evento."""
+    sessions: List[EventSessionCreate] = Field(min_length=1, max_length=1000)
+
+class SessionScheduleConflict(SQLModel):
+    """
+    Solapamiento detectado en una creación por lotes. `index` es la posición
+    de la sesión en el lote; el otro lado del solapamiento es otra sesión del
+    lote (`conflicting_index`) o una ya existente (`conflicting_session_id`).
+    """
+    index: int
+    conflicting_index: Optional[int] = None
+    conflicting_session_id: Optional[int] = None
+
 class EventSessionUpdate(SQLModel):
     """Schema para actualizar una sesión. Todos los campos son opcionales."""
     presenter: Optional[str] = Field(default=None, min_length=1, max_length=255)
     session_datetime: Optional[datetime] = None
+    duration_minutes: Optional[int] = Field(default=None, ge=1)
     specific_location: Optional[str] = Field(default=None, min_length=1, max_length=500)
     max_capacity: Optional[int] = Field(default=None, ge=1)
     session_resources: Optional[str] = None
     status: Optional[SessionStatus] = None
+    seat_inventory_enabled: Optional[bool] = None
 
 class EventSessionRead(EventSessionBase):
     """Schema para leer los datos de una sesión."""
     id: int
     event_id: int
     status: SessionStatus
+    duration_minutes: int
+    session_end: datetime
     # Estos campos se poblarán automáticamente desde las @property del modelo
     # de EventSession gracias a `from_attributes=True` en los endpoints.
     attendee_count: int
@@ -6,6 +6,8 @@ class Token(SQLModel):
     """Schema de respuesta de token JWT."""
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None # Segundos de validez del token de acceso
 
 class TokenPayload(SQLModel):
     """Define la estructura del payload dentro del token JWT."""
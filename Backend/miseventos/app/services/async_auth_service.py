@@ -0,0 +1,87 @@
+# app/services/async_auth_service.py
+
+"""
+Variante asíncrona de `auth_service` para usar con `AsyncSession`.
+El hashing de contraseñas es intensivo en CPU, así que se ejecuta en el
+pool de procesos de hashing sin bloquear el event loop.
+"""
+
+from typing import Optional
+from datetime import datetime
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.security import hash_password_async, verify_and_update_password_async
+from app.models.user import User
+from app.schemas.user_schemas import UserCreate
+from app.schemas.token_schemas import Token
+from app.services import auth_service, last_login_buffer
+from app.services.auth_service import EmailAlreadyExistsError
+
+async def register_new_user(db: AsyncSession, user_data: UserCreate) -> User:
+    """
+    Orquesta el registro de un nuevo usuario (ver `auth_service.register_new_user`).
+    """
+    existing_user = (await db.execute(select(User).where(User.email == user_data.email))).scalars().first()
+    if existing_user:
+        raise EmailAlreadyExistsError("Un usuario con este email ya existe.")
+    await db.commit()
+
+    user_dict = user_data.model_dump(exclude={"password"})
+    new_user = User(**user_dict, password_hash=await hash_password_async(user_data.password))
+
+    db.add(new_user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise EmailAlreadyExistsError("Un usuario con este email ya existe.")
+    await db.refresh(new_user)
+
+    return new_user
+
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    """
+    Autentica a un usuario (ver `auth_service.authenticate_user`).
+    """
+    user = (await db.execute(select(User).where(User.email == email))).scalars().first()
+    if user is not None:
+        db.expunge(user)
+    await db.commit()
+
+    if not user or not user.is_active:
+        return None
+
+    valid, new_hash = await verify_and_update_password_async(password, user.password_hash)
+    if not valid:
+        return None
+
+    logged_in_at = datetime.utcnow()
+    values = {"last_login": logged_in_at}
+    if new_hash:
+        values["password_hash"] = new_hash
+    if new_hash or not settings.LAST_LOGIN_WRITE_BEHIND_ENABLED:
+        await db.execute(update(User).where(User.id == user.id).values(**values))
+        await db.commit()
+    else:
+        last_login_buffer.buffer.record(user.id, logged_in_at)
+    for key, value in values.items():
+        set_committed_value(user, key, value)
+
+    return user
+
+async def issue_tokens(db: AsyncSession, user: User) -> Token:
+    """Token de acceso más token de refresco nuevo (ver `auth_service.issue_tokens`)."""
+    return await db.run_sync(auth_service.issue_tokens, user)
+
+async def refresh_tokens(db: AsyncSession, refresh_token: str) -> Token:
+    """Renueva el token de acceso rotando el de refresco (ver `auth_service.refresh_tokens`)."""
+    return await db.run_sync(auth_service.refresh_tokens, refresh_token)
+
+async def logout(db: AsyncSession, claims: dict, refresh_token: Optional[str] = None) -> None:
+    """Revoca el token de acceso y, si se envía, el de refresco (ver `auth_service.logout`)."""
+    await db.run_sync(auth_service.logout, claims, refresh_token)
@@ -0,0 +1,79 @@
+# app/services/async_event_service.py
+
+"""
+Variante asíncrona de `event_service` para usar con `AsyncSession`.
+
+La lógica de negocio no se duplica: cada función ejecuta la versión síncrona
+mediante `AsyncSession.run_sync`, que corre sobre el mismo greenlet del
+driver asíncrono, por lo que la E/S nunca bloquea el event loop.
+"""
+
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.conditional import ResourceVersion
+
+from app.models.event import Event
+from app.models.user import User
+from app.schemas.event_schemas import EventCreate, EventUpdate, EventListResponse, EventFacets
+from app.services import event_service
+from app.services.event_service import EventFilters
+
+async def create_event(db: AsyncSession, event_data: EventCreate, creator: User) -> Event:
+    """Crea un nuevo evento."""
+    return await db.run_sync(event_service.create_event, event_data, creator)
+
+async def get_events_paginated(
+    db: AsyncSession,
+    page: int = 1,
+    limit: int = 10,
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    use_cursor: bool = False,
+    include_total: bool = True,
+    estimate_total: bool = False,
+    filters: Optional[EventFilters] = None,
+    include_facets: bool = False,
+) -> EventListResponse:
+    """Obtiene eventos con paginación (por página o por cursor), búsqueda y filtros opcionales."""
+    return await db.run_sync(
+        event_service.get_events_paginated,
+        page, limit, search, cursor, use_cursor, include_total, estimate_total, filters, include_facets,
+    )
+
+async def get_event_facets(
+    db: AsyncSession, search: Optional[str] = None, filters: Optional[EventFilters] = None
+) -> EventFacets:
+    """Recuentos por categoría y por mes del listado filtrado."""
+    return await db.run_sync(event_service.get_event_facets, search, filters)
+
+async def get_event_with_sessions(db: AsyncSession, event_id: int) -> Optional[Event]:
+    """
+    Obtiene un evento con sus sesiones y recuentos precargados, para poder
+    serializarlo fuera del greenlet sin cargas perezosas.
+    """
+    return await db.run_sync(event_service.get_event_with_sessions, event_id)
+
+async def get_catalog_version(db: AsyncSession) -> Optional[ResourceVersion]:
+    """Versión del catálogo público, para peticiones condicionales."""
+    return await db.run_sync(event_service.get_catalog_version)
+
+async def get_event_version(db: AsyncSession, event_id: int) -> Optional[ResourceVersion]:
+    """Versión del detalle de un evento, para peticiones condicionales."""
+    return await db.run_sync(event_service.get_event_version, event_id)
+
+async def update_event_details(db: AsyncSession, event: Event, event_update_data: EventUpdate) -> Event:
+    """Actualiza los detalles de un evento."""
+    return await db.run_sync(lambda session: event_service.update_event_details(session, event, event_update_data))
+
+async def delete_event(db: AsyncSession, event: Event) -> None:
+    """Elimina (soft delete) un evento."""
+    await db.run_sync(lambda session: event_service.delete_event(session, event))
+
+async def publish_event(db: AsyncSession, event: Event) -> Event:
+    """Publica un evento."""
+    return await db.run_sync(lambda session: event_service.publish_event(session, event))
+
+async def search_events_by_name(db: AsyncSession, query: str, limit: int = 20) -> List[Event]:
+    """Busca eventos publicados por texto, ordenados por relevancia."""
+    return await db.run_sync(event_service.search_events_by_name, query, limit)
@@ -0,0 +1,60 @@
+# app/services/async_registration_service.py
+
+"""
+Variante asíncrona de `registration_service` para usar con `AsyncSession`.
+Ver `async_event_service` para el enfoque con `run_sync`.
+"""
+
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.models.session import EventSession
+from app.models.attendance import Attendance
+from app.schemas.attendance_schemas import BatchRegistrationResponse, UserEventRegistration
+from app.services import registration_service
+from app.utils.enums import AttendanceStatus
+
+async def register_user_for_session(
+    db: AsyncSession, user: User, session: EventSession, join_waitlist: bool = True
+) -> Attendance:
+    """
+    Registra a un usuario en una sesión.
+
+    No pasa por el inventario en memoria: `seat_inventory` retiene sus
+    `threading.Lock` mientras consulta la base de datos y, dentro de
+    `run_sync`, esa E/S devuelve el control al bucle de eventos con el lock
+    tomado. Otra petición a la misma sesión se bloquearía entonces en el hilo
+    del bucle y el worker entero quedaría interbloqueado. Las sesiones con
+    inventario usan aquí la reserva atómica de la base de datos.
+    """
+    return await db.run_sync(
+        lambda sync_db: registration_service.register_user_for_session(
+            sync_db, user, session, join_waitlist, use_inventory=False
+        )
+    )
+
+async def cancel_registration(db: AsyncSession, user: User, session: EventSession) -> Attendance:
+    """Cancela la asistencia de un usuario a una sesión."""
+    return await db.run_sync(lambda sync_db: registration_service.cancel_registration(sync_db, user, session))
+
+async def get_batch_sessions(db: AsyncSession, session_ids: List[int]) -> List[EventSession]:
+    """Carga y valida las sesiones de un registro por lotes."""
+    return await db.run_sync(registration_service.get_batch_sessions, session_ids)
+
+async def register_users_batch(
+    db: AsyncSession, user_ids: List[int], sessions: List[EventSession]
+) -> BatchRegistrationResponse:
+    """Registra a varios usuarios en varias sesiones en una sola transacción."""
+    return await db.run_sync(registration_service.register_users_batch, user_ids, sessions)
+
+async def get_user_registrations(
+    db: AsyncSession,
+    user_id: int,
+    page: int = 1,
+    limit: Optional[int] = None,
+    upcoming: bool = False,
+    status: Optional[AttendanceStatus] = None,
+) -> List[UserEventRegistration]:
+    """Obtiene los registros de un usuario, proyectados al schema de respuesta."""
+    return await db.run_sync(registration_service.get_user_registrations, user_id, page, limit, upcoming, status)
@@ -0,0 +1,37 @@
+# app/services/async_session_service.py
+
+"""
+Variante asíncrona de `session_service` para usar con `AsyncSession`.
+Ver `async_event_service` para el enfoque con `run_sync`.
+"""
+
+from typing import List, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.event import Event
+from app.models.session import EventSession
+from app.schemas.session_schemas import EventSessionCreate, EventSessionUpdate
+from app.services import session_service
+
+async def add_session_to_event(db: AsyncSession, session_data: EventSessionCreate, event: Event) -> EventSession:
+    """Añade una nueva sesión a un evento."""
+    return await db.run_sync(session_service.add_session_to_event, session_data, event)
+
+async def add_sessions_to_event(
+    db: AsyncSession, sessions_data: Sequence[EventSessionCreate], event: Event
+) -> List[EventSession]:
+    """Crea de una vez todas las sesiones de un programa."""
+    return await db.run_sync(session_service.add_sessions_to_event, sessions_data, event)
+
+async def update_session_details(
+    db: AsyncSession, session: EventSession, session_update_data: EventSessionUpdate
+) -> EventSession:
+    """Actualiza una sesión, verificando conflictos."""
+    return await db.run_sync(
+        lambda sync_db: session_service.update_session_details(sync_db, session, session_update_data)
+    )
+
+async def delete_session(db: AsyncSession, session: EventSession) -> None:
+    """Elimina (soft delete) una sesión."""
+    await db.run_sync(lambda sync_db: session_service.delete_session(sync_db, session))
@@ -2,11 +2,17 @@
 
 from typing import Optional
 from datetime import datetime
+from sqlalchemy import case, or_, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models.user import User
 from app.schemas.user_schemas import UserCreate
-from app.core.security import password_context, create_jwt_token
+from app.schemas.token_schemas import Token
+from app.core.config import settings
+from app.core.security import create_jwt_token, verify_and_update_password
+from app.services import last_login_buffer, token_service
 
 class EmailAlreadyExistsError(Exception):
     """Excepción para cuando un email ya está registrado."""
@@ -18,7 +24,8 @@ def register_new_user(db: Session, user_data: UserCreate) -> User:
 
     1. Verifica que el email no esté ya en uso.
     2. Crea una instancia del modelo `User`.
-    3. USA EL MÉTODO DEL MODELO: Llama a `user.set_password(plain_password)`.
+    3. Hashea la contraseña en el pool de hashing, sin retener la conexión
+       de la base de datos mientras tanto.
     4. Guarda el nuevo usuario en la base de datos y hace commit.
     5. Retorna la instancia del usuario creado.
     """
@@ -26,6 +33,8 @@ def register_new_user(db: Session, user_data: UserCreate) -> User:
     existing_user = db.query(User).filter(User.email == user_data.email).first()
     if existing_user:
         raise EmailAlreadyExistsError("Un usuario con este email ya existe.")
+    # Cierra la transacción de lectura: la conexión vuelve al pool durante el hash
+    db.commit()
 
     # 2. Crear el objeto a partir del schema, excluyendo la contraseña plana
     user_dict = user_data.model_dump(exclude={"password"})
@@ -36,36 +45,98 @@ def register_new_user(db: Session, user_data: UserCreate) -> User:
 
     # 4. Persistir y confirmar
     db.add(new_user)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Otro registro con el mismo email se confirmó mientras se hasheaba
+        db.rollback()
+        raise EmailAlreadyExistsError("Un usuario con este email ya existe.")
     db.refresh(new_user)
 
     return new_user
 
+def _load_for_authentication(db: Session, email: str) -> Optional[User]:
+    """
+    Carga el usuario y libera la sesión antes de verificar la contraseña:
+    el objeto queda desasociado y la conexión vuelve al pool.
+    """
+    user = db.query(User).filter(User.email == email).first()
+    if user is not None:
+        db.expunge(user)
+    db.commit()
+    return user
+
+def _record_login(db: Session, user: User, new_hash: Optional[str]) -> None:
+    """
+    Registra el login. El último acceso va al buffer en memoria (no hay
+    escritura en la base de datos), salvo que haya que guardar un hash
+    rehecho con la configuración actual: entonces se escriben ambos.
+    """
+    logged_in_at = datetime.utcnow()
+    values = {"last_login": logged_in_at}
+    if new_hash:
+        values["password_hash"] = new_hash
+    if new_hash or not settings.LAST_LOGIN_WRITE_BEHIND_ENABLED:
+        db.execute(update(User).where(User.id == user.id).values(**values))
+        db.commit()
+    else:
+        last_login_buffer.buffer.record(user.id, logged_in_at)
+    for key, value in values.items():
+        set_committed_value(user, key, value)
+
+def flush_last_logins(db: Session, chunk_size: int = 1000) -> int:
+    """
+    Escribe en lote los últimos accesos acumulados en memoria, con una
+    sentencia UPDATE ... CASE por bloque. Nunca retrasa un `last_login` ya
+    guardado. Si falla, los accesos vuelven al buffer.
+    Devuelve el número de usuarios actualizados.
+    """
+    pending = last_login_buffer.buffer.drain()
+    if not pending:
+        return 0
+
+    try:
+        user_ids = list(pending)
+        for start in range(0, len(user_ids), chunk_size):
+            chunk = {user_id: pending[user_id] for user_id in user_ids[start:start + chunk_size]}
+            new_value = case(chunk, value=User.id)
+            db.execute(
+                update(User)
+                .where(User.id.in_(list(chunk)))
+                .where(or_(User.last_login == None, User.last_login < new_value))
+                .values(last_login=new_value)
+                .execution_options(synchronize_session=False)
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        last_login_buffer.buffer.requeue(pending)
+        raise
+
+    return len(pending)
+
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     """
     Autentica a un usuario.
 
-    1. Busca un usuario por su email.
+    1. Busca un usuario por su email y libera la conexión.
     2. Si el usuario existe y está activo...
-    3. USA EL MÉTODO DEL MODELO: Llama a `user.check_password(password)`.
-    4. Si la contraseña es correcta, actualiza `user.last_login` y hace commit.
+    3. Verifica la contraseña en el pool de hashing.
+    4. Si la contraseña es correcta, registra `user.last_login` en el buffer
+       de escritura diferida (y guarda el hash si el coste de bcrypt cambió).
     5. Retorna el objeto `User` si la autenticación es exitosa, si no, `None`.
     """
-    # Usar SQLAlchemy ORM
-    user = db.query(User).filter(User.email == email).first()
+    user = _load_for_authentication(db, email)
 
     if not user or not user.is_active:
         return None
 
-    # Usar el método del modelo para la lógica de verificación de contraseña
-    if not user.check_password(password):
+    valid, new_hash = verify_and_update_password(password, user.password_hash)
+    if not valid:
         return None
     
     # Actualizar último login como parte del proceso de autenticación exitoso
-    user.last_login = datetime.utcnow()
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    _record_login(db, user, new_hash)
 
     return user
 
@@ -74,4 +145,33 @@ def create_access_token(user: User) -> str:
     Genera un token JWT para un usuario.
     Esta función utiliza una utilidad de seguridad.
     """
-    return create_jwt_token(subject=user.email)
\ No newline at end of file
+    return create_jwt_token(subject=user.email)
+
+def issue_tokens(db: Session, user: User) -> Token:
+    """Token de acceso de vida corta más un token de refresco nuevo (login)."""
+    return Token(
+        access_token=create_access_token(user),
+        refresh_token=token_service.issue_refresh_token(db, user),
+        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    )
+
+def refresh_tokens(db: Session, refresh_token: str) -> Token:
+    """
+    Renueva el token de acceso sin verificar la contraseña, rotando el token
+    de refresco. Lanza `token_service.InvalidRefreshTokenError`.
+    """
+    user, new_refresh_token = token_service.rotate_refresh_token(db, refresh_token)
+    return Token(
+        access_token=create_access_token(user),
+        refresh_token=new_refresh_token,
+        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    )
+
+def logout(db: Session, claims: dict, refresh_token: Optional[str] = None) -> None:
+    """
+    Cierra la sesión: revoca el token de acceso presentado y, si se envía,
+    la familia del token de refresco del dispositivo.
+    """
+    token_service.revoke_access_token(db, claims)
+    if refresh_token:
+        token_service.revoke_refresh_token(db, refresh_token)
@@ -0,0 +1,185 @@
+# app/services/catalog_cache.py
+
+"""
+Caché de respuestas del catálogo público (GET /events y GET /events/search).
+
+Las respuestas son anónimas e iguales para todos, así que se guardan ya
+serializadas (bytes JSON), con su versión para peticiones condicionales, por
+parámetros normalizados. Cada entrada se etiqueta con los ids de los eventos
+que contiene.
+
+Las escrituras de `event_service` y `session_service` invalidan sólo las
+entradas afectadas (ver `invalidate_event`), marcándolas como rancias: la
+primera petición posterior las recalcula y las demás reciben la respuesta
+anterior mientras tanto. La caché es por proceso; el TTL acota el desfase
+cuando la escritura ocurre en otro worker.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.core import conditional
+from app.core.json_response import render_json
+from app.core.cache import StaleWhileRevalidateCache
+from app.core.conditional import ResourceVersion
+from app.core.config import settings
+
+# Tipos de entrada; la clave es (tipo, búsqueda normalizada, ...). Las de
+# listado siguen con (filtros, facetas, ...)
+LIST = "list"
+SEARCH = "search"
+
+# Campos de `Event` que deciden la posición en el listado (ordenado por start_date)
+_ORDER_FIELDS = {"start_date"}
+# Campos indexados por la búsqueda de texto
+_TEXT_FIELDS = {"name", "description", "general_location", "category"}
+# Campos usados por los filtros y las facetas del listado (además de start_date)
+_FILTER_FIELDS = {"category", "general_location"}
+
+cache = StaleWhileRevalidateCache(
+    maxsize=settings.CATALOG_CACHE_SIZE,
+    ttl=settings.CATALOG_CACHE_TTL_SECONDS,
+    stale_ttl=settings.CATALOG_CACHE_STALE_SECONDS,
+)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    version: Optional[ResourceVersion]
+
+
+def normalize_query(query: Optional[str]) -> Optional[str]:
+    if not query:
+        return None
+    return " ".join(query.lower().split()) or None
+
+
+def list_key(
+    page: int, limit: int, search: Optional[str], cursor: Optional[str],
+    use_cursor: bool, include_total: bool, estimate_total: bool,
+    filters: Optional[Hashable] = None, include_facets: bool = False,
+) -> Tuple:
+    """`filters` son los filtros ya normalizados (`event_service.EventFilters`), o None sin filtros."""
+    return (
+        LIST, normalize_query(search), filters, include_facets,
+        page if not use_cursor else None, limit, cursor, use_cursor, include_total, estimate_total,
+    )
+
+
+def _is_filtered_list(key: Tuple) -> bool:
+    return key[0] == LIST and (key[2] is not None or key[3])
+
+
+def search_key(query: str, limit: int) -> Tuple:
+    return (SEARCH, normalize_query(query), limit)
+
+
+# --- Invalidación ---
+
+def invalidate_event(
+    event_id: int, changed_fields: Iterable[str] = (), was_listed: bool = True, is_listed: bool = True
+) -> None:
+    """
+    Invalida las entradas a las que afecta un cambio del evento `event_id`.
+    `was_listed`/`is_listed` indican si el evento aparecía en el catálogo
+    (publicado y sin eliminar) antes y después del cambio.
+
+    - Un evento que entra en el catálogo, o cambia de estado (el filtro de
+      estado decide en qué listados aparece), puede aparecer en cualquier
+      listado o búsqueda.
+    - Uno que sale desplaza las páginas de todos los listados; de las
+      búsquedas sólo cambian las que lo contenían.
+    - Si sigue en el catálogo: un cambio de fecha reordena los listados, uno
+      de texto puede cambiar el resultado de cualquier búsqueda, uno de
+      categoría o ubicación el de cualquier listado filtrado o con facetas, y
+      el resto sólo afecta a las entradas que lo contienen.
+    """
+    fields = set(changed_fields)
+    if not was_listed and not is_listed:
+        return
+    if not was_listed or "status" in fields:
+        cache.invalidate_where(lambda key: True)
+        return
+    if not is_listed or fields & _ORDER_FIELDS:
+        cache.invalidate_where(lambda key: key[0] == LIST)
+    if is_listed and fields & _TEXT_FIELDS:
+        cache.invalidate_where(lambda key: key[1] is not None)
+    if is_listed and fields & _FILTER_FIELDS:
+        cache.invalidate_where(_is_filtered_list)
+    cache.invalidate_tags([event_id])
+
+
+# --- Respuestas ---
+
+Builder = Callable[[], Tuple[object, Iterable[int]]]
+
+
+def _respond(request: Request, cached: CachedResponse) -> Response:
+    if cached.version and conditional.is_not_modified(request, cached.version):
+        return conditional.not_modified(cached.version)
+    response = Response(content=cached.body, media_type="application/json")
+    conditional.set_validators(response, cached.version)
+    return response
+
+
+def serve(
+    request: Request,
+    key: Hashable,
+    schema: Any,
+    get_version: Callable[[], Optional[ResourceVersion]],
+    build: Builder,
+) -> Response:
+    """
+    Sirve `key` desde la caché o la calcula. `build` devuelve el contenido
+    de la respuesta, que se serializa como `schema`, y los ids de los
+    eventos que contiene.
+    """
+    cached, refresh = cache.lookup(key) if settings.CATALOG_CACHE_ENABLED else (None, True)
+    if not refresh:
+        return _respond(request, cached)
+
+    generation = cache.generation
+    try:
+        version = get_version()
+        if version and conditional.is_not_modified(request, version):
+            cache.abandon(key)
+            return conditional.not_modified(version)
+        payload, event_ids = build()
+    except BaseException:
+        cache.abandon(key)
+        raise
+    cached = CachedResponse(body=render_json(schema, payload), version=version)
+    if settings.CATALOG_CACHE_ENABLED:
+        cache.store(key, cached, tags=event_ids, generation=generation)
+    return _respond(request, cached)
+
+
+async def serve_async(
+    request: Request,
+    key: Hashable,
+    schema: Any,
+    get_version: Callable[[], Awaitable[Optional[ResourceVersion]]],
+    build: Callable[[], Awaitable[Tuple[object, Iterable[int]]]],
+) -> Response:
+    """Igual que `serve`, con funciones asíncronas."""
+    cached, refresh = cache.lookup(key) if settings.CATALOG_CACHE_ENABLED else (None, True)
+    if not refresh:
+        return _respond(request, cached)
+
+    generation = cache.generation
+    try:
+        version = await get_version()
+        if version and conditional.is_not_modified(request, version):
+            cache.abandon(key)
+            return conditional.not_modified(version)
+        payload, event_ids = await build()
+    except BaseException:
+        cache.abandon(key)
+        raise
+    cached = CachedResponse(body=render_json(schema, payload), version=version)
+    if settings.CATALOG_CACHE_ENABLED:
+        cache.store(key, cached, tags=event_ids, generation=generation)
+    return _respond(request, cached)
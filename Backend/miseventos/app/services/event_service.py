@@ -1,14 +1,25 @@
 # app/services/event_service.py
+import base64
+import json
 import math
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from collections import Counter
+from dataclasses import dataclass, replace
+from itertools import chain
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session, Session as OrmSession, selectinload
+from sqlalchemy import and_, case, event as sa_event, func, tuple_
 from sqlmodel import select
 
+from app.core.cache import TTLCache
+from app.core.conditional import ResourceVersion
+from app.core.config import settings
 from app.models.event import Event
+from app.models.session import EventSession
 from app.models.user import User
-from app.schemas.event_schemas import EventCreate, EventUpdate, EventListResponse
-from app.utils.enums import EventStatus
+from app.schemas.event_schemas import EventCreate, EventUpdate, EventListResponse, EventFacets, FacetCount
+from app.services import catalog_cache, search_service, session_service
+from app.utils.enums import EventCategory, EventStatus
 
 class EventCreationError(Exception):
     pass
@@ -16,6 +27,62 @@ class EventCreationError(Exception):
 class EventUpdateError(Exception):
     pass
 
+class InvalidCursorError(Exception):
+    pass
+
+class InvalidFilterError(Exception):
+    pass
+
+# Estados visibles en el catálogo público; por defecto sólo se listan los publicados
+# (son también los que indexa la búsqueda de texto)
+PUBLIC_STATUSES = search_service.INDEXED_STATUSES
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+@dataclass(frozen=True)
+class EventFilters:
+    """
+    Filtros del listado público. Es inmutable y comparable, así que sirve
+    de clave para las cachés de totales y de respuestas.
+
+    - `date_from`/`date_to`: intervalo (inclusivo) de `start_date`. Las fechas
+      con zona horaria se convierten a UTC sin zona, como se guardan.
+    - `location`: texto contenido en `general_location`, sin distinguir mayúsculas.
+    """
+    category: Optional[EventCategory] = None
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    location: Optional[str] = None
+    status: EventStatus = EventStatus.PUBLISHED
+
+    def normalized(self) -> "EventFilters":
+        """Valida los filtros y normaliza las fechas y la ubicación."""
+        if self.status not in PUBLIC_STATUSES:
+            raise InvalidFilterError(f"Estado no disponible en el catálogo: {self.status.value}.")
+        date_from, date_to = _naive_utc(self.date_from), _naive_utc(self.date_to)
+        if date_from and date_to and date_from > date_to:
+            raise InvalidFilterError("`date_from` no puede ser posterior a `date_to`.")
+        location = " ".join(self.location.lower().split()) if self.location else None
+        return replace(self, date_from=date_from, date_to=date_to, location=location or None)
+
+    @property
+    def active(self) -> bool:
+        """Si restringe algo más que el listado predeterminado (eventos publicados)."""
+        return self != EventFilters()
+
+# Totales del listado por filtro normalizado. Se vacía tras cada escritura de
+# eventos en este proceso; el TTL acota el desfase con otros workers.
+count_cache = TTLCache(
+    maxsize=settings.EVENT_COUNT_CACHE_SIZE, ttl=settings.EVENT_COUNT_CACHE_TTL_SECONDS
+)
+
+def _is_listed(event: Event) -> bool:
+    """Si el evento aparece en el catálogo público (con algún filtro de estado)."""
+    return event.status in PUBLIC_STATUSES and event.deleted_at is None
+
 def create_event(db: Session, event_data: EventCreate, creator: User) -> Event:
     """Crea un nuevo evento."""
     new_event = Event.model_validate(event_data, update={"creator_id": creator.id})
@@ -23,44 +90,195 @@ def create_event(db: Session, event_data: EventCreate, creator: User) -> Event:
     db.add(new_event)
     db.commit()
     db.refresh(new_event)
+    # Nace en borrador: sólo afecta al catálogo si ya se crea publicado
+    catalog_cache.invalidate_event(new_event.id, was_listed=False, is_listed=_is_listed(new_event))
     
     return new_event
 
-from typing import Optional
-from sqlmodel import Session, select
-from sqlalchemy import func
-import math
+def _encode_cursor(event: Event) -> str:
+    """Cursor opaco con la clave de orden (start_date, id) del último evento de la página."""
+    payload = json.dumps({"s": event.start_date.isoformat(), "i": event.id})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["s"]), int(payload["i"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("Cursor de paginación inválido.") from e
+
+def invalidate_event_counts() -> None:
+    """Vacía la caché de totales; cualquier escritura de eventos puede cambiar cualquier filtro."""
+    count_cache.clear()
+
+# La caché se invalida al confirmar cualquier transacción que haya escrito
+# eventos (crear, publicar, actualizar o eliminar), no al hacer flush: así
+# ninguna lectura concurrente vuelve a cachear el total anterior al commit.
+# Se escucha en la clase base de SQLAlchemy (`OrmSession`) para cubrir
+# también las sesiones de SQLModel.
+@sa_event.listens_for(OrmSession, "after_flush")
+def _track_event_writes(session, flush_context):
+    if any(isinstance(obj, Event) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info["events_written"] = True
+
+@sa_event.listens_for(OrmSession, "after_commit")
+def _invalidate_after_commit(session):
+    if session.info.pop("events_written", False):
+        invalidate_event_counts()
+
+@sa_event.listens_for(OrmSession, "after_soft_rollback")
+def _discard_after_rollback(session, previous_transaction):
+    session.info.pop("events_written", None)
+
+def _count_cache_key(search: Optional[str], filters: EventFilters, estimate: bool) -> Tuple:
+    """
+    Clave normalizada del filtro. La búsqueda sólo se normaliza en espacios y
+    mayúsculas, como en `catalog_cache`: la sintaxis de búsqueda web (`-x`,
+    `"frase"`, `OR`) cambia el resultado y debe distinguir la entrada.
+    """
+    return (catalog_cache.normalize_query(search), filters, estimate)
+
+def _estimate_rows(db: Session, query) -> Optional[int]:
+    """
+    Filas estimadas por el planificador de PostgreSQL para `query`, mediante
+    la función `count_estimate` (ver migración). None en otros motores.
+    """
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+    sql = str(query.with_only_columns(Event.id).compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True}))
+    return db.execute(select(func.count_estimate(sql))).scalar()
+
+def _count_events(db: Session, query, search: Optional[str], filters: EventFilters, estimate: bool) -> Tuple[int, bool]:
+    """
+    Total de eventos de `query`, cacheado por filtro normalizado. En modo
+    estimado se usa la estimación del planificador si es suficientemente
+    grande; si es pequeña, contar exacto es barato y se hace.
+    """
+    def compute() -> Tuple[int, bool]:
+        if estimate:
+            estimated = _estimate_rows(db, query)
+            if estimated is not None and estimated >= settings.EVENT_COUNT_ESTIMATE_MIN_ROWS:
+                return estimated, True
+        count_query = select(func.count()).select_from(query.subquery())
+        return db.execute(count_query).scalar() or 0, False
+
+    return count_cache.get_or_set(_count_cache_key(search, filters, estimate), compute)
 
-# Assuming these are your models/schemas
-# from app.models import Event, EventStatus
-# from app.schemas import EventListResponse
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _filter_clauses(db: Session, search: Optional[str], filters: EventFilters, with_category: bool = True) -> list:
+    """
+    Condiciones del listado. Estado, borrado lógico y `start_date` van en
+    este orden en `ix_events_status_deleted_start_date`; la categoría usa
+    `ix_events_status_category_start_date`, y la ubicación, en PostgreSQL, un
+    índice de trigramas (ver migración).
+    """
+    clauses = [Event.status == filters.status, Event.deleted_at == None]
+    if filters.date_from:
+        clauses.append(Event.start_date >= filters.date_from)
+    if filters.date_to:
+        clauses.append(Event.start_date <= filters.date_to)
+    if with_category and filters.category:
+        clauses.append(Event.category == filters.category)
+    if filters.location:
+        clauses.append(Event.general_location.ilike(f"%{_escape_like(filters.location)}%", escape="\\"))
+    if search:
+        clauses.append(search_service.search_filter(db, search))
+    return clauses
+
+def _start_month(db: Session):
+    """Mes de inicio (`YYYY-MM`) como expresión SQL del motor en uso."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return func.to_char(Event.start_date, "YYYY-MM")
+    if dialect == "sqlite":
+        return func.strftime("%Y-%m", Event.start_date)
+    return func.date_format(Event.start_date, "%Y-%m")
+
+def get_event_facets(db: Session, search: Optional[str] = None, filters: Optional[EventFilters] = None) -> EventFacets:
+    """
+    Recuentos por categoría y por mes del listado filtrado, con una sola
+    consulta agrupada por (categoría, mes) sin el filtro de categoría: los
+    de categoría suman todos los meses, y los de mes sólo las filas de la
+    categoría filtrada (o todas si no hay).
+    """
+    filters = (filters or EventFilters()).normalized()
+    month = _start_month(db)
+    rows = db.execute(
+        select(Event.category, month, func.count())
+        .where(*_filter_clauses(db, search, filters, with_category=False))
+        .group_by(Event.category, month)
+    ).all()
+
+    categories, months = Counter(), Counter()
+    for category, start_month, count in rows:
+        categories[category] += count
+        if filters.category is None or category == filters.category:
+            months[start_month] += count
+    return EventFacets(
+        categories=[FacetCount(value=c.value, count=categories[c]) for c in EventCategory if categories[c]],
+        months=[FacetCount(value=m, count=months[m]) for m in sorted(months)],
+    )
 
 def get_events_paginated(
     db: Session, 
     page: int = 1, 
     limit: int = 10, 
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    use_cursor: bool = False,
+    include_total: bool = True,
+    estimate_total: bool = False,
+    filters: Optional[EventFilters] = None,
+    include_facets: bool = False,
 ) -> EventListResponse:
     """
-    Obtiene eventos con paginación y búsqueda opcional de forma eficiente.
+    Obtiene eventos con paginación, búsqueda y filtros opcionales de forma eficiente.
+
+    Los eventos se ordenan por (start_date, id). Con `use_cursor` (o si se pasa
+    `cursor`) la paginación es por keyset: cada página arranca donde terminó la
+    anterior usando el índice `ix_events_published_start_date_id`, así que la
+    página N cuesta lo mismo que la primera. El total es opcional
+    (`include_total`), porque exige recorrer todas las filas filtradas; se
+    cachea por filtro y, con `estimate_total`, puede ser una estimación. Con
+    `include_facets` se añaden los recuentos de `get_event_facets`.
     """
-    
+    use_cursor = use_cursor or cursor is not None
+    filters = (filters or EventFilters()).normalized()
+
     # 1. Build the base query with all filters ONCE.
-    query = select(Event).where(
-        Event.status == EventStatus.PUBLISHED,
-        Event.deleted_at == None
-    )
-    if search:
-        query = query.where(Event.name.ilike(f"%{search}%"))
+    query = select(Event).where(*_filter_clauses(db, search, filters))
 
-    # 2. Get the total count from the filtered query.
-    count_query = select(func.count()).select_from(query.subquery())
-    
-    # --- THIS IS THE FIX ---
-    # Use .first() to prevent errors when the result is empty.
-    total_count = db.execute(count_query).first() or 0
+    # 2. Get the total count from the filtered query (opcional y cacheado).
+    total, total_is_estimate = None, False
+    if include_total:
+        total, total_is_estimate = _count_events(db, query, search, filters, estimate_total)
+    facets = get_event_facets(db, search, filters) if include_facets else None
+
+    query = query.order_by(Event.start_date, Event.id)
 
-    # 3. Get the paginated results (the actual event objects).
+    if use_cursor:
+        # 3a. Keyset: sin OFFSET; se pide un elemento extra para saber si hay más.
+        if cursor:
+            start_date, last_id = _decode_cursor(cursor)
+            query = query.where(tuple_(Event.start_date, Event.id) > tuple_(start_date, last_id))
+        rows = db.execute(query.limit(limit + 1)).scalars().all()
+        events = rows[:limit]
+        next_cursor = _encode_cursor(events[-1]) if len(rows) > limit else None
+        return EventListResponse(
+            events=events,
+            total=total,
+            total_pages=math.ceil(total / limit) if total is not None else None,
+            total_is_estimate=total_is_estimate,
+            limit=limit,
+            next_cursor=next_cursor,
+            facets=facets,
+        )
+
+    # 3b. Get the paginated results (the actual event objects).
     offset = (page - 1) * limit
     events = db.execute(query.offset(offset).limit(limit)).scalars().all()
 
@@ -68,14 +286,82 @@ def get_events_paginated(
     return EventListResponse(
         events=events,
         current_page=page,
-        total_pages=math.ceil(total_count[0] / limit),
-        total=total_count[0],
-        limit=limit
+        total_pages=math.ceil(total / limit) if total is not None else None,
+        total=total,
+        total_is_estimate=total_is_estimate,
+        limit=limit,
+        facets=facets,
     )
 
+def get_event_with_sessions(db: Session, event_id: int) -> Optional[Event]:
+    """
+    Obtiene un evento con sus sesiones precargadas y sus asistentes
+    confirmados ya contados: el detalle no carga ninguna asistencia, así que
+    su coste no depende del número de inscritos.
+    """
+    event = db.execute(
+        select(Event)
+        .where(Event.id == event_id, Event.deleted_at == None)
+        .options(selectinload(Event.sessions))
+        .execution_options(populate_existing=True)
+    ).scalars().first()
+    if event is not None:
+        session_service.load_attendee_counts(db, event.sessions)
+    return event
+
+def get_catalog_version(db: Session) -> Optional[ResourceVersion]:
+    """
+    Versión del catálogo público (listado y búsqueda), de mejor esfuerzo. El
+    ETag combina el `updated_at` más reciente de todos los eventos (con o sin
+    publicar o eliminar) con su número y la suma de sus ids, y lo mismo sólo
+    para los eventos visibles: así avanza con cualquier alta, publicación o
+    borrado lógico aunque `updated_at` no supere al máximo (relojes desfasados
+    entre workers o dos escrituras en el mismo instante). Un cambio de datos
+    de un evento ya listado que no haga avanzar el máximo no se detecta; lo
+    acotan el TTL de la caché y la revalidación de los clientes (`no-cache`).
+    """
+    listed = and_(Event.status.in_(PUBLIC_STATUSES), Event.deleted_at == None)
+    row = db.execute(
+        select(
+            func.max(Event.updated_at),
+            func.count(Event.id),
+            func.sum(Event.id),
+            func.sum(case((listed, 1), else_=0)),
+            func.sum(case((listed, Event.id), else_=0)),
+        )
+    ).one()
+    last_modified = row[0]
+    return ResourceVersion.from_parts(last_modified, *row[1:]) if last_modified else None
+
+def get_event_version(db: Session, event_id: int) -> Optional[ResourceVersion]:
+    """
+    Versión del detalle de un evento, a partir del `updated_at` del evento y
+    de sus sesiones, sin cargar los modelos. Devuelve None si el evento no
+    existe o si alguna sesión usa el inventario en memoria: sus asistentes
+    confirmados cambian sin tocar la sesión, así que no hay validador barato.
+    """
+    row = db.execute(
+        select(
+            Event.updated_at,
+            func.max(EventSession.updated_at),
+            func.count(EventSession.id),
+            func.max(case((EventSession.seat_inventory_enabled == True, 1), else_=0)),
+        )
+        .select_from(Event)
+        .outerjoin(EventSession, EventSession.event_id == Event.id)
+        .where(Event.id == event_id, Event.deleted_at == None)
+        .group_by(Event.id, Event.updated_at)
+    ).first()
+    if row is None or row[3]:
+        return None
+    event_updated_at, sessions_updated_at, session_count, _ = row
+    last_modified = max(event_updated_at, sessions_updated_at or event_updated_at)
+    return ResourceVersion.from_parts(last_modified, event_id, session_count)
+
 def update_event_details(db: Session, event: Event, event_update_data: EventUpdate) -> Event:
     """Actualiza los detalles de un evento."""
     update_data = event_update_data.model_dump(exclude_unset=True)
+    was_listed = _is_listed(event)
     
     for key, value in update_data.items():
         setattr(event, key, value)
@@ -83,15 +369,18 @@ def update_event_details(db: Session, event: Event, event_update_data: EventUpda
     db.add(event)
     db.commit()
     db.refresh(event)
+    catalog_cache.invalidate_event(event.id, update_data.keys(), was_listed, _is_listed(event))
     
     return event
 
 def delete_event(db: Session, event: Event) -> None:
     """Elimina (soft delete) un evento."""
     from datetime import datetime
+    was_listed = _is_listed(event)
     event.deleted_at = datetime.utcnow()
     db.add(event)
     db.commit()
+    catalog_cache.invalidate_event(event.id, ["deleted_at"], was_listed, is_listed=False)
 
 def publish_event(db: Session, event: Event) -> Event:
     """Publica un evento."""
@@ -103,14 +392,10 @@ def publish_event(db: Session, event: Event) -> Event:
     db.add(event)
     db.commit()
     db.refresh(event)
+    catalog_cache.invalidate_event(event.id, ["status"], was_listed=False, is_listed=_is_listed(event))
     
     return event
 
-def search_events_by_name(db: Session, query: str) -> List[Event]:
-    """Busca eventos publicados por nombre."""
-    return db.executeute(
-        select(Event)
-        .where(Event.name.ilike(f"%{query}%"))
-        .where(Event.status == EventStatus.PUBLISHED)
-        .where(Event.deleted_at == None)
-    ).all()
\ No newline at end of file
+def search_events_by_name(db: Session, query: str, limit: int = 20) -> List[Event]:
+    """Busca eventos publicados por texto (nombre, descripción, ubicación y categoría), por relevancia."""
+    return search_service.search_events(db, query, limit=limit)
@@ -0,0 +1,49 @@
+# app/services/last_login_buffer.py
+
+"""
+Buffer en memoria de los últimos accesos de los usuarios.
+
+El login no escribe `User.last_login` en la base de datos: registra la marca
+de tiempo aquí y `auth_service.flush_last_logins` la escribe periódicamente
+en una única sentencia UPDATE. Por usuario sólo se conserva el acceso más
+reciente.
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict
+
+
+class LastLoginBuffer:
+    """Últimos accesos pendientes de escribir, por id de usuario. Seguro entre hilos."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[int, datetime] = {}
+
+    def record(self, user_id: int, logged_in_at: datetime) -> None:
+        with self._lock:
+            self._merge(user_id, logged_in_at)
+
+    def drain(self) -> Dict[int, datetime]:
+        """Devuelve y vacía los accesos pendientes."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            return pending
+
+    def requeue(self, pending: Dict[int, datetime]) -> None:
+        """Devuelve al buffer accesos que no se pudieron escribir."""
+        with self._lock:
+            for user_id, logged_in_at in pending.items():
+                self._merge(user_id, logged_in_at)
+
+    def _merge(self, user_id: int, logged_in_at: datetime) -> None:
+        current = self._pending.get(user_id)
+        if current is None or logged_in_at > current:
+            self._pending[user_id] = logged_in_at
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+
+buffer = LastLoginBuffer()
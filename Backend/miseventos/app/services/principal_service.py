@@ -0,0 +1,121 @@
+# app/services/principal_service.py
+
+"""
+Caché del usuario autenticado ("principal").
+
+Las dependencias de autenticación sólo necesitan saber quién llama y con qué
+rol, así que en lugar de consultar `users` en cada petición se guarda una
+instantánea inmutable del usuario, indexada por el `sub` del token (email).
+La entrada se invalida cuando cambian el email, el rol o `is_active` del
+usuario, o cuando se elimina.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event as sa_event, inspect
+from sqlalchemy.orm import Session
+from sqlmodel import select
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User
+from app.utils.enums import UserRole
+
+# Atributos de `User` que forman parte de la instantánea
+_PRINCIPAL_ATTRIBUTES = ("email", "role", "is_active")
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Instantánea ligera e inmutable del usuario autenticado."""
+    id: int
+    email: str
+    role: UserRole
+    is_active: bool
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == UserRole.ADMIN
+
+    @property
+    def is_organizer(self) -> bool:
+        return self.role == UserRole.ORGANIZER
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, email=user.email, role=user.role, is_active=user.is_active)
+
+
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+def get_cached_principal(email: str) -> Optional[Principal]:
+    return principal_cache.get(email)
+
+
+def cache_principal(user: User) -> Principal:
+    principal = Principal.from_user(user)
+    principal_cache.set(user.email, principal)
+    return principal
+
+
+def get_principal(db: Session, email: str) -> Optional[Principal]:
+    """Resuelve el principal de un `sub`; sólo consulta la base de datos si no está en caché."""
+    principal = get_cached_principal(email)
+    if principal is None:
+        user = db.execute(select(User).where(User.email == email)).scalars().first()
+        if user is None:
+            return None
+        principal = cache_principal(user)
+    return principal
+
+
+def invalidate_principal(email: str) -> None:
+    principal_cache.invalidate(email)
+
+
+# --- Invalidación ---
+# Se invalida al hacer flush (para no servir permisos revocados ni un instante
+# más de lo necesario) y otra vez tras el commit, por si otra petición volvió
+# a cachear el estado anterior entre medias.
+
+def _changed_principal_keys(user: User) -> set:
+    state = inspect(user)
+    keys = set()
+    for attribute in _PRINCIPAL_ATTRIBUTES:
+        history = state.attrs[attribute].history
+        if history.has_changes():
+            keys.add(user.email)
+            # Si cambió el email, el token antiguo no debe seguir resolviendo
+            if attribute == "email":
+                keys.update(history.deleted)
+    return keys
+
+
+@sa_event.listens_for(Session, "before_flush")
+def _collect_principal_changes(session, flush_context, instances):
+    keys = set()
+    for obj in session.dirty:
+        if isinstance(obj, User):
+            keys |= _changed_principal_keys(obj)
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            keys.add(obj.email)
+    if keys:
+        for key in keys:
+            invalidate_principal(key)
+        session.info.setdefault("principal_keys", set()).update(keys)
+
+
+@sa_event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    for key in session.info.pop("principal_keys", ()):
+        invalidate_principal(key)
+
+
+@sa_event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session, previous_transaction):
+    session.info.pop("principal_keys", None)
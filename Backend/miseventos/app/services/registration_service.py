@@ -1,12 +1,19 @@
 # app/services/registration_service.py
 
-from typing import List
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import case, insert, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from sqlmodel import select
 
 from app.models.user import User
+from app.models.event import Event
 from app.models.session import EventSession
 from app.models.attendance import Attendance
+from app.services import seat_inventory
+from app.schemas.attendance_schemas import BatchRegistrationItem, BatchRegistrationResponse, UserEventRegistration
+from app.utils.enums import AttendanceStatus, RegistrationOutcome
 
 class RegistrationError(Exception):
     """Excepción genérica para errores de registro."""
@@ -20,53 +27,516 @@ class SessionFullError(RegistrationError):
     """La sesión está llena."""
     pass
 
-def register_user_for_session(db: Session, user: User, session: EventSession) -> Attendance:
+def _get_attendance(db: Session, user_id: int, session_id: int) -> Optional[Attendance]:
+    """Busca el registro (user_id, session_id) usando la restricción única."""
+    return db.execute(
+        select(Attendance).where(Attendance.user_id == user_id, Attendance.session_id == session_id)
+    ).scalars().first()
+
+def _reserve_seat(db: Session, session_id: int) -> bool:
     """
-    Orquesta el proceso de registro de un usuario en una sesión.
+    Incrementa `current_attendees` sólo si la sesión aún tiene cupo.
+    Es un único UPDATE condicional, por lo que la propia base de datos
+    serializa las reservas concurrentes y nunca se sobrepasa `max_capacity`.
     """
-    # 1. Usa el método del modelo para la lógica de negocio encapsulada.
-    if not session.can_register(user):
-        # Aquí podemos ser más específicos sobre el error
-        if session.is_full:
-            raise SessionFullError("No se puede registrar: la sesión está llena.")
-        else:
-            raise AlreadyRegisteredError("El usuario ya está registrado en esta sesión.")
+    result = db.execute(
+        update(EventSession)
+        .where(
+            EventSession.id == session_id,
+            EventSession.deleted_at == None,
+            EventSession.current_attendees < EventSession.max_capacity,
+        )
+        .values(current_attendees=EventSession.current_attendees + 1, updated_at=datetime.utcnow())
+    )
+    return result.rowcount == 1
+
+def _next_waitlist_position(db: Session, session_id: int) -> int:
+    """
+    Asigna la siguiente posición de la lista de espera incrementando
+    `EventSession.waitlist_seq`. El UPDATE bloquea la fila de la sesión,
+    así que dos usuarios nunca reciben la misma posición.
+    """
+    return db.execute(
+        update(EventSession)
+        .where(EventSession.id == session_id)
+        .values(waitlist_seq=EventSession.waitlist_seq + 1)
+        .returning(EventSession.waitlist_seq)
+    ).scalar_one()
+
+def _promote_from_waitlist(db: Session, session_id: int, limit: int = 1) -> List[Attendance]:
+    """
+    Confirma a los primeros `limit` usuarios de la lista de espera.
+    Usa el índice (session_id, waitlist_position) en lugar de recorrer
+    `session.attendances`.
+    """
+    heads = db.execute(
+        select(Attendance)
+        .where(Attendance.session_id == session_id, Attendance.waitlist_position != None)
+        .order_by(Attendance.waitlist_position)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+
+    for head in heads:
+        head.confirm()
+        db.add(head)
+    return heads
 
-    # 2. Si las reglas de negocio pasan, el servicio crea el registro
-    new_attendance = Attendance(user_id=user.id, session_id=session.id)
-    db.add(new_attendance)
+def _release_seats(db: Session, session_id: int, count: int = 1) -> None:
+    """
+    Libera `count` plazas ocupadas. La lista de espera tiene prioridad: sólo
+    se decrementa `current_attendees` por las plazas que nadie reclama.
+    """
+    promoted = _promote_from_waitlist(db, session_id, limit=count)
+    # Aquí se podría notificar a los usuarios promovidos
+    # notification_service.send_waitlist_promotion(promoted)
+
+    freed = count - len(promoted)
+    if freed > 0:
+        db.execute(
+            update(EventSession)
+            .where(EventSession.id == session_id, EventSession.current_attendees >= freed)
+            .values(current_attendees=EventSession.current_attendees - freed, updated_at=datetime.utcnow())
+        )
+
+def promote_for_capacity_increase(db: Session, session_id: int, max_capacity: int, added: int) -> List[Attendance]:
+    """
+    Al ampliar la capacidad de una sesión en `added` plazas, confirma a los
+    primeros de la lista de espera en las plazas que quedan libres con la
+    nueva `max_capacity` y las cuenta en `current_attendees`.
+    La transacción debe ser confirmada (commit) por el llamador.
+    """
+    current = db.execute(
+        select(EventSession.current_attendees).where(EventSession.id == session_id).with_for_update()
+    ).scalar()
+    free = min(added, max_capacity - current) if current is not None else 0
+    if free <= 0:
+        return []
+    promoted = _promote_from_waitlist(db, session_id, limit=free)
+    if promoted:
+        db.execute(
+            update(EventSession)
+            .where(EventSession.id == session_id)
+            .values(current_attendees=EventSession.current_attendees + len(promoted), updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+    return promoted
+
+def _lease_seats(db: Session, session_id: int, count: int) -> int:
+    """
+    Reserva en bloque hasta `count` plazas para el inventario en memoria y
+    confirma la transacción para que los demás procesos las vean ocupadas.
+    Devuelve cuántas plazas se obtuvieron.
+    """
+    row = db.execute(
+        select(EventSession.current_attendees, EventSession.max_capacity)
+        .where(EventSession.id == session_id, EventSession.deleted_at == None)
+        .with_for_update()
+    ).first()
+    claimed = max(0, min(count, row.max_capacity - row.current_attendees)) if row else 0
+    if claimed:
+        db.execute(
+            update(EventSession)
+            .where(EventSession.id == session_id)
+            .values(current_attendees=EventSession.current_attendees + claimed, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
     db.commit()
-    db.refresh(new_attendance)
+    return claimed
 
-    # 3. Aquí se podría llamar a un servicio de notificaciones
+def _reserve_from_inventory(db: Session, user: User, session: EventSession) -> Optional[Attendance]:
+    """
+    Admite el registro contra el inventario en memoria.
+    Devuelve una asistencia aún no persistida (sin id), o None si el
+    inventario no tiene plazas y hay que seguir por el flujo normal.
+    """
+    try:
+        reservation = seat_inventory.inventory.admit(
+            session.id,
+            user.id,
+            load_user_ids=lambda: db.execute(
+                select(Attendance.user_id).where(
+                    Attendance.session_id == session.id,
+                    Attendance.status != AttendanceStatus.CANCELLED,
+                )
+            ).scalars().all(),
+            lease=lambda count: _lease_seats(db, session.id, count),
+        )
+    except seat_inventory.DuplicateReservationError:
+        raise AlreadyRegisteredError("El usuario ya está registrado en esta sesión.")
+
+    if reservation is None:
+        return None
+    return Attendance(
+        user_id=user.id,
+        session_id=session.id,
+        status=AttendanceStatus.CONFIRMED,
+        registration_date=reservation.registration_date,
+    )
+
+def register_user_for_session(
+    db: Session, user: User, session: EventSession, join_waitlist: bool = True, use_inventory: bool = True
+) -> Attendance:
+    """
+    Orquesta el proceso de registro de un usuario en una sesión.
+
+    La plaza se reserva con un UPDATE condicional sobre
+    `EventSession.current_attendees` y el registro se inserta en la misma
+    transacción, sin recorrer `session.attendances`. El coste es constante
+    aunque la sesión esté casi llena.
+
+    Si la sesión está llena y `join_waitlist` es True, el usuario entra en la
+    lista de espera (status WAITLIST) en orden de llegada.
+
+    Las sesiones con el inventario en memoria activo se admiten sin tocar la
+    base de datos; la asistencia devuelta no tiene id hasta que
+    `flush_seat_inventory` la escribe. Con `use_inventory=False` se usa
+    siempre el flujo normal (ver `async_registration_service`).
+    """
+    if use_inventory and seat_inventory.is_enabled_for(session):
+        attendance = _reserve_from_inventory(db, user, session)
+        if attendance is not None:
+            return attendance
+
+    # 1. Un usuario sólo puede tener un registro activo por sesión.
+    attendance = _get_attendance(db, user.id, session.id)
+    if attendance and attendance.status != AttendanceStatus.CANCELLED:
+        raise AlreadyRegisteredError("El usuario ya está registrado en esta sesión.")
+
+    # 2. Crea el registro, o reactiva uno cancelado previamente.
+    if attendance:
+        attendance.registration_date = datetime.utcnow()
+    else:
+        attendance = Attendance(user_id=user.id, session_id=session.id)
+
+    # 3. Reserva atómica de la plaza o, si está llena, lista de espera.
+    if _reserve_seat(db, session.id):
+        attendance.confirm()
+    elif join_waitlist:
+        attendance.join_waitlist(_next_waitlist_position(db, session.id))
+    else:
+        raise SessionFullError("No se puede registrar: la sesión está llena.")
+    db.add(attendance)
+
+    try:
+        db.commit()
+    except IntegrityError:
+        # Otra petición concurrente del mismo usuario ganó la carrera.
+        db.rollback()
+        raise AlreadyRegisteredError("El usuario ya está registrado en esta sesión.")
+    db.refresh(attendance)
+
+    # 4. Aquí se podría llamar a un servicio de notificaciones
     # notification_service.send_registration_confirmation(user, session)
     
-    return new_attendance
+    return attendance
 
 def cancel_registration(db: Session, user: User, session: EventSession) -> Attendance:
     """
     Cancela la asistencia de un usuario a una sesión.
+
+    Si el registro estaba confirmado, la plaza pasa en la misma transacción
+    al primero de la lista de espera; sólo se libera si la lista está vacía.
     """
-    attendance_record = db.exec(
-        select(Attendance).where(Attendance.user_id == user.id, Attendance.session_id == session.id)
-    ).first()
+    if seat_inventory.is_enabled_for(session):
+        if seat_inventory.inventory.cancel_pending(session.id, user.id):
+            return Attendance(user_id=user.id, session_id=session.id, status=AttendanceStatus.CANCELLED)
+        seat_inventory.inventory.forget(session.id, user.id)
 
-    if not attendance_record:
+    attendance_record = _get_attendance(db, user.id, session.id)
+
+    if not attendance_record or attendance_record.status == AttendanceStatus.CANCELLED:
         raise RegistrationError("El usuario no tiene un registro en esta sesión para cancelar.")
 
+    was_confirmed = attendance_record.status == AttendanceStatus.CONFIRMED
+
     # Usa el método del modelo para cambiar el estado
     attendance_record.cancel()
-
     db.add(attendance_record)
+
+    if was_confirmed:
+        _release_seats(db, session.id)
+
     db.commit()
     db.refresh(attendance_record)
     
     return attendance_record
 
-def get_user_registrations(db: Session, user: User) -> List[Attendance]:
+def get_batch_sessions(db: Session, session_ids: List[int]) -> List[EventSession]:
+    """
+    Carga en una sola consulta las sesiones de un registro por lotes y
+    verifica que existan y pertenezcan al mismo evento.
+    """
+    session_ids = list(dict.fromkeys(session_ids))
+    sessions = db.execute(
+        select(EventSession).where(EventSession.id.in_(session_ids), EventSession.deleted_at == None)
+    ).scalars().all()
+
+    if len(sessions) != len(session_ids):
+        found = {s.id for s in sessions}
+        missing = [sid for sid in session_ids if sid not in found]
+        raise RegistrationError(f"Sesiones no encontradas: {missing}")
+    if len({s.event_id for s in sessions}) > 1:
+        raise RegistrationError("Todas las sesiones del lote deben pertenecer al mismo evento.")
+
+    return sorted(sessions, key=lambda s: session_ids.index(s.id))
+
+def register_users_batch(
+    db: Session, user_ids: List[int], sessions: List[EventSession]
+) -> BatchRegistrationResponse:
+    """
+    Registra a varios usuarios en varias sesiones en una sola transacción.
+
+    1. Lee (y bloquea) la capacidad restante de todas las sesiones a la vez.
+    2. Resuelve en memoria el resultado de cada par (usuario, sesión).
+    3. Incrementa los contadores con un único UPDATE ... CASE.
+    4. Inserta todas las asistencias nuevas con un único INSERT multi-fila.
+
+    Una sesión llena no aborta el lote: sus pares se reportan como
+    `session_full` y el resto se registra normalmente.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    session_ids = [s.id for s in sessions]
+
+    # 1. Capacidad restante por sesión, con las filas bloqueadas hasta el commit.
+    remaining = {
+        row.id: row.max_capacity - row.current_attendees
+        for row in db.execute(
+            select(EventSession.id, EventSession.max_capacity, EventSession.current_attendees)
+            .where(EventSession.id.in_(session_ids))
+            .with_for_update()
+        )
+    }
+    active_users = set(
+        db.execute(
+            select(User.id).where(User.id.in_(user_ids), User.is_active == True, User.deleted_at == None)
+        ).scalars()
+    )
+    existing = {
+        (row.user_id, row.session_id): row
+        for row in db.execute(
+            select(Attendance.id, Attendance.user_id, Attendance.session_id, Attendance.status)
+            .where(Attendance.user_id.in_(user_ids), Attendance.session_id.in_(session_ids))
+        )
+    }
+
+    # 2. Resultado por par, respetando el orden de la petición.
+    results: List[BatchRegistrationItem] = []
+    new_rows, reactivated_ids, seats_taken = [], [], {}
+    now = datetime.utcnow()
+    for session_id in session_ids:
+        for user_id in user_ids:
+            item = BatchRegistrationItem(
+                user_id=user_id, session_id=session_id, outcome=RegistrationOutcome.REGISTERED
+            )
+            previous = existing.get((user_id, session_id))
+            if user_id not in active_users:
+                item.outcome = RegistrationOutcome.USER_NOT_FOUND
+            elif previous and previous.status != AttendanceStatus.CANCELLED:
+                item.outcome = RegistrationOutcome.ALREADY_REGISTERED
+                item.attendance_id = previous.id
+            elif remaining[session_id] <= 0:
+                item.outcome = RegistrationOutcome.SESSION_FULL
+            else:
+                remaining[session_id] -= 1
+                seats_taken[session_id] = seats_taken.get(session_id, 0) + 1
+                if previous:
+                    reactivated_ids.append(previous.id)
+                    item.attendance_id = previous.id
+                else:
+                    new_rows.append({"user_id": user_id, "session_id": session_id, "registration_date": now})
+            results.append(item)
+
+    # 3. Contadores de todas las sesiones en una sola sentencia.
+    if seats_taken:
+        db.execute(
+            update(EventSession)
+            .where(EventSession.id.in_(list(seats_taken)))
+            .values(
+                current_attendees=EventSession.current_attendees
+                + case(seats_taken, value=EventSession.id, else_=0),
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    # 4. Asistencias nuevas y reactivadas.
+    if new_rows:
+        inserted = db.execute(
+            insert(Attendance).returning(Attendance.id, Attendance.user_id, Attendance.session_id),
+            new_rows,
+        )
+        ids = {(row.user_id, row.session_id): row.id for row in inserted}
+        for item in results:
+            if item.outcome == RegistrationOutcome.REGISTERED and item.attendance_id is None:
+                item.attendance_id = ids[(item.user_id, item.session_id)]
+    if reactivated_ids:
+        db.execute(
+            update(Attendance)
+            .where(Attendance.id.in_(reactivated_ids))
+            .values(status=AttendanceStatus.CONFIRMED, waitlist_position=None, registration_date=now)
+            .execution_options(synchronize_session=False)
+        )
+
+    db.commit()
+
+    registered = sum(1 for item in results if item.outcome == RegistrationOutcome.REGISTERED)
+    return BatchRegistrationResponse(results=results, registered=registered, failed=len(results) - registered)
+
+def _write_reservations(db: Session, reservations: List[seat_inventory.PendingReservation], duplicates: Dict[int, int]) -> None:
+    """
+    Escribe las asistencias de `reservations` (sin pares repetidos). Las de
+    usuarios que ya tenían un registro confirmado se cuentan en `duplicates`
+    por sesión, para devolver su plaza.
+    """
+    existing = {
+        (row.user_id, row.session_id): row
+        for row in db.execute(
+            select(Attendance.id, Attendance.user_id, Attendance.session_id, Attendance.status).where(
+                Attendance.session_id.in_({r.session_id for r in reservations}),
+                Attendance.user_id.in_({r.user_id for r in reservations}),
+            )
+        )
+    }
+    new_rows = []
+    for reservation in reservations:
+        previous = existing.get((reservation.user_id, reservation.session_id))
+        if previous is None:
+            new_rows.append({
+                "user_id": reservation.user_id,
+                "session_id": reservation.session_id,
+                "registration_date": reservation.registration_date,
+            })
+        elif previous.status == AttendanceStatus.CONFIRMED:
+            duplicates[reservation.session_id] = duplicates.get(reservation.session_id, 0) + 1
+        else:
+            # Registro cancelado o en lista de espera: ocupa la plaza reservada.
+            db.execute(
+                update(Attendance)
+                .where(Attendance.id == previous.id)
+                .values(
+                    status=AttendanceStatus.CONFIRMED,
+                    waitlist_position=None,
+                    registration_date=reservation.registration_date,
+                )
+                .execution_options(synchronize_session=False)
+            )
+    if new_rows:
+        db.execute(insert(Attendance), new_rows)
+
+def flush_seat_inventory(db: Session) -> int:
     """
-    Obtiene todos los eventos a los que un usuario está registrado.
+    Escribe en lote las reservas admitidas por el inventario en memoria.
+    Las plazas ya están contadas en `current_attendees` (se reservaron en
+    bloque), así que sólo se insertan las asistencias. Si un usuario ya tenía
+    un registro confirmado, o aparece dos veces en el lote, la plaza sobrante
+    vuelve al inventario.
+
+    Si el lote choca con la restricción única (un registro escrito mientras
+    tanto por otra vía), se reintenta reserva a reserva: las que siguen
+    chocando se descartan y sólo se vuelven a encolar las que fallan por
+    otros motivos, para que una reserva inválida no bloquee las siguientes
+    escrituras. Devuelve el número de reservas procesadas.
     """
-    # Usa la relación cargada en el objeto User si ya está disponible,
-    # o realiza una consulta directa.
-    return user.attendances
+    pending = seat_inventory.inventory.drain_pending()
+    if not pending:
+        return 0
+
+    duplicates: Dict[int, int] = {}
+    unique: Dict[Tuple[int, int], seat_inventory.PendingReservation] = {}
+    for reservation in pending:
+        key = (reservation.user_id, reservation.session_id)
+        if key in unique:
+            duplicates[reservation.session_id] = duplicates.get(reservation.session_id, 0) + 1
+        else:
+            unique[key] = reservation
+    reservations = list(unique.values())
+
+    try:
+        _write_reservations(db, reservations, duplicates)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        failed = []
+        for reservation in reservations:
+            try:
+                with db.begin_nested():
+                    _write_reservations(db, [reservation], duplicates)
+            except IntegrityError:
+                duplicates[reservation.session_id] = duplicates.get(reservation.session_id, 0) + 1
+            except Exception:
+                failed.append(reservation)
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+            seat_inventory.inventory.requeue(reservations)
+            raise
+        if failed:
+            seat_inventory.inventory.requeue(failed)
+    except Exception:
+        db.rollback()
+        seat_inventory.inventory.requeue(reservations)
+        raise
+
+    for session_id, count in duplicates.items():
+        seat_inventory.inventory.return_seats(session_id, count)
+    return len(pending)
+
+def reconcile_seat_inventory(db: Session) -> None:
+    """
+    Reconciliación periódica del inventario en memoria.
+    Escribe las reservas pendientes y devuelve a la base de datos las plazas
+    reservadas en bloque que no se usaron (dando prioridad a la lista de
+    espera). Las sesiones se descargan y se vuelven a cargar desde la base de
+    datos en la siguiente petición, así que ambos lados no divergen.
+    """
+    flush_seat_inventory(db)
+    for session_id in seat_inventory.inventory.loaded_sessions():
+        unused = seat_inventory.inventory.unload(session_id)
+        if unused:
+            _release_seats(db, session_id, unused)
+    db.commit()
+
+def get_user_registrations(
+    db: Session,
+    user_id: int,
+    page: int = 1,
+    limit: Optional[int] = None,
+    upcoming: bool = False,
+    status: Optional[AttendanceStatus] = None,
+) -> List[UserEventRegistration]:
+    """
+    Obtiene los registros de un usuario, del más reciente al más antiguo,
+    con una sola consulta que une asistencia, sesión y evento y proyecta
+    directamente al schema de respuesta (sin cargar objetos ORM).
+    El orden sigue el índice `ix_attendances_user_registration_date`.
+
+    Sin `limit` se devuelven todos los registros; con él, la página `page`.
+    Con `upcoming` sólo se incluyen las sesiones que aún no han empezado.
+    """
+    query = (
+        select(
+            Event.name.label("event_name"),
+            Event.category.label("event_category"),
+            EventSession.session_datetime,
+            EventSession.specific_location.label("session_location"),
+            Attendance.status.label("registration_status"),
+            Event.id.label("event_id"),
+            EventSession.id.label("session_id"),
+        )
+        .select_from(Attendance)
+        .join(EventSession, EventSession.id == Attendance.session_id)
+        .join(Event, Event.id == EventSession.event_id)
+        .where(Attendance.user_id == user_id)
+    )
+    if upcoming:
+        query = query.where(EventSession.session_datetime >= datetime.utcnow())
+    if status is not None:
+        query = query.where(Attendance.status == status)
+
+    query = query.order_by(Attendance.registration_date.desc(), Attendance.id.desc())
+    if limit is not None:
+        query = query.offset((page - 1) * limit).limit(limit)
+    rows = db.execute(query)
+    return [UserEventRegistration.model_validate(row._mapping) for row in rows]
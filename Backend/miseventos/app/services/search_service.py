@@ -0,0 +1,252 @@
+# app/services/search_service.py
+
+"""
+Búsqueda de texto completo sobre los eventos del catálogo público.
+
+Se indexan el nombre, la descripción, la ubicación y la categoría, con pesos
+distintos para ordenar por relevancia:
+
+- En PostgreSQL se usa un `tsvector` ponderado con índice GIN
+  (`ix_events_search_vector`, creado por migración). La categoría es un ENUM
+  nativo y su cast a texto no es inmutable, así que no entra en el índice:
+  se compara aparte contra los valores del enum.
+- En otros motores (SQLite en tests y desarrollo) se usa un índice invertido
+  en memoria, por proceso. Se reconstruye de forma perezosa tras confirmarse
+  cualquier escritura de eventos; entre escrituras, cada búsqueda cuesta O(log V) por
+  término más el tamaño de las listas de coincidencias.
+
+En ambos casos la API es la misma: `search_events` devuelve los eventos
+ordenados por relevancia y `search_filter` da una condición para combinar con
+otras consultas (p. ej. el listado paginado).
+"""
+
+import bisect
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from itertools import chain
+from typing import Dict, List, Optional
+
+from sqlalchemy import case, event as sa_event, false, func, literal_column, or_
+from sqlalchemy.orm import Session, Session as OrmSession
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import select
+
+from app.models.event import Event
+from app.utils.enums import EventCategory, EventStatus
+
+# Configuración de texto de PostgreSQL; debe coincidir con la de la migración del índice.
+# Se emite como literal (no como parámetro) para que el planificador reconozca
+# la expresión del índice también con sentencias preparadas.
+TEXT_SEARCH_CONFIG = literal_column("'spanish'::regconfig")
+
+# Pesos por campo (mismos que los pesos por defecto de `ts_rank` para A/B/C)
+WEIGHT_NAME = 1.0
+WEIGHT_DESCRIPTION = 0.4
+WEIGHT_CATEGORY = 0.4
+WEIGHT_LOCATION = 0.2
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Normaliza (minúsculas, sin acentos) y separa en términos de 2+ caracteres."""
+    if not text:
+        return []
+    normalized = unicodedata.normalize("NFKD", text.lower())
+    normalized = "".join(c for c in normalized if not unicodedata.combining(c))
+    return [token for token in _TOKEN_RE.findall(normalized) if len(token) > 1]
+
+
+def _matching_categories(query: str) -> List[EventCategory]:
+    terms = set(tokenize(query))
+    return [category for category in EventCategory if category.value in terms]
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+# Estados indexados: los del catálogo público (`event_service.PUBLIC_STATUSES`),
+# que el listado puede combinar con la búsqueda. `search_events` sólo devuelve
+# los publicados. El índice GIN parcial usa el mismo predicado (ver migración).
+INDEXED_STATUSES = (EventStatus.PUBLISHED, EventStatus.IN_PROGRESS, EventStatus.COMPLETED, EventStatus.CANCELLED)
+
+
+def _published_filters():
+    return (Event.status == EventStatus.PUBLISHED, Event.deleted_at == None)
+
+
+def _indexed_filters():
+    return (Event.status.in_(INDEXED_STATUSES), Event.deleted_at == None)
+
+
+# --- PostgreSQL ---
+
+def search_vector():
+    """Expresión `tsvector` ponderada; idéntica a la del índice GIN."""
+    def weighted(column, weight):
+        document = func.to_tsvector(TEXT_SEARCH_CONFIG, func.coalesce(column, literal_column("''")))
+        return func.setweight(document, literal_column(f"'{weight}'"))
+    return (
+        weighted(Event.name, "A")
+        .op("||")(weighted(Event.description, "B"))
+        .op("||")(weighted(Event.general_location, "C"))
+    )
+
+
+def _ts_query(query: str):
+    return func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, query)
+
+
+def _pg_condition(query: str) -> ColumnElement:
+    condition = search_vector().op("@@")(_ts_query(query))
+    categories = _matching_categories(query)
+    if categories:
+        condition = or_(condition, Event.category.in_(categories))
+    return condition
+
+
+# --- Índice invertido en memoria ---
+
+class InvertedIndex:
+    """
+    Índice invertido término -> {event_id: peso}. Mantiene el vocabulario
+    ordenado para resolver prefijos con búsqueda binaria.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._vocabulary: List[str] = []
+
+    def build(self, rows):
+        postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        for event_id, name, description, location, category in rows:
+            fields = (
+                (name, WEIGHT_NAME),
+                (description, WEIGHT_DESCRIPTION),
+                (category.value if category else None, WEIGHT_CATEGORY),
+                (location, WEIGHT_LOCATION),
+            )
+            for text, weight in fields:
+                for token in tokenize(text):
+                    postings[token][event_id] = postings[token].get(event_id, 0.0) + weight
+        self._postings = dict(postings)
+        self._vocabulary = sorted(self._postings)
+
+    def _term_scores(self, term: str) -> Dict[int, float]:
+        """Puntuaciones de un término; el término también casa como prefijo."""
+        scores: Dict[int, float] = dict(self._postings.get(term, {}))
+        start = bisect.bisect_left(self._vocabulary, term)
+        for token in self._vocabulary[start:]:
+            if not token.startswith(term):
+                break
+            if token == term:
+                continue
+            for event_id, weight in self._postings[token].items():
+                # Un prefijo puntúa menos que el término exacto
+                scores[event_id] = max(scores.get(event_id, 0.0), weight * 0.5)
+        return scores
+
+    def search(self, query: str) -> Dict[int, float]:
+        """Eventos que contienen todos los términos de la consulta, con su puntuación."""
+        terms = tokenize(query)
+        if not terms:
+            return {}
+        result: Optional[Dict[int, float]] = None
+        for term in sorted(set(terms), key=lambda t: len(self._postings.get(t, ())) or float("inf")):
+            scores = self._term_scores(term)
+            if result is None:
+                result = scores
+            else:
+                result = {event_id: result[event_id] + score for event_id, score in scores.items() if event_id in result}
+            if not result:
+                return {}
+        return result
+
+
+class _FallbackIndex:
+    """Índice invertido compartido del proceso, reconstruido tras cada escritura de eventos."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = InvertedIndex()
+        # Se incrementa en cada escritura; el índice está al día si coincide con la versión construida
+        self._generation = 1
+        self._built_generation = 0
+
+    def mark_stale(self):
+        self._generation += 1
+
+    def search(self, db: Session, query: str) -> Dict[int, float]:
+        with self._lock:
+            generation = self._generation
+            if self._built_generation != generation:
+                rows = db.execute(
+                    select(Event.id, Event.name, Event.description, Event.general_location, Event.category)
+                    .where(*_indexed_filters())
+                ).all()
+                self._index.build(rows)
+                # Una escritura confirmada durante la reconstrucción deja el índice rancio otra vez
+                self._built_generation = generation
+            return self._index.search(query)
+
+
+fallback_index = _FallbackIndex()
+
+
+# El índice se marca rancio al confirmar la transacción que escribió eventos,
+# no al hacer flush: si se marcara antes, una búsqueda concurrente podría
+# reconstruirlo con los datos previos al commit y darlo por bueno.
+@sa_event.listens_for(OrmSession, "after_flush")
+def _track_event_writes(session, flush_context):
+    if any(isinstance(obj, Event) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info["search_index_stale"] = True
+
+
+@sa_event.listens_for(OrmSession, "after_commit")
+def _mark_index_stale(session):
+    if session.info.pop("search_index_stale", False):
+        fallback_index.mark_stale()
+
+
+@sa_event.listens_for(OrmSession, "after_soft_rollback")
+def _discard_after_rollback(session, previous_transaction):
+    session.info.pop("search_index_stale", None)
+
+
+# --- API ---
+
+def search_filter(db: Session, query: str) -> ColumnElement:
+    """Condición SQL que restringe `Event` a los resultados de la búsqueda."""
+    if _is_postgres(db):
+        return _pg_condition(query)
+    matches = fallback_index.search(db, query)
+    return Event.id.in_(matches) if matches else false()
+
+
+def search_events(db: Session, query: str, limit: int = 20) -> List[Event]:
+    """Busca eventos publicados y los devuelve ordenados por relevancia."""
+    if _is_postgres(db):
+        rank = func.ts_rank(search_vector(), _ts_query(query))
+        categories = _matching_categories(query)
+        if categories:
+            rank = rank + case((Event.category.in_(categories), WEIGHT_CATEGORY), else_=0.0)
+        return db.execute(
+            select(Event)
+            .where(*_published_filters(), _pg_condition(query))
+            .order_by(rank.desc(), Event.id)
+            .limit(limit)
+        ).scalars().all()
+
+    matches = fallback_index.search(db, query)
+    if not matches:
+        return []
+    # Se vuelve a filtrar en la base de datos: el índice puede contener eventos
+    # de transacciones que no llegaron a confirmarse.
+    events = db.execute(
+        select(Event).where(*_published_filters(), Event.id.in_(matches))
+    ).scalars().all()
+    events.sort(key=lambda e: (-matches[e.id], e.id))
+    return events[:limit]
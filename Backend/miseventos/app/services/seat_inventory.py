@@ -0,0 +1,260 @@
+# app/services/seat_inventory.py
+
+"""
+Inventario de plazas en memoria para sesiones con picos de demanda
+(preventa y venta).
+
+Cada proceso reserva en la base de datos bloques de plazas ("leases") y los
+reparte entre varios contadores fragmentados. Las peticiones de registro se
+admiten o rechazan contra esos contadores sin tocar la base de datos; las
+asistencias admitidas quedan pendientes hasta que `registration_service`
+las escribe en lote.
+
+Este módulo sólo mantiene el estado en memoria. Las operaciones contra la
+base de datos (reservar un bloque, escribir las asistencias, devolver plazas)
+las orquesta `registration_service`.
+"""
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from app.core.config import settings
+from app.utils.enums import SessionStatus
+
+# Estados de sesión en los que se puede activar el inventario
+INVENTORY_SESSION_STATUSES = (SessionStatus.PRESALE, SessionStatus.SALE)
+
+
+class DuplicateReservationError(Exception):
+    """El usuario ya tiene una plaza admitida en esta sesión."""
+    pass
+
+
+@dataclass
+class PendingReservation:
+    """Reserva admitida en memoria, pendiente de escribirse en la base de datos."""
+    session_id: int
+    user_id: int
+    registration_date: datetime
+
+
+class _Shard:
+    """Fragmento del contador: plazas libres y usuarios admitidos cuyo id cae en él."""
+    __slots__ = ("lock", "remaining", "user_ids")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.remaining = 0
+        self.user_ids: Set[int] = set()
+
+
+class _SessionInventory:
+    """Contadores fragmentados de una sesión."""
+
+    def __init__(self, shard_count: int, user_ids: Iterable[int]):
+        self.shards = [_Shard() for _ in range(shard_count)]
+        self.lease_lock = threading.Lock()
+        # Se marca cuando la base de datos ya no tiene plazas que ceder.
+        self.exhausted = False
+        # Se marca al descargar la sesión: ya no cede ni reserva plazas.
+        self.closed = False
+        for user_id in user_ids:
+            self.home(user_id).user_ids.add(user_id)
+
+    def home(self, user_id: int) -> _Shard:
+        return self.shards[user_id % len(self.shards)]
+
+    def take_seat(self, preferred: _Shard) -> bool:
+        """Toma una plaza del fragmento preferido o, si está vacío, de otro."""
+        if self.closed:
+            return False
+        for shard in [preferred] + [s for s in self.shards if s is not preferred]:
+            with shard.lock:
+                if shard.remaining > 0:
+                    shard.remaining -= 1
+                    return True
+        return False
+
+    def add_seats(self, count: int):
+        per_shard, extra = divmod(count, len(self.shards))
+        for i, shard in enumerate(self.shards):
+            with shard.lock:
+                shard.remaining += per_shard + (1 if i < extra else 0)
+
+    def drain(self) -> int:
+        """Vacía todos los fragmentos y devuelve las plazas que quedaban."""
+        total = 0
+        for shard in self.shards:
+            with shard.lock:
+                total += shard.remaining
+                shard.remaining = 0
+        return total
+
+
+class SeatInventory:
+    """
+    Inventario de plazas en memoria de un proceso.
+    Es seguro usarlo desde los hilos del threadpool de FastAPI.
+    """
+
+    def __init__(self, shard_count: int, lease_size: int):
+        self.shard_count = shard_count
+        self.lease_size = lease_size
+        self._sessions: Dict[int, _SessionInventory] = {}
+        self._sessions_lock = threading.Lock()
+        self._pending: List[PendingReservation] = []
+        self._pending_lock = threading.Lock()
+
+    def _get_or_load(self, session_id: int, load_user_ids: Callable[[], Iterable[int]]) -> _SessionInventory:
+        inventory = self._sessions.get(session_id)
+        if inventory is None:
+            with self._sessions_lock:
+                inventory = self._sessions.get(session_id)
+                if inventory is None:
+                    # Las reservas aún sin escribir también cuentan como registros
+                    user_ids = set(load_user_ids()) | self._pending_user_ids(session_id)
+                    inventory = _SessionInventory(self.shard_count, user_ids)
+                    self._sessions[session_id] = inventory
+        return inventory
+
+    def _pending_user_ids(self, session_id: int) -> Set[int]:
+        with self._pending_lock:
+            return {r.user_id for r in self._pending if r.session_id == session_id}
+
+    def _renew_lease(self, inventory: _SessionInventory, lease: Callable[[int], int]) -> bool:
+        """Pide un nuevo bloque de plazas; sólo un hilo por sesión lo hace a la vez."""
+        with inventory.lease_lock:
+            if inventory.closed:
+                return False  # Descargada: sus plazas ya no se devolverían
+            if any(shard.remaining > 0 for shard in inventory.shards):
+                return True  # Otro hilo ya renovó el bloque
+            if inventory.exhausted:
+                return False
+            claimed = lease(self.lease_size)
+            if claimed <= 0:
+                inventory.exhausted = True
+                return False
+            inventory.add_seats(claimed)
+            return True
+
+    def admit(
+        self,
+        session_id: int,
+        user_id: int,
+        load_user_ids: Callable[[], Iterable[int]],
+        lease: Callable[[int], int],
+    ) -> Optional[PendingReservation]:
+        """
+        Intenta admitir al usuario en la sesión.
+
+        - `load_user_ids` devuelve los usuarios ya registrados; sólo se llama
+          la primera vez que el proceso ve la sesión.
+        - `lease(n)` reserva hasta `n` plazas en la base de datos y devuelve
+          cuántas consiguió; sólo se llama cuando se agota el bloque actual.
+
+        Devuelve la reserva pendiente, o None si no quedan plazas.
+        Lanza DuplicateReservationError si el usuario ya fue admitido.
+        Si la sesión se descarga mientras tanto, se reintenta con la recargada.
+        """
+        while True:
+            inventory = self._get_or_load(session_id, load_user_ids)
+            home = inventory.home(user_id)
+            with home.lock:
+                if user_id in home.user_ids:
+                    raise DuplicateReservationError()
+                home.user_ids.add(user_id)
+
+            if inventory.take_seat(home) or (self._renew_lease(inventory, lease) and inventory.take_seat(home)):
+                break
+            with home.lock:
+                home.user_ids.discard(user_id)
+            if not inventory.closed:
+                return None
+
+        reservation = PendingReservation(session_id, user_id, datetime.utcnow())
+        with self._pending_lock:
+            self._pending.append(reservation)
+        return reservation
+
+    def cancel_pending(self, session_id: int, user_id: int) -> bool:
+        """
+        Cancela una reserva que aún no se ha escrito en la base de datos.
+        La plaza vuelve al inventario. Devuelve False si no estaba pendiente.
+        """
+        with self._pending_lock:
+            for i, reservation in enumerate(self._pending):
+                if reservation.session_id == session_id and reservation.user_id == user_id:
+                    del self._pending[i]
+                    break
+            else:
+                return False
+        self.return_seats(session_id, 1)
+        self.forget(session_id, user_id)
+        return True
+
+    def forget(self, session_id: int, user_id: int):
+        """Olvida a un usuario admitido (p. ej. tras cancelar su registro)."""
+        inventory = self._sessions.get(session_id)
+        if inventory is not None:
+            home = inventory.home(user_id)
+            with home.lock:
+                home.user_ids.discard(user_id)
+
+    def return_seats(self, session_id: int, count: int):
+        """Devuelve plazas al inventario de la sesión si sigue cargada."""
+        inventory = self._sessions.get(session_id)
+        if inventory is not None and count > 0:
+            inventory.add_seats(count)
+
+    def drain_pending(self) -> List[PendingReservation]:
+        """Extrae todas las reservas pendientes para escribirlas en lote."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+        return pending
+
+    def requeue(self, reservations: List[PendingReservation]):
+        """Vuelve a encolar reservas cuya escritura falló."""
+        with self._pending_lock:
+            self._pending[:0] = reservations
+
+    def loaded_sessions(self) -> List[int]:
+        return list(self._sessions)
+
+    def unload(self, session_id: int) -> int:
+        """
+        Descarga una sesión y devuelve cuántas plazas reservadas no se usaron,
+        para que el llamador las devuelva a la base de datos. La próxima
+        petición la vuelve a cargar desde el estado real de la base de datos.
+        """
+        with self._sessions_lock:
+            inventory = self._sessions.pop(session_id, None)
+        if inventory is None:
+            return 0
+        # Tras cerrarla ningún hilo puede reservar más plazas en ella
+        with inventory.lease_lock:
+            inventory.closed = True
+        return inventory.drain()
+
+    def reset(self):
+        """Descarta todo el estado en memoria (usado en pruebas)."""
+        with self._sessions_lock:
+            self._sessions.clear()
+        self.drain_pending()
+
+
+def is_enabled_for(session) -> bool:
+    """Indica si el registro en esta sesión debe pasar por el inventario en memoria."""
+    return (
+        settings.SEAT_INVENTORY_ENABLED
+        and session.seat_inventory_enabled
+        and session.status in INVENTORY_SESSION_STATUSES
+    )
+
+
+# Instancia única por proceso
+inventory = SeatInventory(
+    shard_count=settings.SEAT_INVENTORY_SHARDS,
+    lease_size=settings.SEAT_INVENTORY_LEASE_SIZE,
+)
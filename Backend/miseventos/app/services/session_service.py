@@ -1,74 +1,276 @@
 # app/services/session_service.py
 
+import heapq
+from typing import Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import func, insert, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from sqlmodel import select # Se añade import de select
 from datetime import timedelta, datetime # CORRECCIÓN: Se añade import de timedelta y datetime
 
+from app.models.attendance import Attendance
 from app.models.event import Event
-from app.models.session import EventSession
+from app.models.session import DEFAULT_SESSION_MINUTES, EventSession
+from app.utils.enums import AttendanceStatus
 # CORRECCIÓN: Se usan los nombres correctos de los esquemas
-from app.schemas.session_schemas import EventSessionCreate, EventSessionUpdate
+from app.schemas.session_schemas import EventSessionCreate, EventSessionUpdate, SessionScheduleConflict
+from app.services import catalog_cache, registration_service
+
+# Restricción de exclusión de PostgreSQL (ver la migración `ccc103a40bcf`)
+NO_OVERLAP_CONSTRAINT = "ex_event_sessions_no_overlap"
 
 class SessionConflictError(Exception):
     """Excepción para cuando hay un conflicto de horarios."""
     pass
 
-def _check_schedule_conflict(db: Session, event: Event, new_session_time: datetime, new_session_duration_minutes: int, exclude_session_id: int = None):
+class ScheduleConflictsError(SessionConflictError):
+    """Conflictos de horario de una creación por lotes; `conflicts` los lista todos."""
+    def __init__(self, conflicts: List[SessionScheduleConflict]):
+        super().__init__(f"{len(conflicts)} solapamiento(s) de horario en el lote de sesiones.")
+        self.conflicts = conflicts
+
+def _session_duration(event: Event, duration_minutes: Optional[int]) -> int:
+    """Duración de la sesión: la indicada, la del evento o la predeterminada."""
+    return duration_minutes or event.duration_minutes or DEFAULT_SESSION_MINUTES
+
+def _lock_event(db: Session, event_id: int) -> None:
+    """Serializa los cambios de horario de un evento hasta el commit."""
+    db.execute(select(Event.id).where(Event.id == event_id).with_for_update())
+
+def _check_schedule_conflict(db: Session, event_id: int, start: datetime, end: datetime, exclude_session_id: int = None):
     """
-    Lógica de negocio para validar conflictos de horarios.
-    Esto es una responsabilidad del servicio porque necesita conocer
-    todas las demás sesiones del evento.
+    Valida que el intervalo [start, end) no se solape con otra sesión activa
+    del evento.
+
+    Las sesiones de un evento no se solapan entre sí, así que ordenadas por
+    inicio también lo están por fin: basta con comparar con la última que
+    empieza antes de `end`, una sola búsqueda en `ix_event_sessions_event_schedule`
+    en vez de recorrer todas las sesiones. La fila del evento se bloquea para
+    que dos altas concurrentes no validen a la vez; en PostgreSQL la
+    restricción `ex_event_sessions_no_overlap` garantiza además el invariante.
     """
-    end_new_session = new_session_time + timedelta(minutes=new_session_duration_minutes)
-    
-    query = select(EventSession).where(EventSession.event_id == event.id)
+    _lock_event(db, event_id)
+
+    query = (
+        select(EventSession.id, EventSession.session_end)
+        .where(
+            EventSession.event_id == event_id,
+            EventSession.deleted_at == None,
+            EventSession.session_datetime < end,
+        )
+        .order_by(EventSession.session_datetime.desc())
+        .limit(1)
+    )
     if exclude_session_id:
         query = query.where(EventSession.id != exclude_session_id)
-        
-    existing_sessions = db.exec(query).all()
-    
-    for session in existing_sessions:
-        event_duration = event.duration_minutes or 60 # Default duration
-        end_existing_session = session.session_datetime + timedelta(minutes=event_duration)
-        # Lógica de solapamiento simple
-        if max(session.session_datetime, new_session_time) < min(end_existing_session, end_new_session):
-            raise SessionConflictError(f"La sesión se solapa con otra sesión existente: {session.id}")
 
+    previous = db.execute(query).first()
+    if previous and previous.session_end > start:
+        raise SessionConflictError(f"La sesión se solapa con otra sesión existente: {previous.id}")
+
+def _commit_schedule(db: Session) -> None:
+    """
+    Confirma un alta o cambio de horario. Si una petición concurrente ocupó
+    el hueco, la restricción de exclusión de PostgreSQL lo rechaza.
+    """
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        if NO_OVERLAP_CONSTRAINT in str(e.orig):
+            raise SessionConflictError("La sesión se solapa con otra sesión existente.")
+        raise
+
+
+def _adjust_event_capacity(db: Session, event_id: int, delta: int):
+    """
+    Mantiene `Event.max_capacity` como la suma de las capacidades de sus
+    sesiones activas. Es un UPDATE incremental, así que no hace falta cargar
+    las demás sesiones y es seguro ante cambios concurrentes. También
+    avanza `updated_at`, que versiona el catálogo (ver `event_service.get_catalog_version`).
+    La transacción debe ser confirmada (commit) por el llamador.
+    """
+    if delta:
+        db.execute(
+            update(Event)
+            .where(Event.id == event_id)
+            .values(max_capacity=func.coalesce(Event.max_capacity, 0) + delta, updated_at=datetime.utcnow())
+        )
+
+def load_attendee_counts(db: Session, sessions: Iterable[EventSession]) -> None:
+    """
+    Precarga el número de asistentes confirmados de las sesiones con el
+    inventario en memoria, con una sola consulta agregada. Las demás usan
+    `current_attendees` y no necesitan consulta (ver `EventSession.attendee_count`).
+    """
+    inventory_sessions = {session.id: session for session in sessions if session.seat_inventory_enabled}
+    if not inventory_sessions:
+        return
+    counts = dict(
+        db.execute(
+            select(Attendance.session_id, func.count())
+            .where(
+                Attendance.session_id.in_(inventory_sessions),
+                Attendance.status == AttendanceStatus.CONFIRMED,
+            )
+            .group_by(Attendance.session_id)
+        ).all()
+    )
+    for session_id, session in inventory_sessions.items():
+        session._confirmed_attendees = counts.get(session_id, 0)
 
 # CORRECCIÓN: Se usa el type hint EventSessionCreate
 def add_session_to_event(db: Session, session_data: EventSessionCreate, event: Event) -> EventSession:
     """
     Añade una nueva sesión a un evento.
     """
-    _check_schedule_conflict(db, event, session_data.session_datetime, event.duration_minutes or 60)
+    duration = _session_duration(event, session_data.duration_minutes)
+    start = session_data.session_datetime
+    _check_schedule_conflict(db, event.id, start, start + timedelta(minutes=duration))
     
-    new_session = EventSession.model_validate(session_data, update={"event_id": event.id})
+    new_session = EventSession.model_validate(
+        session_data, update={"event_id": event.id, "duration_minutes": duration}
+    )
     db.add(new_session)
-    db.commit()
+    _adjust_event_capacity(db, event.id, new_session.max_capacity)
+    _commit_schedule(db)
     db.refresh(new_session)
+    load_attendee_counts(db, [new_session])
+    # El catálogo muestra la capacidad total del evento
+    catalog_cache.invalidate_event(event.id)
     return new_session
 
+# Intervalo [inicio, fin) en el barrido: (inicio, fin, posición en el lote, id de sesión existente)
+_Interval = Tuple[datetime, datetime, Optional[int], Optional[int]]
+
+def _find_schedule_conflicts(intervals: Sequence[_Interval]) -> List[SessionScheduleConflict]:
+    """
+    Encuentra todos los pares de intervalos solapados con un solo barrido por
+    orden de inicio, O(n log n + conflictos): un montículo guarda los
+    intervalos aún abiertos, y cada intervalo se solapa exactamente con
+    los que siguen abiertos cuando empieza. Los solapamientos entre dos
+    sesiones existentes no se reportan.
+    """
+    conflicts = []
+    open_intervals: List[Tuple[datetime, int, _Interval]] = []
+    for seq, interval in enumerate(sorted(intervals, key=lambda it: (it[0], it[1]))):
+        while open_intervals and open_intervals[0][0] <= interval[0]:
+            heapq.heappop(open_intervals)
+        for _, _, other in open_intervals:
+            if interval[2] is not None:
+                batch_side, other_side = interval, other
+            elif other[2] is not None:
+                batch_side, other_side = other, interval
+            else:
+                continue
+            conflicts.append(SessionScheduleConflict(
+                index=batch_side[2], conflicting_index=other_side[2], conflicting_session_id=other_side[3]
+            ))
+        heapq.heappush(open_intervals, (interval[1], seq, interval))
+    return sorted(conflicts, key=lambda c: (c.index, c.conflicting_session_id is not None, c.conflicting_index or 0, c.conflicting_session_id or 0))
+
+def add_sessions_to_event(db: Session, sessions_data: Sequence[EventSessionCreate], event: Event) -> List[EventSession]:
+    """
+    Crea de una vez todas las sesiones de un programa, en una transacción.
+
+    1. Lee en una consulta las sesiones existentes que caen en el rango del lote.
+    2. Valida el lote contra sí mismo y contra ellas con un único barrido
+       (ver `_find_schedule_conflicts`) y, si hay solapamientos, los reporta
+       todos con `ScheduleConflictsError` sin crear nada.
+    3. Inserta todas las sesiones con un único INSERT multi-fila.
+    """
+    new_sessions = []
+    for data in sessions_data:
+        duration = _session_duration(event, data.duration_minutes)
+        new_sessions.append(EventSession.model_validate(data, update={
+            "event_id": event.id,
+            "duration_minutes": duration,
+            "session_end": data.session_datetime + timedelta(minutes=duration),
+        }))
+
+    _lock_event(db, event.id)
+    existing = db.execute(
+        select(EventSession.id, EventSession.session_datetime, EventSession.session_end).where(
+            EventSession.event_id == event.id,
+            EventSession.deleted_at == None,
+            EventSession.session_datetime < max(s.session_end for s in new_sessions),
+            EventSession.session_end > min(s.session_datetime for s in new_sessions),
+        )
+    ).all()
+    conflicts = _find_schedule_conflicts(
+        [(s.session_datetime, s.session_end, index, None) for index, s in enumerate(new_sessions)]
+        + [(row.session_datetime, row.session_end, None, row.id) for row in existing]
+    )
+    if conflicts:
+        raise ScheduleConflictsError(conflicts)
+
+    # El INSERT en bloque no pasa por los eventos del mapper: `session_end` ya está calculado.
+    # Sin solapamientos, las horas de inicio son únicas y ordenan lo devuelto como el lote.
+    inserted = db.scalars(
+        insert(EventSession).returning(EventSession),
+        [s.model_dump(exclude={"id"}) for s in new_sessions],
+    ).all()
+    ids_by_start = {s.session_datetime: s.id for s in inserted}
+    ids = [ids_by_start[s.session_datetime] for s in new_sessions]
+    _adjust_event_capacity(db, event.id, sum(s.max_capacity for s in new_sessions))
+    _commit_schedule(db)
+
+    # Recarga con una sola consulta las sesiones expiradas por el commit
+    loaded = {s.id: s for s in db.execute(select(EventSession).where(EventSession.id.in_(ids))).scalars()}
+    created = [loaded[session_id] for session_id in ids]
+    load_attendee_counts(db, created)
+    catalog_cache.invalidate_event(event.id)
+    return created
+
 # CORRECCIÓN: Se usa el type hint EventSessionUpdate
 def update_session_details(db: Session, session: EventSession, session_update_data: EventSessionUpdate) -> EventSession:
     """
     Actualiza una sesión, verificando conflictos.
     """
     update_data = session_update_data.model_dump(exclude_unset=True)
+    if update_data.get('duration_minutes') is None:
+        update_data.pop('duration_minutes', None)
     
-    # Si se actualiza la fecha, hay que verificar conflictos
-    if 'session_datetime' in update_data:
+    # Si cambia el horario, hay que verificar conflictos
+    if 'session_datetime' in update_data or 'duration_minutes' in update_data:
+        start = update_data.get('session_datetime', session.session_datetime)
+        duration = update_data.get('duration_minutes', session.duration_minutes)
         _check_schedule_conflict(
             db,
-            session.event, 
-            update_data['session_datetime'], 
-            session.event.duration_minutes or 60,
+            session.event_id,
+            start,
+            start + timedelta(minutes=duration),
             exclude_session_id=session.id
         )
 
+    added_seats = 0
+    if 'max_capacity' in update_data and not session.is_soft_deleted:
+        added_seats = update_data['max_capacity'] - session.max_capacity
+        _adjust_event_capacity(db, session.event_id, added_seats)
+
     for key, value in update_data.items():
         setattr(session, key, value)
     
     db.add(session)
-    db.commit()
+    # Las plazas nuevas pasan primero a la lista de espera, en la misma transacción
+    if added_seats > 0:
+        registration_service.promote_for_capacity_increase(db, session.id, session.max_capacity, added_seats)
+    _commit_schedule(db)
     db.refresh(session)
-    return session
\ No newline at end of file
+    # Activar el inventario cambia de dónde sale el número de asistentes
+    load_attendee_counts(db, [session])
+    if 'max_capacity' in update_data:
+        catalog_cache.invalidate_event(session.event_id)
+    return session
+
+def delete_session(db: Session, session: EventSession) -> None:
+    """
+    Elimina (soft delete) una sesión y descuenta su capacidad del evento.
+    """
+    if session.is_soft_deleted:
+        return
+
+    session.soft_delete(db)
+    _adjust_event_capacity(db, session.event_id, -session.max_capacity)
+    db.commit()
+    catalog_cache.invalidate_event(session.event_id)
\ No newline at end of file
@@ -0,0 +1,112 @@
+# app/services/token_revocation.py
+
+"""
+Lista de revocación de tokens de acceso en memoria.
+
+Cada petición autenticada consulta si el `jti` de su token está revocado.
+La consulta no toca la base de datos: un filtro Bloom descarta en tiempo
+constante los tokens no revocados (la inmensa mayoría) y sólo los positivos
+se confirman contra el conjunto exacto. Las entradas caducan a la vez que el
+token; el filtro, que no admite borrados, se reconstruye al purgarlas.
+
+Este módulo sólo mantiene el estado en memoria. La persistencia y la
+sincronización entre workers (tabla `revoked_tokens`) las orquesta
+`token_service`.
+"""
+
+import hashlib
+import math
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.core.config import settings
+
+
+class BloomFilter:
+    """Filtro Bloom sobre un `bytearray`, con k posiciones por doble hashing."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RevocationList:
+    """`jti` revocados hasta su caducidad. Seguro entre hilos."""
+
+    def __init__(self, capacity: int):
+        self._initial_capacity = capacity
+        self._lock = threading.Lock()
+        self._expires: Dict[str, datetime] = {}
+        self._bloom = BloomFilter(capacity)
+        # `created_at` más reciente leído de `revoked_tokens`
+        self.last_synced_at: Optional[datetime] = None
+
+    def is_revoked(self, jti: str) -> bool:
+        if jti not in self._bloom:
+            return False
+        expires_at = self._expires.get(jti)
+        return expires_at is not None and expires_at > datetime.utcnow()
+
+    def add_many(self, entries: Iterable[Tuple[str, datetime]]) -> int:
+        """Añade las entradas (idempotente por `jti`). Devuelve cuántas eran nuevas."""
+        added = 0
+        with self._lock:
+            for jti, expires_at in entries:
+                if jti not in self._expires:
+                    added += 1
+                self._expires[jti] = expires_at
+                self._bloom.add(jti)
+            if len(self._expires) > self._bloom.capacity:
+                self._rebuild(capacity=len(self._expires) * 2)
+        return added
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        self.add_many([(jti, expires_at)])
+
+    def purge_expired(self) -> int:
+        """Elimina las entradas caducadas y reconstruye el filtro. Devuelve cuántas se eliminaron."""
+        now = datetime.utcnow()
+        with self._lock:
+            expired = [jti for jti, expires_at in self._expires.items() if expires_at <= now]
+            if not expired:
+                return 0
+            for jti in expired:
+                del self._expires[jti]
+            self._rebuild(capacity=max(self._initial_capacity, len(self._expires) * 2))
+            return len(expired)
+
+    def _rebuild(self, capacity: int) -> None:
+        bloom = BloomFilter(capacity)
+        for jti in self._expires:
+            bloom.add(jti)
+        # Se sustituye de golpe: las lecturas concurrentes ven el filtro viejo o el nuevo
+        self._bloom = bloom
+
+    def reset(self) -> None:
+        with self._lock:
+            self._expires.clear()
+            self._bloom = BloomFilter(self._initial_capacity)
+            self.last_synced_at = None
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+
+revocation_list = RevocationList(settings.TOKEN_REVOCATION_BLOOM_CAPACITY)
@@ -0,0 +1,192 @@
+# app/services/token_service.py
+
+"""
+Tokens de refresco.
+
+El login entrega un token de acceso de vida corta y un token de refresco
+opaco. `/auth/refresh` canjea el token de refresco por un token de acceso
+nuevo sin pasar por bcrypt, y rota el token de refresco: el usado queda
+revocado y se entrega otro de la misma familia. Si se presenta un token ya
+rotado (posible robo), se revoca toda la familia.
+
+También registra la revocación de tokens de acceso (logout) y sincroniza la
+lista de revocación en memoria de cada worker (`token_revocation`).
+"""
+
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlmodel import select
+
+from app.core.config import settings
+from app.models.refresh_token import RefreshToken
+from app.models.revoked_token import RevokedToken
+from app.models.user import User
+from app.services import token_revocation
+
+class InvalidRefreshTokenError(Exception):
+    """El token de refresco no existe, ha caducado o fue revocado."""
+    pass
+
+class RefreshTokenReuseError(InvalidRefreshTokenError):
+    """Se reutilizó un token ya rotado; la familia completa queda revocada."""
+    pass
+
+def _hash_token(raw_token: str) -> str:
+    # El token tiene 384 bits de entropía: basta un hash rápido, no bcrypt.
+    return hashlib.sha256(raw_token.encode()).hexdigest()
+
+def _new_token(db: Session, user_id: int, family_id: str) -> str:
+    raw_token = secrets.token_urlsafe(48)
+    db.add(RefreshToken(
+        user_id=user_id,
+        token_hash=_hash_token(raw_token),
+        family_id=family_id,
+        expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    return raw_token
+
+def issue_refresh_token(db: Session, user: User) -> str:
+    """Crea un token de refresco de una familia nueva (un dispositivo/login)."""
+    raw_token = _new_token(db, user.id, uuid.uuid4().hex)
+    db.commit()
+    return raw_token
+
+def revoke_family(db: Session, family_id: str) -> None:
+    db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at == None)
+        .values(revoked_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
+def _find(db: Session, raw_token: str) -> Optional[Tuple[RefreshToken, User]]:
+    return db.execute(
+        select(RefreshToken, User)
+        .join(User, User.id == RefreshToken.user_id)
+        .where(RefreshToken.token_hash == _hash_token(raw_token))
+    ).first()
+
+def rotate_refresh_token(db: Session, raw_token: str) -> Tuple[User, str]:
+    """
+    Canjea un token de refresco: lo revoca y devuelve el usuario y un token
+    nuevo de la misma familia. La revocación es un UPDATE condicional, así que
+    de dos canjes simultáneos del mismo token sólo uno tiene éxito; el otro se
+    trata como reutilización.
+    """
+    row = _find(db, raw_token)
+    if row is None:
+        raise InvalidRefreshTokenError("Invalid refresh token")
+    token, user = row
+
+    if token.revoked_at is not None:
+        revoke_family(db, token.family_id)
+        db.commit()
+        raise RefreshTokenReuseError("Refresh token reuse detected")
+    if token.expires_at <= datetime.utcnow() or not user.is_active:
+        raise InvalidRefreshTokenError("Invalid refresh token")
+
+    rotated = db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == token.id, RefreshToken.revoked_at == None)
+        .values(revoked_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    if rotated.rowcount != 1:
+        revoke_family(db, token.family_id)
+        db.commit()
+        raise RefreshTokenReuseError("Refresh token reuse detected")
+
+    new_token = _new_token(db, user.id, token.family_id)
+    db.commit()
+    return user, new_token
+
+def revoke_refresh_token(db: Session, raw_token: str) -> None:
+    """Cierra la sesión del dispositivo: revoca la familia del token. Es idempotente."""
+    row = _find(db, raw_token)
+    if row is None:
+        return
+    revoke_family(db, row[0].family_id)
+    db.commit()
+
+# --- Revocación de tokens de acceso ---
+
+def _insert_revocation(db: Session, jti: str, expires_at: datetime) -> None:
+    """Inserta la revocación; si otra petición ya registró el mismo `jti`, no hace nada."""
+    now = datetime.utcnow()
+    values = dict(jti=jti, expires_at=expires_at, created_at=now, updated_at=now)
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        db.execute(pg_insert(RevokedToken).values(values).on_conflict_do_nothing(index_elements=["jti"]))
+    elif dialect == "sqlite":
+        db.execute(sqlite_insert(RevokedToken).values(values).on_conflict_do_nothing(index_elements=["jti"]))
+    else:
+        try:
+            with db.begin_nested():
+                db.execute(insert(RevokedToken).values(values))
+        except IntegrityError:
+            pass
+
+def revoke_access_token(db: Session, claims: dict) -> None:
+    """
+    Revoca un token de acceso por su `jti` hasta su caducidad. Se aplica al
+    instante en este worker; los demás lo leen de `revoked_tokens` en su
+    próxima sincronización. Los tokens sin `jti` no se pueden revocar. Es
+    idempotente, también ante dos logouts simultáneos con el mismo token.
+    """
+    jti = claims.get("jti")
+    if not jti:
+        return
+    expires_at = datetime.utcfromtimestamp(claims["exp"])
+    _insert_revocation(db, jti, expires_at)
+    db.commit()
+    token_revocation.revocation_list.add(jti, expires_at)
+
+def sync_revocations(db: Session) -> int:
+    """
+    Incorpora a la lista en memoria las revocaciones registradas por otros
+    workers desde la última sincronización. La lectura es incremental por
+    `created_at` pero relee un margen por debajo de la última marca: una
+    transacción puede confirmar después de otra con `created_at` posterior, y
+    un corte exacto la perdería. Releer es inocuo porque la lista es
+    idempotente por `jti`. Devuelve el número de entradas nuevas.
+    """
+    revocations = token_revocation.revocation_list
+    last_synced_at = revocations.last_synced_at
+    query = select(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.created_at).where(
+        RevokedToken.expires_at > datetime.utcnow()
+    )
+    if last_synced_at is not None:
+        overlap = timedelta(seconds=settings.TOKEN_REVOCATION_SYNC_OVERLAP_SECONDS)
+        query = query.where(RevokedToken.created_at > last_synced_at - overlap)
+    rows = db.execute(query).all()
+    if not rows:
+        return 0
+    added = revocations.add_many((row.jti, row.expires_at) for row in rows)
+    newest = max(row.created_at for row in rows)
+    if last_synced_at is None or newest > last_synced_at:
+        revocations.last_synced_at = newest
+    return added
+
+def purge_revoked_tokens(db: Session) -> int:
+    """
+    Olvida las revocaciones de tokens ya caducados, en memoria y en la base
+    de datos. Las entradas caducadas no afectan a las consultas, así que
+    basta con hacerlo de vez en cuando.
+    """
+    token_revocation.revocation_list.purge_expired()
+    result = db.execute(
+        delete(RevokedToken)
+        .where(RevokedToken.expires_at <= datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
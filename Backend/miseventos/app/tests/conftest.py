@@ -10,7 +10,9 @@ from sqlmodel import SQLModel
 from app.main import app # Importa tu aplicación FastAPI
 from app.core.config import settings
 from app.dependencies import get_db
-from app.models import User # Importa tus modelos
+from datetime import datetime
+from app.models import User, Event, EventSession # Importa tus modelos
+from app.utils.enums import EventCategory, EventStatus
 from app.services import auth_service
 from app.schemas import user_schemas
 
@@ -94,3 +96,63 @@ def authenticated_client(client, test_user) -> TestClient:
     # Añade la cabecera de autorización para todas las peticiones futuras con este cliente
     client.headers["Authorization"] = f"Bearer {token}"
     return client
+
+
+@pytest.fixture(scope="function")
+def make_user(db_session):
+    """
+    Fábrica de usuarios para pruebas de servicios.
+    Guarda un hash ficticio para no pagar el coste de bcrypt en cada usuario.
+    """
+    counter = {"n": 0}
+
+    def _make_user(**kwargs) -> User:
+        counter["n"] += 1
+        user = User(
+            name=kwargs.pop("name", f"User {counter['n']}"),
+            email=kwargs.pop("email", f"user{counter['n']}@example.com"),
+            password_hash=kwargs.pop("password_hash", "not-a-real-hash"),
+            **kwargs,
+        )
+        db_session.add(user)
+        db_session.commit()
+        db_session.refresh(user)
+        return user
+
+    return _make_user
+
+
+@pytest.fixture(scope="function")
+def make_session(db_session, make_user):
+    """
+    Fábrica de sesiones: crea un evento publicado con una sesión de la
+    capacidad indicada.
+    """
+    def _make_session(max_capacity: int = 10, **kwargs) -> EventSession:
+        organizer = make_user()
+        event = Event(
+            name="Evento de prueba",
+            general_location="Online",
+            category=EventCategory.CONFERENCE,
+            description="Evento creado por la fábrica de pruebas.",
+            status=EventStatus.PUBLISHED,
+            start_date=datetime(2030, 1, 1, 9, 0),
+            end_date=datetime(2030, 1, 1, 18, 0),
+            creator_id=organizer.id,
+        )
+        db_session.add(event)
+        db_session.commit()
+        session = EventSession(
+            event_id=event.id,
+            presenter=kwargs.pop("presenter", "Ponente"),
+            session_datetime=kwargs.pop("session_datetime", datetime(2030, 1, 1, 10, 0)),
+            specific_location=kwargs.pop("specific_location", "Sala 1"),
+            max_capacity=max_capacity,
+            **kwargs,
+        )
+        db_session.add(session)
+        db_session.commit()
+        db_session.refresh(session)
+        return session
+
+    return _make_session
@@ -0,0 +1,135 @@
+# tests/test_services/test_async_services.py
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from app.core.config import settings
+from app.schemas import user_schemas, event_schemas, session_schemas
+from app.services import async_auth_service, async_event_service, async_registration_service, async_session_service, seat_inventory
+from app.utils.enums import AttendanceStatus, EventCategory, SessionStatus
+
+# Base de datos propia para no interferir con la del resto de pruebas (síncronas).
+ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./test_async.db"
+
+@pytest_asyncio.fixture
+async def async_db() -> AsyncSession:
+    """
+    Sesión asíncrona sobre una base de datos SQLite creada para cada prueba.
+    """
+    engine = create_async_engine(ASYNC_DATABASE_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+        yield db
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+    await engine.dispose()
+
+@pytest.mark.asyncio
+async def test_async_register_and_authenticate(async_db: AsyncSession):
+    """
+    Registro y login con la variante asíncrona del servicio de autenticación.
+    """
+    user_in = user_schemas.UserCreate(name="Async User", email="async@example.com", password="async_password")
+    created = await async_auth_service.register_new_user(db=async_db, user_data=user_in)
+    assert created.id is not None
+
+    with pytest.raises(async_auth_service.EmailAlreadyExistsError):
+        await async_auth_service.register_new_user(db=async_db, user_data=user_in)
+
+    assert await async_auth_service.authenticate_user(db=async_db, email=user_in.email, password="wrong") is None
+    user = await async_auth_service.authenticate_user(db=async_db, email=user_in.email, password="async_password")
+    assert user.last_login is not None
+
+@pytest.mark.asyncio
+async def test_async_event_and_registration_flow(async_db: AsyncSession):
+    """
+    Crea un evento con una sesión y registra a un usuario usando los servicios asíncronos.
+    """
+    organizer = await async_auth_service.register_new_user(
+        db=async_db,
+        user_data=user_schemas.UserCreate(name="Organizer", email="org@example.com", password="org_password"),
+    )
+    event = await async_event_service.create_event(
+        db=async_db,
+        event_data=event_schemas.EventCreate(
+            name="Evento asíncrono",
+            general_location="Online",
+            category=EventCategory.MEETUP,
+            description="Evento creado desde la variante asíncrona.",
+            start_date="2030-01-01T09:00:00",
+            end_date="2030-01-01T18:00:00",
+        ),
+        creator=organizer,
+    )
+    session = await async_session_service.add_session_to_event(
+        db=async_db,
+        session_data=session_schemas.EventSessionCreate(
+            presenter="Ponente",
+            session_datetime="2030-01-01T10:00:00",
+            specific_location="Sala 1",
+            max_capacity=5,
+        ),
+        event=event,
+    )
+
+    attendance = await async_registration_service.register_user_for_session(db=async_db, user=organizer, session=session)
+    assert attendance.status == AttendanceStatus.CONFIRMED
+
+    loaded = await async_event_service.get_event_with_sessions(db=async_db, event_id=event.id)
+    detail = event_schemas.EventReadWithSessions.model_validate(loaded)
+    assert detail.total_capacity == 5
+    assert detail.sessions[0].attendee_count == 1
+
+@pytest.mark.asyncio
+async def test_async_concurrent_registrations_on_inventory_session(async_db: AsyncSession, monkeypatch):
+    """
+    Dos registros simultáneos en una sesión con inventario no interbloquean
+    el bucle de eventos: la variante asíncrona no toma los locks del inventario.
+    """
+    monkeypatch.setattr(settings, "SEAT_INVENTORY_ENABLED", True)
+    seat_inventory.inventory.reset()
+    users = [
+        await async_auth_service.register_new_user(
+            db=async_db,
+            user_data=user_schemas.UserCreate(name=f"User {i}", email=f"user{i}@example.com", password="user_password"),
+        )
+        for i in range(2)
+    ]
+    event = await async_event_service.create_event(
+        db=async_db,
+        event_data=event_schemas.EventCreate(
+            name="Venta", general_location="Online", category=EventCategory.MEETUP,
+            description="Sesión con inventario en memoria.",
+            start_date="2030-01-01T09:00:00", end_date="2030-01-01T18:00:00",
+        ),
+        creator=users[0],
+    )
+    session = await async_session_service.add_session_to_event(
+        db=async_db,
+        session_data=session_schemas.EventSessionCreate(
+            presenter="Ponente", session_datetime="2030-01-01T10:00:00", specific_location="Sala 1",
+            max_capacity=5, seat_inventory_enabled=True,
+        ),
+        event=event,
+    )
+    session.status = SessionStatus.SALE
+    await async_db.commit()
+    assert seat_inventory.is_enabled_for(session)
+
+    # Cada petición tiene su propia sesión de base de datos, como en la aplicación
+    make_session = async_sessionmaker(async_db.bind, expire_on_commit=False)
+
+    async def register(user):
+        async with make_session() as db:
+            return await async_registration_service.register_user_for_session(db=db, user=user, session=session)
+
+    attendances = await asyncio.wait_for(asyncio.gather(*(register(user) for user in users)), timeout=10)
+
+    assert all(a.id is not None and a.status == AttendanceStatus.CONFIRMED for a in attendances)
+    assert seat_inventory.inventory.loaded_sessions() == []
+    seat_inventory.inventory.reset()
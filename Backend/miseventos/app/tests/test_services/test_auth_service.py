@@ -5,6 +5,10 @@ from sqlalchemy.orm import Session
 from app.services import auth_service
 from app.schemas import user_schemas
 from app.models import User
+from app.core import security
+from app.services import last_login_buffer
+from datetime import datetime
+from passlib.context import CryptContext
 
 def test_register_new_user(db_session: Session):
     """
@@ -85,3 +89,70 @@ def test_authenticate_user_wrong_password(db_session: Session):
     )
     
     assert authenticated_user is None
+
+def test_login_rehashes_password_with_outdated_cost(db_session: Session):
+    """
+    Si el hash se creó con otro coste de bcrypt, el login lo rehace con la
+    configuración actual.
+    """
+    user_in = user_schemas.UserCreate(name="Old Hash", email="old.hash@example.com", password="old_password")
+    user = auth_service.register_new_user(db=db_session, user_data=user_in)
+    user.password_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("old_password")
+    db_session.commit()
+
+    authenticated_user = auth_service.authenticate_user(db=db_session, email=user_in.email, password="old_password")
+
+    assert authenticated_user.last_login is not None
+    # `authenticate_user` desasocia el usuario de la sesión; se vuelve a leer
+    stored = db_session.get(User, user.id)
+    assert not security.password_context.needs_update(stored.password_hash)
+    assert security.verify_password("old_password", stored.password_hash)
+
+def test_password_hasher_rejects_when_saturated():
+    hasher = security.PasswordHasher(workers=1, max_pending=1, queue_timeout=0.01)
+    try:
+        assert security.password_context.verify("pw", hasher.run(security._hash_in_worker, "pw"))
+
+        hasher._slots.acquire()
+        with pytest.raises(security.PasswordHasherBusyError) as excinfo:
+            hasher.run(security._hash_in_worker, "pw")
+        assert excinfo.value.retry_after == 1
+        hasher._slots.release()
+    finally:
+        hasher.shutdown()
+
+def test_last_login_is_written_behind_in_bulk(db_session: Session, make_user):
+    """
+    El login no escribe `last_login`; se acumula en memoria y se guarda en
+    lote, sin retrasar un valor más reciente.
+    """
+    last_login_buffer.buffer.drain()
+    first, second = make_user(), make_user()
+    newer = datetime(2031, 1, 1)
+    second.last_login = newer
+    db_session.commit()
+
+    last_login_buffer.buffer.record(first.id, datetime(2030, 1, 1, 10))
+    last_login_buffer.buffer.record(first.id, datetime(2030, 1, 1, 9))
+    last_login_buffer.buffer.record(second.id, datetime(2030, 1, 1, 10))
+
+    assert auth_service.flush_last_logins(db_session) == 2
+    assert len(last_login_buffer.buffer) == 0
+    db_session.refresh(first)
+    db_session.refresh(second)
+    assert first.last_login == datetime(2030, 1, 1, 10)
+    assert second.last_login == newer
+
+def test_failed_last_login_flush_is_requeued(db_session: Session, make_user, monkeypatch):
+    last_login_buffer.buffer.drain()
+    user = make_user()
+    last_login_buffer.buffer.record(user.id, datetime(2030, 1, 1))
+
+    def failing_execute(*args, **kwargs):
+        raise RuntimeError("database unavailable")
+    monkeypatch.setattr(db_session, "execute", failing_execute)
+    monkeypatch.setattr(db_session, "rollback", lambda: None)
+
+    with pytest.raises(RuntimeError):
+        auth_service.flush_last_logins(db_session)
+    assert last_login_buffer.buffer.drain() == {user.id: datetime(2030, 1, 1)}
@@ -0,0 +1,90 @@
+# tests/test_services/test_cache.py
+
+from app.core.cache import StaleWhileRevalidateCache, TTLCache
+from app.services.event_service import EventFilters, _count_cache_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expires_and_counts_hits():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=5, clock=clock)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    clock.now = 6
+    assert cache.get("a") is None
+    assert cache.stats() == {"size": 0, "hits": 1, "misses": 1}
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_invalidate_where():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set(("user", 1), "x")
+    cache.set(("user", 2), "y")
+    cache.invalidate_where(lambda key: key == ("user", 1))
+
+    assert cache.get(("user", 1)) is None
+    assert cache.get(("user", 2)) == "y"
+
+
+def test_stale_while_revalidate_refreshes_once():
+    clock = FakeClock()
+    cache = StaleWhileRevalidateCache(maxsize=10, ttl=5, stale_ttl=10, clock=clock)
+
+    assert cache.lookup("k") == (None, True)
+    cache.store("k", "v1")
+    assert cache.lookup("k") == ("v1", False)
+
+    clock.now = 6
+    # Sólo la primera petición tras caducar recalcula; las demás reciben el valor rancio
+    assert cache.lookup("k") == ("v1", True)
+    assert cache.lookup("k") == ("v1", False)
+    cache.store("k", "v2")
+    assert cache.lookup("k") == ("v2", False)
+
+    clock.now = 30
+    assert cache.lookup("k") == (None, True)
+
+
+def test_stale_while_revalidate_invalidation():
+    cache = StaleWhileRevalidateCache(maxsize=10, ttl=60, stale_ttl=60)
+    cache.store("a", 1, tags=[1])
+    cache.store("b", 2, tags=[2])
+
+    cache.invalidate_tags([1])
+    assert cache.lookup("a") == (1, True)
+    assert cache.lookup("b") == (2, False)
+
+    # Un valor calculado antes de una invalidación se guarda ya rancio
+    generation = cache.generation
+    cache.invalidate_where(lambda key: key == "b")
+    cache.store("a", 10, generation=generation)
+    assert cache.lookup("a") == (10, True)
+
+    cache.abandon("a")
+    assert cache.lookup("a") == (10, True)
+
+
+def test_count_cache_key_keeps_search_syntax():
+    filters = EventFilters()
+    assert _count_cache_key("  Jazz   Rock ", filters, False) == _count_cache_key("jazz rock", filters, False)
+    assert _count_cache_key("jazz -rock", filters, False) != _count_cache_key("jazz rock", filters, False)
+    assert _count_cache_key('"jazz rock"', filters, False) != _count_cache_key("jazz rock", filters, False)
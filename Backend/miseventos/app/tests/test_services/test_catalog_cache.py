@@ -0,0 +1,125 @@
+# tests/test_services/test_catalog_cache.py
+
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import Request
+from sqlalchemy.orm import Session
+
+from app.models import Event
+from app.schemas.event_schemas import EventCreate, EventListResponse, EventUpdate
+from app.services import catalog_cache, event_service
+from app.utils.enums import EventCategory, EventStatus
+
+
+def _request(headers=None) -> Request:
+    raw = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/events", "headers": raw})
+
+
+def _publish(db: Session, user, name: str, day: int) -> Event:
+    event = event_service.create_event(db, EventCreate(
+        name=name, general_location="Lugar", category=EventCategory.CONFERENCE, description="Descripción",
+        start_date=datetime(2031, 5, day, 9, 0), end_date=datetime(2031, 5, day, 18, 0),
+    ), user)
+    event.status = EventStatus.PUBLISHED
+    db.commit()
+    return event
+
+
+def _serve_list(db: Session, request=None, calls=None):
+    def build():
+        if calls is not None:
+            calls.append(1)
+        result = event_service.get_events_paginated(db, limit=50)
+        return result, [event.id for event in result.events]
+
+    key = catalog_cache.list_key(1, 50, None, None, False, True, False)
+    return catalog_cache.serve(
+        request or _request(), key, EventListResponse, lambda: event_service.get_catalog_version(db), build
+    )
+
+
+@pytest.fixture(autouse=True)
+def _clear_catalog_cache():
+    catalog_cache.cache.clear()
+    yield
+    catalog_cache.cache.clear()
+
+
+def test_catalog_is_served_from_cache_with_validators(db_session: Session, make_user):
+    """La segunda petición no recalcula y un If-None-Match válido recibe 304."""
+    _publish(db_session, make_user(), "Evento cacheado", 1)
+    calls = []
+
+    first = _serve_list(db_session, calls=calls)
+    second = _serve_list(db_session, calls=calls)
+
+    assert calls == [1]
+    assert first.body == second.body
+    assert "Evento cacheado" in [e["name"] for e in json.loads(first.body)["events"]]
+    not_modified = _serve_list(db_session, _request({"If-None-Match": first.headers["etag"]}), calls)
+    assert not_modified.status_code == 304
+
+
+def test_writes_invalidate_only_affected_entries(db_session: Session, make_user):
+    user = make_user()
+    event = _publish(db_session, user, "Concierto de jazz", 2)
+    other = _publish(db_session, user, "Taller de cerámica", 3)
+    _serve_list(db_session)
+    catalog_cache.cache.store(catalog_cache.search_key("jazz", 20), "jazz", tags=[event.id])
+    catalog_cache.cache.store(catalog_cache.search_key("cerámica", 20), "ceramica", tags=[other.id])
+
+    def stale():
+        return {key[0] + ":" + str(key[1]) for key in list(catalog_cache.cache._data) if catalog_cache.cache.lookup(key)[1]}
+
+    # Un cambio que no afecta al orden ni al texto sólo invalida las entradas que contienen el evento
+    event_service.update_event_details(db_session, event, EventUpdate(image_url="https://example.com/jazz.png"))
+    assert stale() == {"list:None", "search:jazz"}
+
+    catalog_cache.cache.clear()
+    _serve_list(db_session)
+    catalog_cache.cache.store(catalog_cache.search_key("jazz", 20), "jazz", tags=[event.id])
+    catalog_cache.cache.store(catalog_cache.search_key("cerámica", 20), "ceramica", tags=[other.id])
+
+    # Un borrado desplaza los listados, pero no cambia búsquedas que no lo contenían
+    event_service.delete_event(db_session, event)
+    assert stale() == {"list:None", "search:jazz"}
+
+    # Un borrador nuevo no aparece en el catálogo
+    catalog_cache.cache.clear()
+    _serve_list(db_session)
+    event_service.create_event(db_session, EventCreate(
+        name="Borrador", general_location="Lugar", category=EventCategory.OTHER, description="Descripción",
+        start_date=datetime(2031, 5, 4, 9, 0), end_date=datetime(2031, 5, 4, 18, 0),
+    ), user)
+    assert stale() == set()
+
+
+def test_filter_changes_invalidate_filtered_lists(db_session: Session, make_user):
+    """
+    Un cambio de categoría puede meter el evento en un listado filtrado que no
+    lo contenía: se invalidan los listados filtrados, no los demás.
+    """
+    user = make_user()
+    event = _publish(db_session, user, "Concierto de jazz", 2)
+    _serve_list(db_session)
+    workshops = event_service.EventFilters(category=EventCategory.WORKSHOP)
+    catalog_cache.cache.store(
+        catalog_cache.list_key(1, 10, None, None, False, True, False, workshops), "workshops", tags=[]
+    )
+
+    def stale():
+        return {key[2] for key in list(catalog_cache.cache._data) if catalog_cache.cache.lookup(key)[1]}
+
+    event_service.update_event_details(db_session, event, EventUpdate(description="Otra descripción"))
+    assert stale() == {None}
+
+    catalog_cache.cache.clear()
+    _serve_list(db_session)
+    catalog_cache.cache.store(
+        catalog_cache.list_key(1, 10, None, None, False, True, False, workshops), "workshops", tags=[]
+    )
+    event_service.update_event_details(db_session, event, EventUpdate(category=EventCategory.WORKSHOP))
+    assert stale() == {None, workshops}
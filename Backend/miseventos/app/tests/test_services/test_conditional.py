@@ -0,0 +1,46 @@
+# tests/test_services/test_conditional.py
+
+from datetime import datetime
+
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from app.core import conditional
+from app.core.conditional import ResourceVersion
+
+
+def _client(version: ResourceVersion) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/resource")
+    def resource(request: Request, response: Response):
+        if conditional.is_not_modified(request, version):
+            return conditional.not_modified(version)
+        conditional.set_validators(response, version)
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_etag_depends_on_every_part():
+    modified = datetime(2030, 1, 1, 12, 0, 0, 500)
+    assert ResourceVersion.from_parts(modified, 1) == ResourceVersion.from_parts(modified, 1)
+    assert ResourceVersion.from_parts(modified, 1).etag != ResourceVersion.from_parts(modified, 2).etag
+
+
+def test_conditional_get_returns_304():
+    version = ResourceVersion.from_parts(datetime(2030, 1, 1, 12, 0, 0, 500))
+    client = _client(version)
+
+    first = client.get("/resource")
+    assert first.status_code == 200
+    assert first.headers["etag"] == version.etag
+    assert first.headers["last-modified"] == "Tue, 01 Jan 2030 12:00:00 GMT"
+
+    assert client.get("/resource", headers={"If-None-Match": version.etag}).status_code == 304
+    assert client.get("/resource", headers={"If-None-Match": f'"other", W/{version.etag}'}).status_code == 304
+    assert client.get("/resource", headers={"If-Modified-Since": first.headers["last-modified"]}).status_code == 304
+    assert client.get("/resource", headers={"If-Modified-Since": "Tue, 01 Jan 2030 11:59:59 GMT"}).status_code == 200
+    # If-None-Match tiene prioridad sobre If-Modified-Since
+    stale = {"If-None-Match": '"other"', "If-Modified-Since": first.headers["last-modified"]}
+    assert client.get("/resource", headers=stale).status_code == 200
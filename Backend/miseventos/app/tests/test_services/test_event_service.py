@@ -0,0 +1,225 @@
+# tests/test_services/test_event_service.py
+
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import inspect, update
+from sqlalchemy.orm import Session
+from app.models import Attendance, Event, EventSession
+from app.schemas.event_schemas import EventReadWithSessions
+from app.schemas.session_schemas import EventSessionCreate
+from app.services import event_service, registration_service, session_service
+from app.utils.enums import AttendanceStatus, EventCategory, EventStatus
+
+def _make_events(db: Session, user, count: int, same_start: bool = False):
+    base = datetime(2031, 3, 1, 9, 0)
+    for i in range(count):
+        start = base if same_start else base + timedelta(days=i)
+        db.add(Event(
+            name=f"Evento {i}",
+            general_location="Lugar",
+            category=EventCategory.CONFERENCE,
+            description="Descripción",
+            start_date=start,
+            end_date=start + timedelta(hours=2),
+            creator_id=user.id,
+            status=EventStatus.PUBLISHED,
+        ))
+    db.commit()
+
+@pytest.mark.parametrize("same_start", [False, True])
+def test_cursor_pagination_walks_all_events_once(db_session: Session, make_user, same_start):
+    """
+    La paginación por cursor recorre todos los eventos sin repetir ni saltar,
+    aunque compartan `start_date`.
+    """
+    _make_events(db_session, make_user(), 7, same_start=same_start)
+    expected = event_service.get_events_paginated(db_session, page=1, limit=100)
+
+    seen, cursor = [], None
+    while True:
+        page = event_service.get_events_paginated(
+            db_session, limit=3, cursor=cursor, use_cursor=True, include_total=False
+        )
+        assert page.total is None
+        seen.extend(e.id for e in page.events)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert seen == [e.id for e in expected.events]
+    assert expected.total == 7
+
+def test_invalid_cursor_is_rejected(db_session: Session):
+    with pytest.raises(event_service.InvalidCursorError):
+        event_service.get_events_paginated(db_session, cursor="not-a-cursor")
+
+def test_total_is_cached_until_events_change(db_session: Session, make_user, monkeypatch):
+    """
+    El total se cachea por filtro normalizado y se invalida al confirmar
+    escrituras de eventos.
+    """
+    user = make_user()
+    _make_events(db_session, user, 2)
+    assert event_service.get_events_paginated(db_session, search="Evento").total == 2
+
+    counts = []
+    real_execute = db_session.execute
+    def tracking_execute(statement, *args, **kwargs):
+        if "count(" in str(statement):
+            counts.append(statement)
+        return real_execute(statement, *args, **kwargs)
+    monkeypatch.setattr(db_session, "execute", tracking_execute)
+
+    assert event_service.get_events_paginated(db_session, search="  EVENTO ").total == 2
+    assert counts == []
+
+    _make_events(db_session, user, 1)
+    assert event_service.get_events_paginated(db_session, search="evento").total == 3
+    assert len(counts) == 1
+
+def test_estimated_total_falls_back_to_exact_count(db_session: Session, make_user):
+    """Sin estimación del planificador (SQLite) el modo estimado devuelve el total exacto."""
+    _make_events(db_session, make_user(), 3)
+    page = event_service.get_events_paginated(db_session, limit=2, estimate_total=True)
+    assert page.total == 3
+    assert page.total_is_estimate is False
+    assert page.total_pages == 2
+
+def test_event_detail_counts_attendees_without_loading_them(db_session: Session, make_user, make_session):
+    """
+    El detalle del evento cuenta los asistentes sin cargar `attendances`:
+    de `current_attendees` o, con inventario en memoria, de un recuento agregado.
+    """
+    session = make_session(max_capacity=3)
+    for _ in range(3):
+        registration_service.register_user_for_session(db=db_session, user=make_user(), session=session)
+    # Sesión con inventario: tiene 50 plazas reservadas en bloque, pero sólo 2 vendidas
+    inventory_session = EventSession(
+        event_id=session.event_id, presenter="Ponente", session_datetime=datetime(2030, 1, 1, 15, 0),
+        specific_location="Sala 2", max_capacity=100, current_attendees=50, seat_inventory_enabled=True,
+    )
+    db_session.add(inventory_session)
+    db_session.commit()
+    for status in (AttendanceStatus.CONFIRMED, AttendanceStatus.CONFIRMED, AttendanceStatus.CANCELLED):
+        db_session.add(Attendance(user_id=make_user().id, session_id=inventory_session.id, status=status))
+    db_session.commit()
+    db_session.expire_all()
+
+    event = event_service.get_event_with_sessions(db_session, session.event_id)
+    detail = EventReadWithSessions.model_validate(event, from_attributes=True)
+
+    counts = {s.id: (s.attendee_count, s.is_full) for s in detail.sessions}
+    assert counts == {session.id: (3, True), inventory_session.id: (2, False)}
+    assert all("attendances" in inspect(s).unloaded for s in event.sessions)
+
+def test_event_version_changes_with_sessions_and_registrations(db_session: Session, make_user, make_session):
+    """
+    La versión del detalle avanza al registrar asistentes o cambiar sesiones,
+    y la del catálogo al cambiar la capacidad del evento.
+    """
+    session = make_session(max_capacity=5)
+    version = event_service.get_event_version(db_session, session.event_id)
+    catalog = event_service.get_catalog_version(db_session)
+    assert version is not None and catalog is not None
+    assert event_service.get_event_version(db_session, session.event_id) == version
+
+    registration_service.register_user_for_session(db=db_session, user=make_user(), session=session)
+    after_registration = event_service.get_event_version(db_session, session.event_id)
+    assert after_registration.etag != version.etag
+
+    event = db_session.get(Event, session.event_id)
+    session_service.add_session_to_event(db_session, EventSessionCreate(
+        presenter="Ponente", session_datetime=datetime(2030, 1, 1, 16, 0), specific_location="Sala 2", max_capacity=5,
+    ), event)
+    assert event_service.get_event_version(db_session, session.event_id).etag != after_registration.etag
+    assert event_service.get_catalog_version(db_session).etag != catalog.etag
+
+    assert event_service.get_event_version(db_session, 999999) is None
+
+def test_filters_and_facets(db_session: Session, make_user):
+    """
+    Los filtros se aplican en la consulta, y las facetas salen de una sola
+    consulta agrupada; la de categoría ignora el filtro de categoría.
+    """
+    user = make_user()
+    specs = [
+        ("Taller A", EventCategory.WORKSHOP, "Sala Norte, Madrid", datetime(2031, 3, 5), EventStatus.PUBLISHED),
+        ("Taller B", EventCategory.WORKSHOP, "Online", datetime(2031, 4, 2), EventStatus.PUBLISHED),
+        ("Charla", EventCategory.CONFERENCE, "Auditorio, MADRID", datetime(2031, 4, 20), EventStatus.PUBLISHED),
+        ("Pasado", EventCategory.CONFERENCE, "Madrid", datetime(2031, 4, 21), EventStatus.COMPLETED),
+        ("Borrador", EventCategory.WORKSHOP, "Madrid", datetime(2031, 4, 22), EventStatus.DRAFT),
+        ("Fuera", EventCategory.MEETUP, "Madrid", datetime(2031, 6, 1), EventStatus.PUBLISHED),
+    ]
+    for name, category, location, start, status in specs:
+        db_session.add(Event(
+            name=name, general_location=location, category=category, description="Descripción",
+            start_date=start, end_date=start + timedelta(hours=2), creator_id=user.id, status=status,
+        ))
+    db_session.commit()
+
+    filters = event_service.EventFilters(
+        category=EventCategory.WORKSHOP, date_from=datetime(2031, 3, 1), date_to=datetime(2031, 5, 1)
+    )
+    result = event_service.get_events_paginated(db_session, filters=filters, include_facets=True)
+    assert [e.name for e in result.events] == ["Taller A", "Taller B"]
+    assert result.total == 2
+    assert [(f.value, f.count) for f in result.facets.categories] == [("conference", 1), ("workshop", 2)]
+    assert [(f.value, f.count) for f in result.facets.months] == [("2031-03", 1), ("2031-04", 1)]
+
+    by_location = event_service.get_events_paginated(db_session, filters=event_service.EventFilters(location="  madrid "))
+    assert [e.name for e in by_location.events] == ["Taller A", "Charla", "Fuera"]
+    completed = event_service.get_events_paginated(db_session, filters=event_service.EventFilters(status=EventStatus.COMPLETED))
+    assert [e.name for e in completed.events] == ["Pasado"]
+    # La búsqueda de texto también cubre los estados no publicados del catálogo
+    searched = event_service.get_events_paginated(
+        db_session, search="pasado", filters=event_service.EventFilters(status=EventStatus.COMPLETED)
+    )
+    assert [e.name for e in searched.events] == ["Pasado"] and searched.total == 1
+    assert event_service.get_events_paginated(db_session, search="pasado").total == 0
+    assert event_service.get_events_paginated(db_session).facets is None
+
+    with pytest.raises(event_service.InvalidFilterError):
+        event_service.get_events_paginated(db_session, filters=event_service.EventFilters(status=EventStatus.DRAFT))
+
+def test_filters_accept_mixed_timezones():
+    """Las fechas con zona se comparan y consultan en UTC sin zona, como se guardan."""
+    madrid = timezone(timedelta(hours=2))
+    filters = event_service.EventFilters(
+        date_from=datetime(2031, 4, 1, 2, 0, tzinfo=madrid), date_to=datetime(2031, 4, 1, 1, 0)
+    ).normalized()
+    assert filters.date_from == datetime(2031, 4, 1, 0, 0) and filters.date_from.tzinfo is None
+
+    with pytest.raises(event_service.InvalidFilterError):
+        event_service.EventFilters(
+            date_from=datetime(2031, 4, 1, 2, 0), date_to=datetime(2031, 4, 1, 3, 0, tzinfo=madrid)
+        ).normalized()
+
+def test_catalog_version_changes_without_newer_updated_at(db_session: Session, make_user):
+    """Altas y publicaciones cambian la versión aunque `updated_at` no supere al máximo."""
+    user = make_user()
+    start = datetime(2031, 5, 1, 9, 0)
+    latest = Event(
+        name="Reciente", general_location="Madrid", category=EventCategory.CONFERENCE, description="Descripción",
+        start_date=start, end_date=start + timedelta(hours=2), creator_id=user.id, status=EventStatus.PUBLISHED,
+    )
+    db_session.add(latest)
+    db_session.commit()
+    catalog = event_service.get_catalog_version(db_session)
+
+    skewed = Event(
+        name="Reloj atrasado", general_location="Madrid", category=EventCategory.CONFERENCE, description="Descripción",
+        start_date=start, end_date=start + timedelta(hours=2), creator_id=user.id, status=EventStatus.DRAFT,
+        created_at=latest.updated_at - timedelta(seconds=5), updated_at=latest.updated_at - timedelta(seconds=5),
+    )
+    db_session.add(skewed)
+    db_session.commit()
+    after_insert = event_service.get_catalog_version(db_session)
+    assert after_insert.last_modified == catalog.last_modified
+    assert after_insert.etag != catalog.etag
+
+    db_session.execute(
+        update(Event).where(Event.id == skewed.id)
+        .values(status=EventStatus.PUBLISHED, updated_at=latest.updated_at - timedelta(seconds=1))
+    )
+    db_session.commit()
+    assert event_service.get_catalog_version(db_session).etag != after_insert.etag
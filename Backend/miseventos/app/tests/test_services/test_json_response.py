@@ -0,0 +1,48 @@
+# tests/test_services/test_json_response.py
+
+from typing import List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.cli.bench_json import build_events
+from app.core.config import settings
+from app.core.json_response import json_response
+from app.schemas import event_schemas
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_fast_path_matches_fastapi_byte_for_byte(monkeypatch, fast):
+    """
+    Las respuestas renderizadas por `json_response` son idénticas a las que
+    FastAPI genera con `response_model` (unicode, nulos, enums y fechas).
+    """
+    monkeypatch.setattr(settings, "FAST_JSON_ENABLED", fast)
+    events = build_events(100)
+    detail = build_events(1, sessions_per_event=20)[0]
+    app = FastAPI()
+
+    @app.get("/default/list", response_model=List[event_schemas.EventRead])
+    def default_list():
+        return events
+
+    @app.get("/fast/list", response_model=List[event_schemas.EventRead])
+    def fast_list():
+        return json_response(List[event_schemas.EventRead], events)
+
+    @app.get("/default/detail", response_model=event_schemas.EventReadWithSessions)
+    def default_detail():
+        return detail
+
+    @app.get("/fast/detail", response_model=event_schemas.EventReadWithSessions)
+    def fast_detail():
+        return json_response(event_schemas.EventReadWithSessions, detail)
+
+    client = TestClient(app)
+    for path in ("list", "detail"):
+        expected = client.get(f"/default/{path}")
+        actual = client.get(f"/fast/{path}")
+        assert actual.status_code == expected.status_code == 200
+        assert actual.headers["content-type"] == expected.headers["content-type"]
+        assert actual.content == expected.content
@@ -0,0 +1,87 @@
+# tests/test_services/test_pool_metrics.py
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.orm import Session
+
+from app.core import security
+from app.core.cache import TTLCache
+from app.core.pool_metrics import InstrumentedQueuePool, PoolMetrics, instrument_engine
+from app.dependencies import get_db
+from app.main import app
+from app.services import principal_service
+from app.utils.enums import UserRole
+
+
+def _engine(tmp_path, liveness="none", idle_seconds=30.0, pool_size=1, max_overflow=0):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=0.05,
+    )
+    metrics = PoolMetrics("test", capacity=pool_size + max_overflow)
+    instrument_engine(engine, metrics, liveness, idle_seconds)
+    return engine, metrics
+
+
+def test_pool_metrics_count_checkouts_and_waits(tmp_path):
+    engine, metrics = _engine(tmp_path)
+    for _ in range(3):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    stats = metrics.snapshot(engine.pool)
+    assert stats["checkouts_total"] == 3
+    assert sum(stats["wait_ms_histogram"].values()) == 3
+    assert stats["checked_out"] == 0
+
+
+def test_pool_timeout_is_recorded_when_saturated(tmp_path):
+    engine, metrics = _engine(tmp_path)
+    with engine.connect():
+        assert metrics.snapshot(engine.pool)["saturated"] is True
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    assert metrics.snapshot(engine.pool)["timeouts_total"] == 1
+
+
+def test_idle_liveness_replaces_dead_connection(tmp_path, monkeypatch):
+    engine, metrics = _engine(tmp_path, liveness="idle", idle_seconds=0.0)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    time.sleep(0.01)
+
+    def dead_ping(dbapi_connection):
+        monkeypatch.undo()
+        raise RuntimeError("server closed the connection")
+
+    monkeypatch.setattr(engine.dialect, "do_ping", dead_ping)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+
+    stats = metrics.snapshot(engine.pool)
+    assert stats["liveness_failures_total"] == 1
+    assert stats["invalidations_total"] == 1
+
+
+def test_health_endpoints_require_admin(db_session: Session, make_user, monkeypatch):
+    """Las estadísticas del pool y de las cachés no son públicas."""
+    monkeypatch.setitem(app.dependency_overrides, get_db, lambda: db_session)
+    # Caché de principales propia: no altera los contadores que miden otras pruebas
+    monkeypatch.setattr(principal_service, "principal_cache", TTLCache(maxsize=10, ttl=60))
+    client = TestClient(app)
+    admin = make_user(email="health-admin@example.com", role=UserRole.ADMIN)
+    viewer = make_user(email="health-viewer@example.com")
+
+    for path in ("/health/db-pool", "/health/caches"):
+        assert client.get(path).status_code == 401
+        as_viewer = {"Authorization": f"Bearer {security.create_jwt_token(subject=viewer.email)}"}
+        assert client.get(path, headers=as_viewer).status_code == 403
+        as_admin = {"Authorization": f"Bearer {security.create_jwt_token(subject=admin.email)}"}
+        assert client.get(path, headers=as_admin).status_code == 200
@@ -0,0 +1,55 @@
+# tests/test_services/test_principal_service.py
+
+import pytest
+from sqlalchemy.orm import Session
+from app.services import principal_service
+from app.utils.enums import UserRole
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    principal_service.principal_cache.clear()
+    yield
+    principal_service.principal_cache.clear()
+
+def test_cached_principal_needs_no_database(db_session: Session, make_user, monkeypatch):
+    user = make_user()
+    first = principal_service.get_principal(db_session, user.email)
+    assert first.id == user.id and first.is_active
+
+    def no_db(*args, **kwargs):
+        raise AssertionError("principal cache hit should not query the database")
+    monkeypatch.setattr(db_session, "execute", no_db)
+
+    assert principal_service.get_principal(db_session, user.email) == first
+    assert principal_service.principal_cache.stats()["hits"] == 1
+
+@pytest.mark.parametrize("attribute, value", [("role", UserRole.ADMIN), ("is_active", False)])
+def test_principal_is_invalidated_when_user_changes(db_session: Session, make_user, attribute, value):
+    user = make_user()
+    principal_service.get_principal(db_session, user.email)
+
+    setattr(user, attribute, value)
+    db_session.commit()
+
+    assert principal_service.get_cached_principal(user.email) is None
+    assert getattr(principal_service.get_principal(db_session, user.email), attribute) == value
+
+def test_old_email_stops_resolving_after_change(db_session: Session, make_user):
+    user = make_user()
+    old_email = user.email
+    principal_service.get_principal(db_session, old_email)
+
+    user.email = "renamed-" + old_email
+    db_session.commit()
+
+    assert principal_service.get_principal(db_session, old_email) is None
+    assert principal_service.get_principal(db_session, user.email).id == user.id
+
+def test_unrelated_changes_keep_the_cache(db_session: Session, make_user):
+    user = make_user()
+    principal_service.get_principal(db_session, user.email)
+
+    user.name = "Otro nombre"
+    db_session.commit()
+
+    assert principal_service.get_cached_principal(user.email) is not None
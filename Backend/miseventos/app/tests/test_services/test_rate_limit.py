@@ -0,0 +1,108 @@
+# tests/test_services/test_rate_limit.py
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import security
+from app.core.config import settings
+from app.core.rate_limit import (
+    SCOPE_USER,
+    LocalBucketStore,
+    RateLimitMiddleware,
+    RateLimitRule,
+    parse_rate,
+)
+from app.main import app as main_app
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_parse_rate():
+    assert parse_rate("10/60") == (10, 60.0)
+
+
+def test_bucket_refills_over_time():
+    clock = FakeClock()
+    store = LocalBucketStore(clock=clock)
+
+    results = [asyncio.run(store.consume("k", 2, 1.0)) for _ in range(3)]
+    assert [allowed for allowed, _ in results] == [True, True, False]
+    assert results[-1][1] == 1.0
+
+    clock.now = 1.0
+    assert asyncio.run(store.consume("k", 2, 1.0))[0] is True
+
+
+def test_bucket_store_is_bounded():
+    store = LocalBucketStore(max_keys=2)
+    for key in ("a", "b", "c"):
+        asyncio.run(store.consume(key, 1, 1.0))
+    assert len(store._buckets) == 2
+    assert "a" not in store._buckets
+
+
+def _client(rules):
+    app = FastAPI()
+
+    @app.post("/login")
+    def login():
+        return {"ok": True}
+
+    @app.post("/registrations")
+    def register():
+        return {"ok": True}
+
+    app.add_middleware(RateLimitMiddleware, rules=rules, store=LocalBucketStore())
+    return TestClient(app)
+
+
+def test_middleware_rejects_with_retry_after():
+    client = _client([RateLimitRule("login", "POST", ("/login",), capacity=2, period=60)])
+
+    assert client.post("/login").status_code == 200
+    assert client.post("/login").status_code == 200
+    response = client.post("/login")
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "30"
+    assert response.json() == {"detail": "Too many requests"}
+    # Otras rutas no se ven afectadas
+    assert client.post("/registrations").status_code == 200
+
+
+def test_middleware_limits_per_user():
+    client = _client([RateLimitRule("registrations", "POST", ("/registrations",), capacity=1, period=60, scope=SCOPE_USER)])
+    alice = {"Authorization": f"Bearer {security.create_jwt_token('alice@example.com')}"}
+    bob = {"Authorization": f"Bearer {security.create_jwt_token('bob@example.com')}"}
+
+    assert client.post("/registrations", headers=alice).status_code == 200
+    assert client.post("/registrations", headers=alice).status_code == 429
+    assert client.post("/registrations", headers=bob).status_code == 200
+
+
+@pytest.mark.skipif(not settings.RATE_LIMIT_ENABLED, reason="rate limiting disabled")
+def test_app_rejects_with_cors_headers():
+    """En la aplicación real el 429 pasa por CORS: el navegador puede leerlo."""
+    # IP propia: el almacén de la aplicación es compartido por todo el proceso
+    client = TestClient(main_app, client=("203.0.113.7", 50000))
+    origin = {"Origin": "http://localhost:3000"}
+    capacity, _ = parse_rate(settings.RATE_LIMIT_LOGIN)
+    path = f"{settings.API_V1_STR}/auth/login-json"
+
+    for _ in range(capacity):
+        assert client.post(path, json={}, headers=origin).status_code == 422
+    response = client.post(path, json={}, headers=origin)
+
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
+    assert response.headers["access-control-allow-credentials"] == "true"
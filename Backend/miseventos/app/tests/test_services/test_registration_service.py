@@ -0,0 +1,176 @@
+# tests/test_services/test_registration_service.py
+
+import pytest
+from datetime import datetime
+from sqlalchemy.orm import Session
+from app.schemas.session_schemas import EventSessionUpdate
+from app.services import registration_service, session_service
+from app.utils.enums import AttendanceStatus, RegistrationOutcome
+
+def test_register_user_reserves_seat(db_session: Session, make_user, make_session):
+    """
+    El registro incrementa `current_attendees` en la misma transacción.
+    """
+    session = make_session(max_capacity=2)
+    user = make_user()
+
+    attendance = registration_service.register_user_for_session(db=db_session, user=user, session=session)
+
+    assert attendance.id is not None
+    assert attendance.status == AttendanceStatus.CONFIRMED
+    db_session.refresh(session)
+    assert session.current_attendees == 1
+
+def test_register_user_session_full(db_session: Session, make_user, make_session):
+    """
+    Una vez alcanzada la capacidad, el UPDATE condicional no reserva más plazas.
+    """
+    session = make_session(max_capacity=1)
+    registration_service.register_user_for_session(db=db_session, user=make_user(), session=session)
+
+    with pytest.raises(registration_service.SessionFullError):
+        registration_service.register_user_for_session(
+            db=db_session, user=make_user(), session=session, join_waitlist=False
+        )
+
+    db_session.refresh(session)
+    assert session.current_attendees == 1
+
+def test_register_user_twice(db_session: Session, make_user, make_session):
+    """
+    Un usuario no puede registrarse dos veces en la misma sesión.
+    """
+    session = make_session(max_capacity=5)
+    user = make_user()
+    registration_service.register_user_for_session(db=db_session, user=user, session=session)
+
+    with pytest.raises(registration_service.AlreadyRegisteredError):
+        registration_service.register_user_for_session(db=db_session, user=user, session=session)
+
+def test_cancel_registration_frees_seat(db_session: Session, make_user, make_session):
+    """
+    Cancelar libera la plaza y permite volver a registrarse.
+    """
+    session = make_session(max_capacity=1)
+    user = make_user()
+    registration_service.register_user_for_session(db=db_session, user=user, session=session)
+
+    cancelled = registration_service.cancel_registration(db=db_session, user=user, session=session)
+    assert cancelled.status == AttendanceStatus.CANCELLED
+    db_session.refresh(session)
+    assert session.current_attendees == 0
+
+    again = registration_service.register_user_for_session(db=db_session, user=user, session=session)
+    assert again.id == cancelled.id
+    assert again.status == AttendanceStatus.CONFIRMED
+
+def test_full_session_queues_in_waitlist(db_session: Session, make_user, make_session):
+    """
+    Con la sesión llena, los usuarios entran en la lista de espera en orden FIFO.
+    """
+    session = make_session(max_capacity=1)
+    registration_service.register_user_for_session(db=db_session, user=make_user(), session=session)
+
+    first = registration_service.register_user_for_session(db=db_session, user=make_user(), session=session)
+    second = registration_service.register_user_for_session(db=db_session, user=make_user(), session=session)
+
+    assert first.status == AttendanceStatus.WAITLIST
+    assert second.status == AttendanceStatus.WAITLIST
+    assert first.waitlist_position < second.waitlist_position
+    db_session.refresh(session)
+    assert session.current_attendees == 1
+
+def test_cancel_promotes_head_of_waitlist(db_session: Session, make_user, make_session):
+    """
+    Al cancelar un registro confirmado, la plaza pasa al primero de la lista.
+    """
+    session = make_session(max_capacity=1)
+    holder = make_user()
+    registration_service.register_user_for_session(db=db_session, user=holder, session=session)
+    first = registration_service.register_user_for_session(db=db_session, user=make_user(), session=session)
+    second = registration_service.register_user_for_session(db=db_session, user=make_user(), session=session)
+
+    registration_service.cancel_registration(db=db_session, user=holder, session=session)
+
+    db_session.refresh(first)
+    db_session.refresh(second)
+    db_session.refresh(session)
+    assert first.status == AttendanceStatus.CONFIRMED
+    assert first.waitlist_position is None
+    assert second.status == AttendanceStatus.WAITLIST
+    assert session.current_attendees == 1
+
+def test_register_users_batch(db_session: Session, make_user, make_session):
+    """
+    El registro por lotes devuelve un resultado por par y una sesión llena
+    no impide registrar al resto.
+    """
+    session = make_session(max_capacity=2)
+    already = make_user()
+    registration_service.register_user_for_session(db=db_session, user=already, session=session)
+    newcomers = [make_user(), make_user()]
+    user_ids = [already.id] + [u.id for u in newcomers] + [999999]
+
+    sessions = registration_service.get_batch_sessions(db=db_session, session_ids=[session.id])
+    response = registration_service.register_users_batch(db=db_session, user_ids=user_ids, sessions=sessions)
+
+    outcomes = [item.outcome for item in response.results]
+    assert outcomes == [
+        RegistrationOutcome.ALREADY_REGISTERED,
+        RegistrationOutcome.REGISTERED,
+        RegistrationOutcome.SESSION_FULL,
+        RegistrationOutcome.USER_NOT_FOUND,
+    ]
+    assert response.registered == 1
+    assert response.results[1].attendance_id is not None
+    db_session.refresh(session)
+    assert session.current_attendees == 2
+
+def test_get_user_registrations_projects_paginates_and_filters(db_session: Session, make_user, make_session):
+    """
+    Los registros del usuario se devuelven proyectados, del más reciente al
+    más antiguo, con paginación y filtros por estado y sesiones futuras.
+    """
+    user = make_user()
+    past = make_session(session_datetime=datetime(2000, 1, 1, 10, 0))
+    first = make_session()
+    second = make_session()
+    for session in (past, first, second):
+        registration_service.register_user_for_session(db=db_session, user=user, session=session)
+    registration_service.cancel_registration(db=db_session, user=user, session=first)
+
+    page = registration_service.get_user_registrations(db_session, user.id, page=1, limit=2)
+    assert [r.session_id for r in page] == [second.id, first.id]
+    assert page[0].event_id == second.event_id
+    assert page[0].event_name == "Evento de prueba"
+    assert page[0].registration_status == AttendanceStatus.CONFIRMED
+    assert [r.session_id for r in registration_service.get_user_registrations(db_session, user.id, page=2, limit=2)] == [past.id]
+
+    # Sin `limit` se devuelve la lista completa
+    assert len(registration_service.get_user_registrations(db_session, user.id)) == 3
+
+    confirmed = registration_service.get_user_registrations(db_session, user.id, status=AttendanceStatus.CONFIRMED)
+    assert {r.session_id for r in confirmed} == {past.id, second.id}
+    upcoming = registration_service.get_user_registrations(db_session, user.id, upcoming=True)
+    assert {r.session_id for r in upcoming} == {first.id, second.id}
+
+def test_capacity_increase_promotes_from_waitlist(db_session: Session, make_user, make_session):
+    """
+    Al ampliar la capacidad, las plazas nuevas pasan a la lista de espera
+    en orden, sin esperar a que alguien cancele.
+    """
+    session = make_session(max_capacity=1)
+    registration_service.register_user_for_session(db=db_session, user=make_user(), session=session)
+    waiting = [
+        registration_service.register_user_for_session(db=db_session, user=make_user(), session=session)
+        for _ in range(3)
+    ]
+
+    session_service.update_session_details(
+        db=db_session, session=session, session_update_data=EventSessionUpdate(max_capacity=3)
+    )
+
+    for attendance in waiting:
+        db_session.refresh(attendance)
+    assert [a.status for a in waiting] == [AttendanceStatus.CONFIRMED, AttendanceStatus.CONFIRMED, AttendanceStatus.WAITLIST]
+    assert session.current_attendees == 3
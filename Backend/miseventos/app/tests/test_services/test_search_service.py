@@ -0,0 +1,80 @@
+# tests/test_services/test_search_service.py
+
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from app.models import Event
+from app.services import event_service, search_service
+from app.utils.enums import EventCategory, EventStatus
+
+def _event(user, name, description="Descripción", location="Madrid", category=EventCategory.CONFERENCE, **kwargs):
+    start = datetime(2031, 5, 1, 9, 0)
+    return Event(
+        name=name,
+        general_location=location,
+        category=category,
+        description=description,
+        start_date=start,
+        end_date=start + timedelta(hours=2),
+        creator_id=user.id,
+        status=kwargs.get("status", EventStatus.PUBLISHED),
+    )
+
+def test_search_ranks_by_field_weight(db_session: Session, make_user):
+    """
+    Una coincidencia en el nombre pesa más que en la descripción o la ubicación,
+    y la búsqueda ignora acentos y mayúsculas.
+    """
+    user = make_user()
+    in_location = _event(user, "Encuentro anual", location="Centro Python")
+    in_description = _event(user, "Jornada técnica", description="Charlas sobre Python")
+    in_name = _event(user, "Python Avanzado")
+    unrelated = _event(user, "Música en vivo")
+    draft = _event(user, "Python borrador", status=EventStatus.DRAFT)
+    db_session.add_all([in_location, in_description, in_name, unrelated, draft])
+    db_session.commit()
+
+    results = event_service.search_events_by_name(db_session, "python")
+    assert [e.id for e in results] == [in_name.id, in_description.id, in_location.id]
+
+    assert [e.id for e in search_service.search_events(db_session, "TECNICA")] == [in_description.id]
+
+def test_search_matches_category_prefix_and_all_terms(db_session: Session, make_user):
+    user = make_user()
+    workshop = _event(user, "Taller de cerámica", category=EventCategory.WORKSHOP)
+    other = _event(user, "Taller de cocina")
+    db_session.add_all([workshop, other])
+    db_session.commit()
+
+    assert [e.id for e in search_service.search_events(db_session, "workshop")] == [workshop.id]
+    assert [e.id for e in search_service.search_events(db_session, "taller ceram")] == [workshop.id]
+    assert search_service.search_events(db_session, "taller inexistente") == []
+
+def test_paginated_listing_uses_search_index(db_session: Session, make_user):
+    """El índice se refresca tras escribir eventos y filtra el listado paginado."""
+    user = make_user()
+    db_session.add(_event(user, "Congreso de datos"))
+    db_session.commit()
+    assert event_service.get_events_paginated(db_session, search="datos").total == 1
+
+    event = _event(user, "Meetup de datos abiertos")
+    db_session.add(event)
+    db_session.commit()
+    page = event_service.get_events_paginated(db_session, search="datos")
+    assert page.total == 2
+    assert event.id in [e.id for e in page.events]
+
+def test_index_goes_stale_on_commit_not_on_flush(db_session: Session, make_user):
+    """Un flush sin confirmar no invalida el índice; el commit sí."""
+    user = make_user()
+    first = _event(user, "Congreso de datos")
+    db_session.add(first)
+    db_session.commit()
+    assert [e.id for e in search_service.search_events(db_session, "datos")] == [first.id]
+
+    second = _event(user, "Meetup de datos abiertos")
+    db_session.add(second)
+    db_session.flush()
+    assert [e.id for e in search_service.search_events(db_session, "datos")] == [first.id]
+
+    db_session.commit()
+    assert {e.id for e in search_service.search_events(db_session, "datos")} == {first.id, second.id}
@@ -0,0 +1,142 @@
+# tests/test_services/test_seat_inventory.py
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlmodel import select
+from app.core.config import settings
+from app.models import Attendance
+from app.services import registration_service, seat_inventory
+from app.utils.enums import AttendanceStatus, SessionStatus
+
+@pytest.fixture
+def inventory_enabled(monkeypatch):
+    """
+    Activa el inventario en memoria y limpia su estado al terminar.
+    """
+    monkeypatch.setattr(settings, "SEAT_INVENTORY_ENABLED", True)
+    seat_inventory.inventory.reset()
+    yield seat_inventory.inventory
+    seat_inventory.inventory.reset()
+
+def test_inventory_admits_until_lease_exhausted():
+    """
+    Prueba unitaria de los contadores fragmentados, sin base de datos.
+    """
+    inventory = seat_inventory.SeatInventory(shard_count=4, lease_size=2)
+    leases = iter([2, 1, 0])
+
+    admitted = [
+        inventory.admit(1, user_id, load_user_ids=lambda: [], lease=lambda n: next(leases))
+        for user_id in range(10, 14)
+    ]
+
+    assert [r is not None for r in admitted] == [True, True, True, False]
+    assert len(inventory.drain_pending()) == 3
+
+def test_inventory_rejects_duplicates():
+    """
+    Un usuario admitido (o ya registrado en BD) no puede volver a entrar.
+    """
+    inventory = seat_inventory.SeatInventory(shard_count=2, lease_size=5)
+    inventory.admit(1, 7, load_user_ids=lambda: [8], lease=lambda n: n)
+
+    with pytest.raises(seat_inventory.DuplicateReservationError):
+        inventory.admit(1, 7, load_user_ids=lambda: [], lease=lambda n: n)
+    with pytest.raises(seat_inventory.DuplicateReservationError):
+        inventory.admit(1, 8, load_user_ids=lambda: [], lease=lambda n: n)
+
+def test_registration_through_inventory_is_written_behind(
+    db_session: Session, make_user, make_session, inventory_enabled
+):
+    """
+    El registro se admite en memoria y la asistencia se escribe al hacer flush.
+    La reconciliación devuelve las plazas reservadas que no se usaron.
+    """
+    session = make_session(max_capacity=100, status=SessionStatus.SALE, seat_inventory_enabled=True)
+    user = make_user()
+
+    attendance = registration_service.register_user_for_session(db=db_session, user=user, session=session)
+
+    assert attendance.id is None
+    assert attendance.status == AttendanceStatus.CONFIRMED
+    db_session.refresh(session)
+    assert session.current_attendees == settings.SEAT_INVENTORY_LEASE_SIZE
+
+    assert registration_service.flush_seat_inventory(db_session) == 1
+    stored = db_session.execute(
+        select(Attendance).where(Attendance.session_id == session.id, Attendance.user_id == user.id)
+    ).scalars().one()
+    assert stored.status == AttendanceStatus.CONFIRMED
+
+    registration_service.reconcile_seat_inventory(db_session)
+    db_session.refresh(session)
+    assert session.current_attendees == 1
+
+def test_inventory_falls_back_to_waitlist_when_sold_out(
+    db_session: Session, make_user, make_session, inventory_enabled
+):
+    """
+    Sin plazas en el inventario ni en la BD, el registro sigue el flujo normal.
+    """
+    session = make_session(max_capacity=1, status=SessionStatus.SALE, seat_inventory_enabled=True)
+    registration_service.register_user_for_session(db=db_session, user=make_user(), session=session)
+
+    waitlisted = registration_service.register_user_for_session(db=db_session, user=make_user(), session=session)
+
+    assert waitlisted.status == AttendanceStatus.WAITLIST
+
+def test_unloaded_inventory_leases_nothing():
+    """
+    Una sesión descargada no pide más plazas a la base de datos: la admisión
+    se reintenta contra la sesión recargada, que incluye las reservas pendientes.
+    """
+    inventory = seat_inventory.SeatInventory(shard_count=2, lease_size=1)
+    leases = []
+    def lease(n):
+        leases.append(n)
+        return n
+
+    inventory.admit(1, 7, load_user_ids=lambda: [], lease=lease)
+    detached = inventory._sessions[1]
+    assert inventory.unload(1) == 0
+
+    assert inventory._renew_lease(detached, lease) is False
+    assert not detached.take_seat(detached.home(8))
+    assert leases == [1]
+
+    # El usuario 7 sigue pendiente de escribirse: no puede ocupar otra plaza
+    with pytest.raises(seat_inventory.DuplicateReservationError):
+        inventory.admit(1, 7, load_user_ids=lambda: [], lease=lease)
+    assert inventory.admit(1, 8, load_user_ids=lambda: [], lease=lease) is not None
+    assert leases == [1, 1]
+
+def test_flush_drops_duplicates_and_keeps_going(
+    db_session: Session, make_user, make_session, inventory_enabled, monkeypatch
+):
+    """
+    Un par (usuario, sesión) repetido se escribe una vez, y una reserva que
+    choca con la restricción única se descarta sin volver a encolar el lote.
+    """
+    session = make_session(max_capacity=100, status=SessionStatus.SALE, seat_inventory_enabled=True)
+    users = [make_user() for _ in range(3)]
+    for user in users:
+        registration_service.register_user_for_session(db=db_session, user=user, session=session)
+    pending = inventory_enabled.drain_pending()
+    inventory_enabled.requeue(pending + [pending[0]])
+
+    real_write = registration_service._write_reservations
+    def conflicting_write(db, reservations, duplicates):
+        if any(r.user_id == users[1].id for r in reservations):
+            raise IntegrityError("INSERT", {}, Exception("UNIQUE constraint failed"))
+        real_write(db, reservations, duplicates)
+    monkeypatch.setattr(registration_service, "_write_reservations", conflicting_write)
+
+    # Sesión en un savepoint: su rollback no deshace los datos de la prueba
+    flush_db = Session(bind=db_session.connection(), join_transaction_mode="create_savepoint")
+    assert registration_service.flush_seat_inventory(flush_db) == 4
+    stored = db_session.execute(
+        select(Attendance.user_id).where(Attendance.session_id == session.id)
+    ).scalars().all()
+    assert sorted(stored) == sorted([users[0].id, users[2].id])
+    assert inventory_enabled.drain_pending() == []
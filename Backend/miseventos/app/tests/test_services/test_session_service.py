@@ -0,0 +1,156 @@
+# tests/test_services/test_session_service.py
+
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy.orm import Session
+from app.models import Attendance, Event, EventSession
+from app.services import session_service
+from app.schemas import session_schemas
+from app.utils.enums import AttendanceStatus
+
+def _session_data(hour: int, max_capacity: int) -> session_schemas.EventSessionCreate:
+    return session_schemas.EventSessionCreate(
+        presenter="Ponente",
+        session_datetime=datetime(2030, 1, 1, hour, 0),
+        specific_location="Sala 1",
+        max_capacity=max_capacity,
+    )
+
+def test_event_capacity_is_maintained(db_session: Session, make_session):
+    """
+    `Event.max_capacity` se mantiene al crear, actualizar y eliminar sesiones.
+    """
+    first = make_session(max_capacity=10)
+    event = db_session.get(Event, first.event_id)
+    event.max_capacity = 10
+    db_session.commit()
+
+    second = session_service.add_session_to_event(db=db_session, session_data=_session_data(14, 25), event=event)
+    db_session.refresh(event)
+    assert event.total_capacity == 35
+
+    session_service.update_session_details(
+        db=db_session, session=second, session_update_data=session_schemas.EventSessionUpdate(max_capacity=30)
+    )
+    db_session.refresh(event)
+    assert event.total_capacity == 40
+
+    session_service.delete_session(db=db_session, session=first)
+    db_session.refresh(event)
+    assert event.total_capacity == 30
+
+def test_schedule_conflicts_use_each_session_duration(db_session: Session, make_session):
+    """
+    Cada sesión ocupa [inicio, inicio + su duración): una sesión larga bloquea
+    las siguientes aunque el evento no tenga duración, y las contiguas se permiten.
+    """
+    first = make_session(session_datetime=datetime(2030, 1, 1, 10, 0), duration_minutes=180)
+    event = db_session.get(Event, first.event_id)
+    assert first.session_end == datetime(2030, 1, 1, 13, 0)
+
+    with pytest.raises(session_service.SessionConflictError):
+        session_service.add_session_to_event(db=db_session, session_data=_session_data(12, 10), event=event)
+
+    contiguous = session_service.add_session_to_event(db=db_session, session_data=_session_data(13, 10), event=event)
+    assert contiguous.duration_minutes == 60
+    assert contiguous.session_end == datetime(2030, 1, 1, 14, 0)
+
+    # Una sesión que empieza antes pero termina dentro de otra también se solapa
+    early = _session_data(9, 10)
+    early.duration_minutes = 90
+    with pytest.raises(session_service.SessionConflictError):
+        session_service.add_session_to_event(db=db_session, session_data=early, event=event)
+
+def test_schedule_conflicts_on_update(db_session: Session, make_session):
+    """Cambiar la hora o la duración se valida contra las demás sesiones, no contra sí misma."""
+    first = make_session(session_datetime=datetime(2030, 1, 1, 10, 0))
+    event = db_session.get(Event, first.event_id)
+    second = session_service.add_session_to_event(db=db_session, session_data=_session_data(12, 10), event=event)
+
+    moved = session_service.update_session_details(
+        db=db_session,
+        session=second,
+        session_update_data=session_schemas.EventSessionUpdate(session_datetime=datetime(2030, 1, 1, 11, 30), duration_minutes=30),
+    )
+    assert moved.session_end == datetime(2030, 1, 1, 12, 0)
+
+    with pytest.raises(session_service.SessionConflictError):
+        session_service.update_session_details(
+            db=db_session, session=first, session_update_data=session_schemas.EventSessionUpdate(duration_minutes=120)
+        )
+
+    session_service.delete_session(db=db_session, session=second)
+    extended = session_service.update_session_details(
+        db=db_session, session=first, session_update_data=session_schemas.EventSessionUpdate(duration_minutes=120)
+    )
+    assert extended.session_end == datetime(2030, 1, 1, 12, 0)
+
+def _batch(*slots) -> list:
+    """Sesiones del lote a partir de pares (hora de inicio, duración en minutos)."""
+    return [
+        session_schemas.EventSessionCreate(
+            presenter=f"Ponente {i}",
+            session_datetime=datetime(2030, 1, 2, 0, 0) + timedelta(hours=start),
+            duration_minutes=duration,
+            specific_location="Sala 1",
+            max_capacity=10,
+        )
+        for i, (start, duration) in enumerate(slots)
+    ]
+
+def test_bulk_sessions_are_created_in_one_transaction(db_session: Session, make_session):
+    """El programa completo se crea con su capacidad y su fin calculados."""
+    first = make_session(max_capacity=10)
+    event = db_session.get(Event, first.event_id)
+    event.max_capacity = 10
+    db_session.commit()
+
+    slots = [(hour, 50) for hour in range(200)]
+    created = session_service.add_sessions_to_event(db=db_session, sessions_data=_batch(*slots), event=event)
+
+    assert [s.presenter for s in created] == [f"Ponente {i}" for i in range(200)]
+    assert all(s.id and s.session_end - s.session_datetime == timedelta(minutes=50) for s in created)
+    db_session.refresh(event)
+    assert event.total_capacity == 10 + 200 * 10
+
+def test_bulk_sessions_report_every_conflict(db_session: Session, make_session):
+    """
+    Un lote con solapamientos internos y con sesiones existentes no crea nada
+    y reporta todos los pares solapados.
+    """
+    existing = make_session(session_datetime=datetime(2030, 1, 2, 5, 0), duration_minutes=120)
+    event = db_session.get(Event, existing.event_id)
+
+    batch = _batch((0, 60), (1, 60), (1, 90), (4, 120), (7, 30), (2, 30))
+    with pytest.raises(session_service.ScheduleConflictsError) as exc:
+        session_service.add_sessions_to_event(db=db_session, sessions_data=batch, event=event)
+
+    found = {(c.index, c.conflicting_index, c.conflicting_session_id) for c in exc.value.conflicts}
+    assert found == {
+        (2, 1, None),          # 01:00-02:30 contra 01:00-02:00
+        (5, 2, None),          # 02:00-02:30 contra 01:00-02:30
+        (3, None, existing.id),  # 04:00-06:00 contra la existente 05:00-07:00
+    }
+    assert db_session.query(EventSession).filter(EventSession.event_id == event.id).count() == 1
+
+def test_inventory_sessions_report_sold_seats_after_writes(db_session: Session, make_user, make_session):
+    """
+    Con inventario en memoria, `current_attendees` incluye las plazas reservadas
+    en bloque: las respuestas de crear y actualizar sesiones cuentan sólo las vendidas.
+    """
+    session = make_session(max_capacity=10)
+    session.seat_inventory_enabled = True
+    session.current_attendees = 10
+    db_session.add(Attendance(user_id=make_user().id, session_id=session.id, status=AttendanceStatus.CONFIRMED))
+    db_session.commit()
+
+    updated = session_service.update_session_details(
+        db=db_session, session=session, session_update_data=session_schemas.EventSessionUpdate(presenter="Otro")
+    )
+    assert (updated.attendee_count, updated.is_full) == (1, False)
+
+    event = db_session.get(Event, session.event_id)
+    data = _session_data(14, 5)
+    data.seat_inventory_enabled = True
+    created = session_service.add_sessions_to_event(db=db_session, sessions_data=[data], event=event)
+    assert created[0].attendee_count == 0
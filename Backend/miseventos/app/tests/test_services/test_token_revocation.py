@@ -0,0 +1,91 @@
+# tests/test_services/test_token_revocation.py
+
+from datetime import datetime, timedelta
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app import dependencies
+from app.core import security
+from app.models import RevokedToken
+from app.services import auth_service, token_revocation, token_service
+
+@pytest.fixture(autouse=True)
+def reset_revocation_list():
+    token_revocation.revocation_list.reset()
+    yield
+    token_revocation.revocation_list.reset()
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = token_revocation.BloomFilter(capacity=1000)
+    keys = [f"jti-{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 100
+
+def test_revocation_list_expires_entries_and_grows():
+    revocations = token_revocation.RevocationList(capacity=2)
+    future = datetime.utcnow() + timedelta(minutes=5)
+    revocations.add_many([("a", future), ("b", future), ("c", future)])
+    revocations.add("old", datetime.utcnow() - timedelta(seconds=1))
+
+    assert revocations.is_revoked("c")
+    assert not revocations.is_revoked("old")
+    assert not revocations.is_revoked("unknown")
+    assert revocations.purge_expired() == 1
+    assert len(revocations) == 3 and revocations.is_revoked("a")
+
+def test_logout_revokes_access_token_without_db_lookup(db_session: Session, make_user, monkeypatch):
+    user = make_user()
+    token = security.create_jwt_token(subject=user.email)
+    claims = dependencies.get_token_claims(token)
+
+    auth_service.logout(db_session, claims)
+
+    def no_db(*args, **kwargs):
+        raise AssertionError("revocation check must not query the database")
+    monkeypatch.setattr(db_session, "execute", no_db)
+    with pytest.raises(HTTPException) as excinfo:
+        dependencies.get_current_principal(db=db_session, token=token)
+    assert excinfo.value.status_code == 401
+
+def test_other_workers_learn_revocations_through_sync(db_session: Session):
+    expires_at = datetime.utcnow() + timedelta(minutes=5)
+    db_session.add_all([
+        RevokedToken(jti="from-other-worker", expires_at=expires_at),
+        RevokedToken(jti="already-expired", expires_at=datetime.utcnow() - timedelta(minutes=1)),
+    ])
+    db_session.commit()
+
+    assert token_service.sync_revocations(db_session) == 1
+    assert token_revocation.revocation_list.is_revoked("from-other-worker")
+    # La sincronización es incremental
+    assert token_service.sync_revocations(db_session) == 0
+
+    assert token_service.purge_revoked_tokens(db_session) == 1
+
+def test_sync_picks_up_revocations_committed_out_of_order(db_session: Session):
+    now = datetime.utcnow()
+    expires_at = now + timedelta(minutes=5)
+    db_session.add(RevokedToken(id=10, jti="committed-first", expires_at=expires_at, created_at=now))
+    db_session.commit()
+    assert token_service.sync_revocations(db_session) == 1
+
+    # Una transacción que obtuvo su id antes confirma después de la ya sincronizada
+    db_session.add(RevokedToken(id=5, jti="committed-late", expires_at=expires_at, created_at=now - timedelta(seconds=5)))
+    db_session.commit()
+    assert token_service.sync_revocations(db_session) == 1
+    assert token_revocation.revocation_list.is_revoked("committed-late")
+
+def test_concurrent_logout_with_same_token_is_idempotent(db_session: Session, make_user):
+    token = security.create_jwt_token(subject=make_user().email)
+    claims = dependencies.get_token_claims(token)
+    # Otra petición registró el mismo `jti` entre medias
+    db_session.add(RevokedToken(jti=claims["jti"], expires_at=datetime.utcfromtimestamp(claims["exp"])))
+    db_session.commit()
+
+    token_service.revoke_access_token(db_session, claims)
+
+    assert token_revocation.revocation_list.is_revoked(claims["jti"])
+    assert db_session.query(RevokedToken).filter(RevokedToken.jti == claims["jti"]).count() == 1
@@ -0,0 +1,53 @@
+# tests/test_services/test_token_service.py
+
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy.orm import Session
+from app.core import security
+from app.models import RefreshToken
+from app.services import auth_service, token_service
+
+def test_refresh_rotates_token_without_password(db_session: Session, make_user, monkeypatch):
+    user = make_user()
+    tokens = auth_service.issue_tokens(db_session, user)
+
+    def no_bcrypt(*args, **kwargs):
+        raise AssertionError("refresh must not verify the password")
+    monkeypatch.setattr(auth_service, "verify_and_update_password", no_bcrypt)
+
+    refreshed = auth_service.refresh_tokens(db_session, tokens.refresh_token)
+    assert refreshed.refresh_token != tokens.refresh_token
+    assert security.decode_jwt_token(refreshed.access_token)["sub"] == user.email
+
+    # El token rotado ya no sirve, y el nuevo sí
+    with pytest.raises(token_service.InvalidRefreshTokenError):
+        auth_service.refresh_tokens(db_session, tokens.refresh_token)
+
+def test_reused_token_revokes_the_whole_family(db_session: Session, make_user):
+    user = make_user()
+    first = auth_service.issue_tokens(db_session, user).refresh_token
+    second = auth_service.refresh_tokens(db_session, first).refresh_token
+
+    with pytest.raises(token_service.RefreshTokenReuseError):
+        auth_service.refresh_tokens(db_session, first)
+    with pytest.raises(token_service.InvalidRefreshTokenError):
+        auth_service.refresh_tokens(db_session, second)
+
+def test_refresh_token_is_stored_hashed_and_expires(db_session: Session, make_user):
+    user = make_user()
+    raw = token_service.issue_refresh_token(db_session, user)
+    stored = db_session.query(RefreshToken).filter(RefreshToken.user_id == user.id).one()
+    assert stored.token_hash != raw and len(stored.token_hash) == 64
+
+    stored.expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db_session.commit()
+    with pytest.raises(token_service.InvalidRefreshTokenError):
+        token_service.rotate_refresh_token(db_session, raw)
+
+def test_logout_revokes_refresh_token(db_session: Session, make_user):
+    raw = token_service.issue_refresh_token(db_session, make_user())
+    token_service.revoke_refresh_token(db_session, raw)
+    token_service.revoke_refresh_token(db_session, raw)
+
+    with pytest.raises(token_service.InvalidRefreshTokenError):
+        token_service.rotate_refresh_token(db_session, raw)
@@ -0,0 +1,94 @@
+# tests/test_services/test_user_import_service.py
+
+import io
+import json
+
+import psycopg2
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core import security
+from app.models import User
+from app.services import user_import_service
+from app.utils.enums import UserRole
+
+
+CSV_DATA = """name,email,password,role
+Ana,ana.import@example.com,password-ana,organizer
+Beto,beto.import@example.com,password-beto,
+Ana Bis,ana.import@example.com,password-ana2,
+Corto,corto.import@example.com,short,
+"""
+
+
+def test_import_users_from_csv(db_session: Session):
+    """Carga los válidos, descarta duplicados del fichero e inválidos."""
+    records = user_import_service.read_records(io.StringIO(CSV_DATA), "csv")
+    stats = user_import_service.import_users(db_session, records, chunk_size=10)
+
+    assert (stats.processed, stats.imported, stats.duplicates, stats.invalid) == (4, 2, 1, 1)
+    users = {
+        u.email: u for u in db_session.execute(
+            select(User).where(User.email.in_(["ana.import@example.com", "beto.import@example.com"]))
+        ).scalars()
+    }
+    assert users["ana.import@example.com"].role == UserRole.ORGANIZER
+    assert users["beto.import@example.com"].role == UserRole.ATTENDEE
+    assert security.verify_password("password-beto", users["beto.import@example.com"].password_hash)
+
+
+def test_import_users_skips_existing_and_resumes_from_checkpoint(db_session: Session, tmp_path):
+    """Los emails ya registrados no se hashean ni se insertan; el checkpoint salta lo ya procesado."""
+    existing = User(name="Existing", email="existing.import@example.com", password_hash="x")
+    db_session.add(existing)
+    db_session.commit()
+
+    lines = [
+        {"name": "Existing", "email": "existing.import@example.com", "password": "password-1"},
+        {"name": "Nuevo", "email": "nuevo.import@example.com", "password": "password-2"},
+    ]
+    ndjson = "\n".join(json.dumps(line) for line in lines)
+    checkpoint = tmp_path / "import.ckpt"
+    user_import_service.save_checkpoint(str(checkpoint), user_import_service.ImportStats(processed=1, existing=1))
+
+    records = user_import_service.read_records(io.StringIO(ndjson), "ndjson")
+    stats = user_import_service.import_users(db_session, records, chunk_size=1, checkpoint_path=str(checkpoint))
+
+    assert (stats.processed, stats.imported, stats.existing) == (2, 1, 1)
+    assert user_import_service.load_checkpoint(str(checkpoint)) == stats
+
+    # Relanzar con los registros ya procesados no vuelve a cargar nada
+    records = user_import_service.read_records(io.StringIO(ndjson), "ndjson")
+    again = user_import_service.import_users(db_session, records, chunk_size=1)
+    assert (again.imported, again.existing) == (0, 2)
+    assert db_session.get(User, existing.id).password_hash == "x"
+
+
+def test_copy_conflict_falls_back_to_insert(db_session: Session, monkeypatch):
+    """
+    Si COPY choca con un email registrado mientras se hasheaba el bloque
+    (error de psycopg2, no de SQLAlchemy), el bloque se carga con
+    INSERT ... ON CONFLICT DO NOTHING en vez de abortar la importación.
+    """
+    monkeypatch.setattr(db_session.get_bind().dialect, "name", "postgresql")
+
+    def failing_copy(db, rows):
+        raise psycopg2.errors.UniqueViolation("duplicate key value violates unique constraint")
+    monkeypatch.setattr(user_import_service, "_copy_rows", failing_copy)
+
+    real_hash = user_import_service.hash_passwords
+    def hash_while_registering(passwords, executor=None):
+        # Registro concurrente de uno de los emails del bloque
+        db_session.add(User(name="Beto", email="beto.import@example.com", password_hash="x"))
+        db_session.flush()
+        return real_hash(passwords, executor)
+    monkeypatch.setattr(user_import_service, "hash_passwords", hash_while_registering)
+
+    records = user_import_service.read_records(io.StringIO(CSV_DATA), "csv")
+    stats = user_import_service.import_users(db_session, records, chunk_size=10)
+
+    assert stats.imported == 1
+    emails = db_session.execute(
+        select(User.email).where(User.email.in_(["ana.import@example.com", "beto.import@example.com"]))
+    ).scalars().all()
+    assert sorted(emails) == ["ana.import@example.com", "beto.import@example.com"]
@@ -46,4 +46,11 @@ class AttendanceStatus(str, Enum):
     """Estados de registro de asistencia"""
     CONFIRMED = "confirmed"
     CANCELLED = "cancelled"
-    WAITLIST = "waitlist"
\ No newline at end of file
+    WAITLIST = "waitlist"
+
+class RegistrationOutcome(str, Enum):
+    """Resultado de cada registro dentro de un lote"""
+    REGISTERED = "registered"
+    ALREADY_REGISTERED = "already_registered"
+    SESSION_FULL = "session_full"
+    USER_NOT_FOUND = "user_not_found"
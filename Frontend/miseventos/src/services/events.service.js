@@ -1,7 +1,7 @@
 import api from './api';
 
 export const eventsService = {
-  getAll: async (page = 1, limit = 10, search = '') => {
+  getAll: async (page = 1, limit = 10, search = '', filters = {}) => {
     const params = new URLSearchParams({
       page: page.toString(),
       limit: limit.toString(),
@@ -10,6 +10,13 @@ export const eventsService = {
     if (search) {
       params.append('search', search);
     }
+
+    // Filtros del servidor: category, date_from, date_to, location, status, facets
+    Object.entries(filters).forEach(([key, value]) => {
+      if (value !== undefined && value !== null && value !== '') {
+        params.append(key, value.toString());
+      }
+    });
     
     const response = await api.get(`/events?${params}`);
     return response.data;